@@ -8,6 +8,12 @@ class Config:
     DB_NAME = os.getenv('DB_NAME', 'pda_zone')
     DB_USER = os.getenv('DB_USER', 'pda_admin')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
+
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 0))  # Idle connections kept per container and host, 0 = close after use
+
+    # Read replica for get_db(readonly=True), empty = use writer
+    DB_READ_HOST = os.getenv('DB_READ_HOST', '')
+    DB_READ_MAX_LAG_SECONDS = int(os.getenv('DB_READ_MAX_LAG_SECONDS', 5))  # <= 0 skips lag check (e.g. Aurora reader)
     
     # JWT
     JWT_SECRET = os.getenv('JWT_SECRET', 'change-me-in-production')
@@ -44,4 +50,21 @@ class Config:
     MAX_RADIATION = 100
     RADIATION_CHECK_INTERVAL = 300  # 5 minutes in seconds
 
+    # WebSocket push ('aws', 'memory' for local runs, 'off')
+    PUSH_BACKEND = os.getenv('PUSH_BACKEND', 'aws')
+    CONNECTIONS_TABLE = os.getenv('CONNECTIONS_TABLE', f"pda-zone-connections-{os.getenv('ENVIRONMENT', 'dev')}")
+    # sessionIdIndex is deployed (False during the first step of the two-step GSI rollout)
+    CONNECTION_SESSION_INDEX = os.getenv('CONNECTION_SESSION_INDEX', 'true').lower() == 'true'
+    WEBSOCKET_API_ENDPOINT = os.getenv('WEBSOCKET_API_ENDPOINT', '')
+
+    # Shared world cache (redis://host:port/db, memory:// for local runs, empty = off)
+    SHARED_CACHE_URL = os.getenv('SHARED_CACHE_URL', '')
+
+    # SQL profiler: per-request statement log (see src.utils.sql_profiler)
+    SQL_PROFILE = os.getenv('SQL_PROFILE', 'false').lower() == 'true'
+    SQL_PROFILE_REPEAT_THRESHOLD = int(os.getenv('SQL_PROFILE_REPEAT_THRESHOLD', 5))  # Same statement N times = N+1
+
+    # GM live map
+    LIVE_MAP_TTL_SECONDS = int(os.getenv('LIVE_MAP_TTL_SECONDS', 5))  # Snapshot rebuild interval
+
 config = Config()
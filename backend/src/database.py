@@ -1,12 +1,23 @@
+import json
+import time
 import pymysql
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Optional
 from src.config import config
+from src.utils.sql_profiler import profile_connection
 
-def get_connection():
-    """Create database connection"""
+REPLICA_RECHECK_SECONDS = 10  # Replica health (reachable, lag) is re-checked at most this often
+POOL_PING_AFTER_SECONDS = 30  # Idle pooled connections are pinged before reuse after this long
+
+# Last replica health check of this container
+_replica = {'healthy': None, 'checked_at': 0.0}
+
+# Idle connections kept by get_db() for reuse (DB_POOL_SIZE > 0): host -> [(conn, released_at)]
+_pool = {}
+
+def _connect(host: str):
     return pymysql.connect(
-        host=config.DB_HOST,
+        host=host,
         port=config.DB_PORT,
         user=config.DB_USER,
         password=config.DB_PASSWORD,
@@ -16,18 +27,126 @@ def get_connection():
         autocommit=False
     )
 
+def get_connection():
+    """Create database connection"""
+    return _connect(config.DB_HOST)
+
+def _acquire(host: str):
+    """Idle pooled connection to host (pinged if idle a while), else a new one"""
+    idle = _pool.get(host)
+    while idle:
+        conn, released_at = idle.pop()
+        try:
+            if time.monotonic() - released_at > POOL_PING_AFTER_SECONDS:
+                conn.ping(reconnect=False)
+            return conn
+        except Exception:
+            _close(conn)
+    return _connect(host)
+
+def _release(conn, reusable: bool):
+    """Return connection to the pool, or close it (pool off/full, or after an error)"""
+    idle = _pool.setdefault(conn.host, [])
+    if reusable and len(idle) < config.DB_POOL_SIZE:
+        idle.append((conn, time.monotonic()))
+    else:
+        _close(conn)
+
+def _close(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+def _replica_lag(conn) -> Optional[int]:
+    """Seconds the replica is behind the writer, None if replication is not running"""
+    with conn.cursor() as cursor:
+        cursor.execute("SHOW REPLICA STATUS")
+        status = cursor.fetchone()
+    if not status:
+        return None
+    return status.get('Seconds_Behind_Source')
+
+def _replica_connection():
+    """Connection to DB_READ_HOST, None if unset, unreachable or lagging"""
+    if not config.DB_READ_HOST:
+        return None
+
+    now = time.monotonic()
+    if _replica['healthy'] is False and now - _replica['checked_at'] < REPLICA_RECHECK_SECONDS:
+        return None
+
+    conn = None
+    try:
+        conn = _acquire(config.DB_READ_HOST)
+        if config.DB_READ_MAX_LAG_SECONDS > 0 and (
+                _replica['healthy'] is None or now - _replica['checked_at'] >= REPLICA_RECHECK_SECONDS):
+            lag = _replica_lag(conn)
+            _replica['checked_at'] = now
+            if lag is None or lag > config.DB_READ_MAX_LAG_SECONDS:
+                _replica['healthy'] = False
+                print(json.dumps({'event': 'replica_unhealthy', 'host': config.DB_READ_HOST, 'lag': lag}))
+                conn.close()
+                return None
+        _replica['healthy'] = True
+    except Exception as e:
+        _replica['healthy'] = False
+        _replica['checked_at'] = now
+        print(json.dumps({'event': 'replica_unavailable', 'host': config.DB_READ_HOST, 'error': str(e)}))
+        if conn is not None:
+            conn.close()
+        return None
+
+    conn.is_replica = True
+    return conn
+
+def is_replica(cursor) -> bool:
+    """True if cursor reads from the replica (may lag the writer)"""
+    return getattr(cursor.connection, 'is_replica', False)
+
 @contextmanager
-def get_db() -> Generator:
-    """Database connection context manager"""
-    conn = get_connection()
+def get_db(readonly: bool = False) -> Generator:
+    """
+    Database connection context manager
+
+    readonly=True routes to the read replica (DB_READ_HOST) when it is
+    configured, reachable and within DB_READ_MAX_LAG_SECONDS of the writer;
+    otherwise falls back to the writer. Use only for requests that don't
+    write and don't need to read their own just-committed writes.
+
+    With DB_POOL_SIZE > 0 connections are kept open after use and reused by
+    later requests of the same container.
+    """
+    conn = profile_connection((_replica_connection() if readonly else None) or _acquire(config.DB_HOST))
+    committed = False
     try:
         yield conn
         conn.commit()
+        committed = True
     except Exception as e:
+        conn.after_commit_callbacks = []
         conn.rollback()
         raise e
     finally:
-        conn.close()
+        _release(conn, reusable=committed)
+
+    _run_after_commit(conn)
+
+def after_commit(cursor, callback):
+    """Run callback after get_db() committed the cursor's transaction (dropped on rollback)"""
+    conn = cursor.connection
+    if not hasattr(conn, 'after_commit_callbacks'):
+        conn.after_commit_callbacks = []
+    conn.after_commit_callbacks.append(callback)
+
+def _run_after_commit(conn):
+    callbacks = getattr(conn, 'after_commit_callbacks', ())
+    conn.after_commit_callbacks = []
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            print(f"After commit callback error: {e}")
 
 def execute_query(query: str, params: tuple = None, fetch_one: bool = False):
     """Execute query and return results"""
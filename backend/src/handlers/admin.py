@@ -1,77 +1,388 @@
 import json
+import math
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from src.database import get_db
 from src.middleware.auth import require_gm
-from src.utils.responses import success_response, error_response, handle_cors, cors_headers
+from src.config import config
+from src.utils.responses import (
+    success_response, error_response, handle_cors, cors_headers, etag_matches, not_modified_response
+)
+from src.utils.roles import invalidate_role_cache
+from src.utils.shared_cache import bump_cache_version
+from src.utils.push import broadcast, with_push
+from src.utils.live_map import get_live_snapshot, get_live_delta
+from src.utils.geo import haversine_distance, simplify_track, encode_polyline
+from src.utils.pagination import encode_cursor, decode_cursor, parse_limit, stream_rows
+
+ROSTER_PAGE_SIZE = 200
+ROSTER_MAX_PAGE_SIZE = 1000
+ROSTER_COLUMNS = ['id', 'nickname', 'email', 'faction', 'status', 'lives', 'radiation',
+                  'isGm', 'isBartender', 'createdAt', 'latitude', 'longitude', 'updatedAt']
+ROSTER_SELECT = """p.id, p.nickname, p.email, p.faction, p.status, p.current_lives, p.current_radiation,
+    p.created_at, pl.latitude, pl.longitude, pl.updated_at,
+    COALESCE(pr.is_gm, 0) as is_gm, COALESCE(pr.is_bartender, 0) as is_bartender"""
+
+
+def _roster_row(p):
+    """Roster row values in ROSTER_COLUMNS order"""
+    has_location = p['latitude'] is not None
+    return [
+        p['id'],
+        p['nickname'],
+        p['email'],
+        p['faction'],
+        p['status'],
+        p['current_lives'],
+        p['current_radiation'],
+        bool(p['is_gm']),
+        bool(p['is_bartender']),
+        p['created_at'].isoformat() if p['created_at'] else None,
+        float(p['latitude']) if has_location else None,
+        float(p['longitude']) if has_location else None,
+        p['updated_at'].isoformat() if has_location and p['updated_at'] else None
+    ]
+
+
+def _roster_player(values):
+    """Legacy player object from roster row values"""
+    row = dict(zip(ROSTER_COLUMNS, values))
+    return {
+        'id': row['id'],
+        'nickname': row['nickname'],
+        'email': row['email'],
+        'faction': row['faction'],
+        'status': row['status'],
+        'lives': row['lives'],
+        'radiation': row['radiation'],
+        'isGm': row['isGm'],
+        'isBartender': row['isBartender'],
+        'createdAt': row['createdAt'],
+        'location': {
+            'latitude': row['latitude'],
+            'longitude': row['longitude'],
+            'updatedAt': row['updatedAt']
+        } if row['latitude'] is not None else None
+    }
+
 
 @require_gm
 def handler(event, context):
-    """GET /api/admin/players - Get all players for GM"""
+    """
+    GET /api/admin/players - Get players for GM (also serves /api/admin/locations)
+
+    Query params (all optional, no params = full list as before):
+        limit: page size (max 1000), enables keyset pagination
+        cursor: nextCursor from previous page
+        onlineWithin: only players whose location was updated in last N minutes
+        hasLocation: 1 = only players with known location
+        faction, status: exact match filters
+        format: 'columnar' = {'columns': [...], 'rows': [[...], ...]}
+
+    Ordered by last location update, newest first (players without location last).
+    Rows are streamed from a server-side cursor and serialized one by one.
+    """
+    cors = handle_cors(event)
+    if cors:
+        return cors
+
+    params = event.get('queryStringParameters') or {}
+
     try:
-        with get_db() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    """SELECT p.id, p.nickname, p.email, p.faction, p.status, p.current_lives, p.current_radiation,
-                    p.created_at, pl.latitude, pl.longitude, pl.updated_at,
-                    COALESCE(pr.is_gm, 0) as is_gm, COALESCE(pr.is_bartender, 0) as is_bartender
-                    FROM players p
-                    LEFT JOIN player_locations pl ON p.id = pl.player_id
-                    LEFT JOIN player_roles pr ON p.id = pr.player_id
-                    ORDER BY pl.updated_at DESC, p.created_at DESC"""
-                )
-                players = cursor.fetchall()
-        
+        paginated = 'limit' in params or 'cursor' in params
+        limit = parse_limit(params.get('limit'), ROSTER_PAGE_SIZE, ROSTER_MAX_PAGE_SIZE)
+        cursor_key = decode_cursor(params.get('cursor'), 3)
+        if cursor_key:
+            # ['seen', last updated_at, last id] or ['never', None, last id]
+            phase, last_seen, last_id = cursor_key
+            if phase == 'seen':
+                last_seen = datetime.fromisoformat(last_seen)
+            elif phase != 'never' or last_seen is not None:
+                raise ValueError('Malformed cursor')
+            if not isinstance(last_id, str):
+                raise ValueError('Malformed cursor')
+        else:
+            phase = 'seen'
+        online_within = int(params['onlineWithin']) if params.get('onlineWithin') else None
+        has_location = params.get('hasLocation') in ('1', 'true')
+        columnar = params.get('format') == 'columnar'
+    except (ValueError, TypeError):
+        return error_response('Invalid query parameters', 400, 'INVALID_PARAMETERS', event)
+
+    filters = []
+    filter_params = []
+
+    if params.get('faction'):
+        filters.append('p.faction = %s')
+        filter_params.append(params['faction'])
+
+    if params.get('status'):
+        filters.append('p.status = %s')
+        filter_params.append(params['status'])
+
+    # Two keyset phases, each served by an index: players with a location by
+    # (updated_at, player_id) (idx_updated_player), then the rest by id (PK)
+    queries = []
+
+    if phase == 'seen':
+        where = list(filters)
+        query_params = list(filter_params)
+        if online_within is not None:
+            where.append('pl.updated_at >= NOW() - INTERVAL %s MINUTE')
+            query_params.append(online_within)
+        if cursor_key:
+            where.append('(pl.updated_at < %s OR (pl.updated_at = %s AND pl.player_id < %s))')
+            query_params.extend([last_seen, last_seen, last_id])
+        queries.append(('seen', f"""
+            SELECT {ROSTER_SELECT}
+            FROM player_locations pl
+            JOIN players p ON p.id = pl.player_id
+            LEFT JOIN player_roles pr ON p.id = pr.player_id
+            {'WHERE ' + ' AND '.join(where) if where else ''}
+            ORDER BY pl.updated_at DESC, pl.player_id DESC
+        """, query_params))
+
+    if online_within is None and not has_location:
+        where = filters + ['pl.player_id IS NULL']
+        query_params = list(filter_params)
+        if cursor_key and phase == 'never':
+            where.append('p.id < %s')
+            query_params.append(last_id)
+        queries.append(('never', f"""
+            SELECT {ROSTER_SELECT}
+            FROM players p
+            LEFT JOIN player_locations pl ON p.id = pl.player_id
+            LEFT JOIN player_roles pr ON p.id = pr.player_id
+            WHERE {' AND '.join(where)}
+            ORDER BY p.id DESC
+        """, query_params))
+
+    try:
+        serialized = []
+        last = None
+        last_phase = None
+        has_more = False
+
+        with get_db(readonly=True) as conn:
+            for query_phase, query, query_params in queries:
+                if paginated:
+                    query += 'LIMIT %s'
+                    query_params = query_params + [limit + 1 - len(serialized)]
+
+                for p in stream_rows(conn, query, query_params):
+                    if paginated and len(serialized) == limit:
+                        has_more = True
+                        continue
+
+                    values = _roster_row(p)
+                    serialized.append(json.dumps(values if columnar else _roster_player(values)))
+                    last = p
+                    last_phase = query_phase
+
+                if has_more:
+                    break
+
+        next_cursor = None
+        if has_more:
+            last_seen = last['updated_at'].isoformat() if last_phase == 'seen' else None
+            next_cursor = encode_cursor([last_phase, last_seen, last['id']])
+
+        if columnar:
+            body = ('{"columns": ' + json.dumps(ROSTER_COLUMNS)
+                    + ', "rows": [' + ', '.join(serialized) + ']')
+        else:
+            body = '{"players": [' + ', '.join(serialized) + ']'
+
+        if paginated:
+            body += ', "nextCursor": ' + json.dumps(next_cursor)
+
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                'Access-Control-Allow-Methods': 'GET,OPTIONS'
-            },
-            'body': json.dumps({
-                'players': [
-                    {
-                        'id': p['id'],
-                        'nickname': p['nickname'],
-                        'email': p['email'],
-                        'faction': p['faction'],
-                        'status': p['status'],
-                        'lives': p['current_lives'],
-                        'radiation': p['current_radiation'],
-                        'isGm': bool(p['is_gm']),
-                        'isBartender': bool(p['is_bartender']),
-                        'createdAt': p['created_at'].isoformat() if p['created_at'] else None,
-                        'location': {
-                            'latitude': float(p['latitude']) if p['latitude'] else None,
-                            'longitude': float(p['longitude']) if p['longitude'] else None,
-                            'updatedAt': p['updated_at'].isoformat() if p['updated_at'] else None
-                        } if p['latitude'] else None
-                    }
-                    for p in players
-                ]
-            })
+            'headers': cors_headers(event),
+            'body': body + '}'
         }
-    
+
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': {'code': 'INTERNAL_ERROR', 'message': str(e)}})
-        }
+        return error_response(str(e), 500, 'INTERNAL_ERROR', event)
+
+@require_gm
+def live_handler(event, context):
+    """
+    GET /api/admin/live - Aggregated GM live map snapshot
+
+    Players with positions, active artifacts, zones and control points in one
+    response. The snapshot is built at most once per LIVE_MAP_TTL_SECONDS per
+    container and shared by all GMs.
+
+    Query params:
+        since: snapshotId from previous response - return only changed/removed
+               entities (falls back to full snapshot if unknown)
+    """
+    cors = handle_cors(event)
+    if cors:
+        return cors
+
+    params = event.get('queryStringParameters') or {}
+
+    try:
+        since = int(params['since']) if params.get('since') else None
+    except ValueError:
+        return error_response('Invalid since parameter', 400, 'INVALID_PARAMETERS', event)
+
+    try:
+        snapshot = get_live_snapshot()
+
+        headers = cors_headers(event)
+        headers['Cache-Control'] = 'private, max-age=%d' % config.LIVE_MAP_TTL_SECONDS
+
+        if since is not None:
+            delta = get_live_delta(snapshot, since)
+            if delta is not None:
+                return {'statusCode': 200, 'headers': headers, 'body': delta}
+
+        headers['ETag'] = snapshot['etag']
+        if etag_matches(event, snapshot['etag']):
+            return not_modified_response(snapshot['etag'], headers)
+
+        return {'statusCode': 200, 'headers': headers, 'body': snapshot['body']}
+
+    except Exception as e:
+        return error_response(str(e), 500, 'INTERNAL_ERROR', event)
+
+HISTORY_DEFAULT_WINDOW_HOURS = 1
+HISTORY_MAX_WINDOW_HOURS = 24
+HISTORY_MAX_PLAYERS = 100
+HISTORY_DEFAULT_TOLERANCE = 5  # meters
+
+
+def _track_entry(player_id, points, total, tolerance):
+    """Simplify one player's track and encode it (polyline + time deltas in seconds)"""
+    simplified = simplify_track(points, tolerance)
+    times = []
+    prev = 0
+    for p in simplified:
+        ts = int(p[2].replace(tzinfo=timezone.utc).timestamp())
+        times.append(ts - prev)
+        prev = ts
+    return {
+        'playerId': player_id,
+        'pointCount': total,
+        'simplifiedCount': len(simplified),
+        'polyline': encode_polyline(simplified),
+        'times': times
+    }
+
+
+def _parse_time(value):
+    """ISO time -> naive UTC (offset-less input is taken as UTC)"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
 
 @require_gm
 def history_handler(event, context):
-    """GET /api/admin/players/{id}/history - Get player location history"""
+    """
+    GET /api/admin/players/{id}/history - Get player location history
+    GET /api/admin/history?player_ids=a,b,c - Multi-player replay
+
+    Without query params returns the last 100 raw points ({'track': [...]}).
+
+    Query params:
+        from, to: ISO time window (default last hour, max 24 hours)
+        player_ids: comma-separated player ids (in addition to path id)
+        tolerance: Douglas-Peucker tolerance in meters (default 5, 0 = raw)
+
+    Returns {'tracks': [{'playerId', 'pointCount', 'simplifiedCount',
+    'polyline' (encoded polyline, precision 5), 'times' (first = epoch seconds,
+    then deltas)}]}. Points are streamed from a server-side cursor one player
+    at a time, so memory is bounded by the largest single track.
+    """
+    cors = handle_cors(event)
+    if cors:
+        return cors
+
+    path_id = (event.get('pathParameters') or {}).get('id')
+    params = event.get('queryStringParameters') or {}
+
+    if path_id and not params:
+        return _legacy_history(event, path_id)
+
     try:
-        player_id = event['pathParameters']['id']
-        params = event.get('queryStringParameters') or {}
-        
-        with get_db() as conn:
+        player_ids = [path_id] if path_id else []
+        for player_id in (params.get('player_ids') or '').split(','):
+            if player_id.strip() and player_id.strip() not in player_ids:
+                player_ids.append(player_id.strip())
+
+        to_time = _parse_time(params['to']) if params.get('to') else datetime.utcnow()
+        from_time = (_parse_time(params['from']) if params.get('from')
+                     else to_time - timedelta(hours=HISTORY_DEFAULT_WINDOW_HOURS))
+        tolerance = float(params.get('tolerance', HISTORY_DEFAULT_TOLERANCE))
+        if not math.isfinite(tolerance) or tolerance < 0:
+            raise ValueError('Invalid tolerance')
+    except ValueError:
+        return error_response('Invalid query parameters', 400, 'INVALID_PARAMETERS', event)
+
+    if not player_ids or len(player_ids) > HISTORY_MAX_PLAYERS:
+        return error_response(f'1-{HISTORY_MAX_PLAYERS} player ids required', 400, 'INVALID_PARAMETERS', event)
+
+    if from_time >= to_time or to_time - from_time > timedelta(hours=HISTORY_MAX_WINDOW_HOURS):
+        return error_response(f'Time window must be 0-{HISTORY_MAX_WINDOW_HOURS} hours', 400,
+                              'INVALID_PARAMETERS', event)
+
+    try:
+        tracks = []
+        current_id = None
+        points = []
+        skipped = None  # Last filtered-out point, kept as track end
+        total = 0
+
+        with get_db(readonly=True) as conn:
+            rows = stream_rows(conn, f"""
+                SELECT player_id, latitude, longitude, recorded_at
+                FROM location_history
+                WHERE player_id IN ({', '.join(['%s'] * len(player_ids))})
+                  AND recorded_at >= %s AND recorded_at < %s
+                ORDER BY player_id, recorded_at
+            """, player_ids + [from_time, to_time])
+
+            for row in rows:
+                if row['player_id'] != current_id:
+                    if points:
+                        tracks.append(_track_entry(current_id, points + ([skipped] if skipped else []),
+                                                   total, tolerance))
+                    current_id, points, skipped, total = row['player_id'], [], None, 0
+
+                total += 1
+                point = (float(row['latitude']), float(row['longitude']), row['recorded_at'])
+                # Radial pre-filter while streaming: drop points closer than tolerance to last kept
+                if (points and tolerance > 0
+                        and haversine_distance(points[-1][0], points[-1][1], point[0], point[1]) < tolerance):
+                    skipped = point
+                    continue
+                points.append(point)
+                skipped = None
+
+            if points:
+                tracks.append(_track_entry(current_id, points + ([skipped] if skipped else []),
+                                           total, tolerance))
+
+        return success_response({
+            'from': from_time.isoformat() + 'Z',
+            'to': to_time.isoformat() + 'Z',
+            'tolerance': tolerance,
+            'tracks': tracks
+        }, event=event)
+
+    except Exception as e:
+        return error_response(str(e), 500, 'INTERNAL_ERROR', event)
+
+
+def _legacy_history(event, player_id):
+    """Last 100 raw points of one player"""
+    try:
+        with get_db(readonly=True) as conn:
             with conn.cursor() as cursor:
                 query = """
                     SELECT latitude, longitude, recorded_at
@@ -139,7 +450,7 @@ def spawn_artifact_handler(event, context):
                 artifact_type = cursor.fetchone()
                 
                 # Invalidate artifacts cache
-                cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'artifacts'")
+                bump_cache_version(cursor, 'artifacts')
         
         return {
             'statusCode': 201,
@@ -198,6 +509,7 @@ def get_radiation_zones_handler(event, context):
                 'body': json.dumps({'error': {'message': str(e)}})}
 
 @require_gm
+@with_push
 def update_radiation_zone_handler(event, context):
     """PUT /api/admin/zones/radiation/{id}"""
     cors = handle_cors(event)
@@ -215,12 +527,14 @@ def update_radiation_zone_handler(event, context):
                 """, (body['name'], body['centerLat'], body['centerLng'], body['radius'],
                       body['radiationLevel'], body.get('activeFrom'), body.get('activeTo'),
                       body.get('isActive', True), zone_id))
-                cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'radiation_zones'")
+                bump_cache_version(cursor, 'radiation_zones')
+                broadcast('zone_changed', {'zoneType': 'radiation', 'zoneId': zone_id, 'action': 'updated'}, cursor)
         return {'statusCode': 200, 'headers': cors_headers(event), 'body': json.dumps({'success': True})}
     except Exception as e:
         return {'statusCode': 500, 'headers': cors_headers(event), 'body': json.dumps({'error': {'message': str(e)}})}
 
 @require_gm
+@with_push
 def delete_radiation_zone_handler(event, context):
     """DELETE /api/admin/zones/radiation/{id}"""
     cors = handle_cors(event)
@@ -231,7 +545,8 @@ def delete_radiation_zone_handler(event, context):
         with get_db() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("DELETE FROM radiation_zones WHERE id = %s", (zone_id,))
-                cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'radiation_zones'")
+                bump_cache_version(cursor, 'radiation_zones')
+                broadcast('zone_changed', {'zoneType': 'radiation', 'zoneId': zone_id, 'action': 'deleted'}, cursor)
         return {'statusCode': 200, 'headers': cors_headers(event),
                 'body': json.dumps({'success': True})}
     except Exception as e:
@@ -271,6 +586,7 @@ def get_respawn_zones_handler(event, context):
                 'body': json.dumps({'error': {'message': str(e)}})}
 
 @require_gm
+@with_push
 def update_respawn_zone_handler(event, context):
     """PUT /api/admin/zones/respawn/{id}"""
     cors = handle_cors(event)
@@ -288,12 +604,14 @@ def update_respawn_zone_handler(event, context):
                 """, (body['name'], body['centerLat'], body['centerLng'], body['radius'],
                       body['respawnTimeSeconds'], body.get('activeFrom'), body.get('activeTo'),
                       body.get('isActive', True), zone_id))
-                cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'respawn_zones'")
+                bump_cache_version(cursor, 'respawn_zones')
+                broadcast('zone_changed', {'zoneType': 'respawn', 'zoneId': zone_id, 'action': 'updated'}, cursor)
         return {'statusCode': 200, 'headers': cors_headers(event), 'body': json.dumps({'success': True})}
     except Exception as e:
         return {'statusCode': 500, 'headers': cors_headers(event), 'body': json.dumps({'error': {'message': str(e)}})}
 
 @require_gm
+@with_push
 def delete_respawn_zone_handler(event, context):
     """DELETE /api/admin/zones/respawn/{id}"""
     cors = handle_cors(event)
@@ -304,7 +622,8 @@ def delete_respawn_zone_handler(event, context):
         with get_db() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("DELETE FROM respawn_zones WHERE id = %s", (zone_id,))
-                cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'respawn_zones'")
+                bump_cache_version(cursor, 'respawn_zones')
+                broadcast('zone_changed', {'zoneType': 'respawn', 'zoneId': zone_id, 'action': 'deleted'}, cursor)
         return {'statusCode': 200, 'headers': cors_headers(event),
                 'body': json.dumps({'success': True})}
     except Exception as e:
@@ -312,6 +631,7 @@ def delete_respawn_zone_handler(event, context):
                 'body': json.dumps({'error': {'message': str(e)}})}
 
 @require_gm
+@with_push
 def create_radiation_zone_handler(event, context):
     """POST /api/admin/zones/radiation - Create radiation zone"""
     cors = handle_cors(event)
@@ -338,9 +658,8 @@ def create_radiation_zone_handler(event, context):
                 )
                 
                 # Invalidate cache
-                cursor.execute(
-                    "UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'radiation_zones'"
-                )
+                bump_cache_version(cursor, 'radiation_zones')
+                broadcast('zone_changed', {'zoneType': 'radiation', 'zoneId': zone_id, 'action': 'created'}, cursor)
         
         return {
             'statusCode': 201,
@@ -431,6 +750,7 @@ def update_player_handler(event, context):
                         ON DUPLICATE KEY UPDATE is_gm = %s, is_bartender = %s""",
                         (player_id, is_gm, is_bartender, is_gm, is_bartender)
                     )
+                    invalidate_role_cache(cursor)
                 
                 # Check if player exists
                 cursor.execute("SELECT id FROM players WHERE id = %s", (player_id,))
@@ -469,86 +789,157 @@ def update_player_handler(event, context):
         }
 
 
+ARTIFACTS_PAGE_SIZE = 100
+ARTIFACTS_MAX_PAGE_SIZE = 500
+ARTIFACT_STATUSES = ('Collected', 'Lost', 'Respawning', 'Expired', 'Scheduled', 'Active')
+
+# Spawned artifact status derived from state and time window
+ARTIFACT_STATUS_SQL = """
+    CASE
+        WHEN a.state = 'extracted' THEN 'Collected'
+        WHEN a.state = 'lost' THEN 'Lost'
+        WHEN a.state = 'respawning' THEN 'Respawning'
+        WHEN a.expires_at IS NOT NULL AND a.expires_at < UTC_TIMESTAMP() THEN 'Expired'
+        WHEN a.spawned_at > UTC_TIMESTAMP() THEN 'Scheduled'
+        ELSE 'Active'
+    END
+"""
+
+
 @require_gm
 def get_spawned_artifacts_handler(event, context):
-    """GET /api/admin/artifacts/spawned - Get all spawned artifacts"""
+    """
+    GET /api/admin/artifacts/spawned - Get spawned artifacts
+
+    Query params (all optional, no params = all artifacts as before):
+        status: comma-separated statuses (Active, Scheduled, Expired, Respawning, Collected, Lost)
+        typeId: artifact type
+        bbox: minLat,minLng,maxLat,maxLng
+        limit, cursor: keyset pagination (newest spawned first)
+
+    Response includes 'summary' - count per status for the type/bbox filter.
+    """
+    cors = handle_cors(event)
+    if cors:
+        return cors
+
+    params = event.get('queryStringParameters') or {}
+
     try:
+        paginated = 'limit' in params or 'cursor' in params
+        limit = parse_limit(params.get('limit'), ARTIFACTS_PAGE_SIZE, ARTIFACTS_MAX_PAGE_SIZE)
+        cursor_key = decode_cursor(params.get('cursor'), 2)
+        if cursor_key:
+            # [last spawned_at, last id]
+            spawned_at = datetime.fromisoformat(cursor_key[0])
+            if not isinstance(cursor_key[1], str):
+                raise ValueError('Malformed cursor')
+
+        statuses = [st.strip().capitalize() for st in (params.get('status') or '').split(',') if st.strip()]
+        if any(st not in ARTIFACT_STATUSES for st in statuses):
+            raise ValueError('Unknown status')
+
+        bbox = [float(v) for v in params['bbox'].split(',')] if params.get('bbox') else None
+        if bbox is not None and len(bbox) != 4:
+            raise ValueError('Invalid bbox')
+    except (ValueError, TypeError):
+        return error_response('Invalid query parameters', 400, 'INVALID_PARAMETERS', event)
+
+    # Filters shared by page and summary query
+    where = []
+    where_params = []
+
+    if params.get('typeId'):
+        where.append('a.type_id = %s')
+        where_params.append(params['typeId'])
+
+    if bbox:
+        where.append('a.latitude BETWEEN %s AND %s AND a.longitude BETWEEN %s AND %s')
+        where_params.extend([bbox[0], bbox[2], bbox[1], bbox[3]])
+
+    page_where = list(where)
+    page_params = list(where_params)
+
+    if statuses:
+        page_where.append(f"{ARTIFACT_STATUS_SQL} IN ({', '.join(['%s'] * len(statuses))})")
+        page_params.extend(statuses)
+
+    if cursor_key:
+        page_where.append('(a.spawned_at < %s OR (a.spawned_at = %s AND a.id < %s))')
+        page_params.extend([spawned_at, spawned_at, cursor_key[1]])
+
+    if paginated:
+        page_params.append(limit + 1)
+
+    try:
+        result_artifacts = []
+        last = None
+        has_more = False
+
         with get_db() as conn:
+            for a in stream_rows(conn, f"""
+                SELECT a.id, a.type_id, a.latitude, a.longitude, a.state,
+                       a.spawned_at, a.expires_at, a.extracted_at, a.owner_id,
+                       a.respawn_enabled, a.respawn_delay_minutes, a.respawn_radius_meters,
+                       a.pickup_count, a.last_pickup_at,
+                       {ARTIFACT_STATUS_SQL} as status,
+                       at.name as type_name, p.nickname as collected_by
+                FROM artifacts a
+                JOIN artifact_types at ON a.type_id = at.id
+                LEFT JOIN players p ON a.owner_id = p.id
+                {'WHERE ' + ' AND '.join(page_where) if page_where else ''}
+                ORDER BY a.spawned_at DESC, a.id DESC
+                {'LIMIT %s' if paginated else ''}
+            """, page_params):
+                if paginated and len(result_artifacts) == limit:
+                    has_more = True
+                    continue
+
+                result_artifacts.append({
+                    'id': a['id'],
+                    'typeId': a['type_id'],
+                    'typeName': a['type_name'],
+                    'latitude': float(a['latitude']),
+                    'longitude': float(a['longitude']),
+                    'state': a['state'],
+                    'status': a['status'],
+                    'collectedBy': a['collected_by'],
+                    'collectedByPlayerId': a['owner_id'],
+                    'spawnedAt': a['spawned_at'].isoformat() + 'Z' if a['spawned_at'] else None,
+                    'expiresAt': a['expires_at'].isoformat() + 'Z' if a['expires_at'] else None,
+                    'extractedAt': a['extracted_at'].isoformat() + 'Z' if a['extracted_at'] else None,
+                    'respawnEnabled': bool(a['respawn_enabled']),
+                    'respawnDelayMinutes': a['respawn_delay_minutes'],
+                    'respawnRadiusMeters': a['respawn_radius_meters'],
+                    'pickupCount': a['pickup_count'] or 0,
+                    'lastPickupAt': a['last_pickup_at'].isoformat() + 'Z' if a['last_pickup_at'] else None
+                })
+                last = a
+
             with conn.cursor() as cursor:
-                cursor.execute(
-                    """SELECT a.id, a.type_id, a.latitude, a.longitude, a.state, 
-                    a.spawned_at, a.expires_at, a.extracted_at, a.owner_id,
-                    a.respawn_enabled, a.respawn_delay_minutes, a.respawn_radius_meters,
-                    a.pickup_count, a.last_pickup_at,
-                    at.name as type_name, p.nickname as collected_by
+                cursor.execute(f"""
+                    SELECT {ARTIFACT_STATUS_SQL} as status, COUNT(*) as count
                     FROM artifacts a
-                    JOIN artifact_types at ON a.type_id = at.id
-                    LEFT JOIN players p ON a.owner_id = p.id
-                    ORDER BY a.spawned_at DESC"""
-                )
-                artifacts = cursor.fetchall()
-        
-        result_artifacts = []
-        now = datetime.utcnow()
-        
-        for a in artifacts:
-            # Determine status
-            if a['state'] == 'extracted':
-                status = 'Collected'
-            elif a['state'] == 'lost':
-                status = 'Lost'
-            elif a['state'] == 'respawning':
-                status = 'Respawning'
-            elif a['expires_at'] and a['expires_at'] < now:
-                status = 'Expired'
-            elif a['spawned_at'] > now:
-                status = 'Scheduled'
-            else:
-                status = 'Active'
-            
-            result_artifacts.append({
-                'id': a['id'],
-                'typeId': a['type_id'],
-                'typeName': a['type_name'],
-                'latitude': float(a['latitude']),
-                'longitude': float(a['longitude']),
-                'state': a['state'],
-                'status': status,
-                'collectedBy': a['collected_by'],
-                'collectedByPlayerId': a['owner_id'],
-                'spawnedAt': a['spawned_at'].isoformat() + 'Z' if a['spawned_at'] else None,
-                'expiresAt': a['expires_at'].isoformat() + 'Z' if a['expires_at'] else None,
-                'extractedAt': a['extracted_at'].isoformat() + 'Z' if a['extracted_at'] else None,
-                'respawnEnabled': bool(a['respawn_enabled']),
-                'respawnDelayMinutes': a['respawn_delay_minutes'],
-                'respawnRadiusMeters': a['respawn_radius_meters'],
-                'pickupCount': a['pickup_count'] or 0,
-                'lastPickupAt': a['last_pickup_at'].isoformat() + 'Z' if a['last_pickup_at'] else None
-            })
-        
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                'Access-Control-Allow-Methods': 'GET,OPTIONS'
-            },
-            'body': json.dumps({'artifacts': result_artifacts})
+                    {'WHERE ' + ' AND '.join(where) if where else ''}
+                    GROUP BY status
+                """, where_params)
+                counts = {row['status']: row['count'] for row in cursor.fetchall()}
+
+        response = {
+            'artifacts': result_artifacts,
+            'summary': {st: counts.get(st, 0) for st in ARTIFACT_STATUSES}
         }
+        if paginated:
+            response['nextCursor'] = (encode_cursor([last['spawned_at'].isoformat(), last['id']])
+                                      if has_more else None)
+
+        return success_response(response, event=event)
     
     except Exception as e:
         print(f"Get spawned artifacts error: {e}")
         import traceback
         traceback.print_exc()
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': {'code': 'INTERNAL_ERROR', 'message': str(e)}})
-        }
+        return error_response(str(e), 500, 'INTERNAL_ERROR', event)
 
 @require_gm
 def delete_artifact_handler(event, context):
@@ -571,7 +962,7 @@ def delete_artifact_handler(event, context):
                     }
                 
                 # Invalidate cache
-                cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'artifacts'")
+                bump_cache_version(cursor, 'artifacts')
         
         return {
             'statusCode': 200,
@@ -637,7 +1028,7 @@ def reset_artifact_to_map_handler(event, context):
                 )
                 
                 # Invalidate cache
-                cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'artifacts'")
+                bump_cache_version(cursor, 'artifacts')
         
         return {
             'statusCode': 200,
@@ -719,7 +1110,7 @@ def remove_and_reset_artifact_handler(event, context):
                 )
                 
                 # Invalidate cache
-                cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'artifacts'")
+                bump_cache_version(cursor, 'artifacts')
         
         return {
             'statusCode': 200,
@@ -750,6 +1141,7 @@ def remove_and_reset_artifact_handler(event, context):
 
 
 @require_gm
+@with_push
 def create_respawn_zone_handler(event, context):
     """POST /api/admin/zones/respawn - Create respawn zone"""
     cors = handle_cors(event)
@@ -776,9 +1168,8 @@ def create_respawn_zone_handler(event, context):
                 )
                 
                 # Invalidate cache
-                cursor.execute(
-                    "UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'respawn_zones'"
-                )
+                bump_cache_version(cursor, 'respawn_zones')
+                broadcast('zone_changed', {'zoneType': 'respawn', 'zoneId': zone_id, 'action': 'created'}, cursor)
         
         return {
             'statusCode': 201,
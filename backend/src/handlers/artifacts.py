@@ -1,14 +1,15 @@
 import json
-import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 from src.database import get_db
 from src.middleware.auth import require_auth
 from src.utils.geo import haversine_distance, get_effective_radius
 from src.config import config
+from src.utils.push import push_to_players, broadcast, with_push
+from src.utils.shared_cache import bump_cache_version
 
 def invalidate_artifacts_cache(cursor):
     """Invalidate artifacts cache by incrementing version"""
-    cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'artifacts'")
+    bump_cache_version(cursor, 'artifacts')
 
 @require_auth
 def handler(event, context):
@@ -211,7 +212,6 @@ def start_extraction_handler(event, context):
                         },
                         'body': json.dumps({'error': {'code': 'TOO_FAR', 'message': f'Too far from artifact ({distance:.1f}m, need ≤{pickup_radius:.0f}m)'}})
                     }
-                    }
                 
                 # Start extraction
                 extraction_time = datetime.utcnow()
@@ -262,6 +262,7 @@ def start_extraction_handler(event, context):
         }
 
 @require_auth
+@with_push
 def complete_extraction_handler(event, context):
     """POST /api/artifacts/extract/complete - Complete extraction"""
     try:
@@ -426,25 +427,28 @@ def complete_extraction_handler(event, context):
                 )
                 
                 # Update quest progress for artifact collection quests
-                from src.utils.quest import update_artifact_collection_progress, log_quest_event, fail_artifact_quests_for_others
+                from src.utils.quest import update_artifact_collection_progress, log_quest_event, fail_artifact_quests_for_others, get_instance_progress
                 import json as json_module
                 
                 # Fail artifact quests for OTHER players targeting this artifact type
                 fail_artifact_quests_for_others(cursor, artifact['type_id'], player_id)
                 
                 cursor.execute("""
-                    SELECT id, quest_data, auto_complete FROM contracts
-                    WHERE accepted_by = %s AND status = 'accepted' AND failed = 0
-                      AND quest_type = 'artifact_collection'
+                    SELECT qi.id, qi.progress, t.auto_complete
+                    FROM quest_instances qi
+                    JOIN quest_templates t ON qi.template_id = t.id
+                    WHERE qi.player_id = %s AND qi.status = 'accepted'
+                      AND t.quest_type = 'artifact_collection'
                 """, (player_id,))
                 
                 for quest in cursor.fetchall():
-                    quest_data = json_module.loads(quest['quest_data']) if quest['quest_data'] else {}
+                    quest_data = get_instance_progress(quest['progress'])
+                    previous_data = json_module.dumps(quest_data)
                     updated_data, completed = update_artifact_collection_progress(quest_data, artifact['type_id'])
                     
-                    if updated_data != quest_data:
+                    if json_module.dumps(updated_data) != previous_data:
                         cursor.execute(
-                            "UPDATE contracts SET quest_data = %s WHERE id = %s",
+                            "UPDATE quest_instances SET progress = %s WHERE id = %s",
                             (json_module.dumps(updated_data), quest['id'])
                         )
                         log_quest_event(cursor, quest['id'], player_id, 'progress', updated_data, 'artifact_pickup')
@@ -452,13 +456,15 @@ def complete_extraction_handler(event, context):
                         # Auto-complete if enabled and objectives met
                         if completed and quest['auto_complete']:
                             cursor.execute(
-                                "UPDATE contracts SET status = 'completed', completed_at = NOW() WHERE id = %s",
+                                "UPDATE quest_instances SET status = 'completed', completed_at = NOW() WHERE id = %s",
                                 (quest['id'],)
                             )
                             log_quest_event(cursor, quest['id'], player_id, 'completed', updated_data, 'auto_complete')
+                            push_to_players([player_id], 'quest_completed', {'questId': quest['id']}, cursor)
                 
                 # Invalidate artifacts cache
                 invalidate_artifacts_cache(cursor)
+                broadcast('artifact_taken', {'artifactId': artifact_id, 'typeId': artifact['type_id']}, cursor)
         
         response = {
             'success': True,
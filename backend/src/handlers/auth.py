@@ -20,7 +20,9 @@ def login_handler(event, context):
             with conn.cursor() as cursor:
                 cursor.execute("""
                     SELECT p.id, p.nickname, p.email, p.password_hash, p.faction, p.status,
-                           COALESCE(pr.is_gm, 0) as is_gm
+                           COALESCE(pr.is_gm, 0) as is_gm, COALESCE(pr.is_bartender, 0) as is_bartender,
+                           (SELECT version FROM cache_versions WHERE cache_key = 'player_roles') as role_version,
+                           p.token_version
                     FROM players p
                     LEFT JOIN player_roles pr ON p.id = pr.player_id
                     WHERE p.email = %s
@@ -34,7 +36,13 @@ def login_handler(event, context):
         if player['status'] == 'dead':
             return error_response('Account is inactive. Contact administrator.', 403, 'ACCOUNT_INACTIVE')
         
-        token = create_jwt_token(player['id'])
+        # Roles are signed into the token, so GM checks skip the player_roles lookup
+        token = create_jwt_token(
+            player['id'],
+            roles={'is_gm': player['is_gm'], 'is_bartender': player['is_bartender']},
+            role_version=player['role_version'] or 0,
+            token_version=player['token_version']
+        )
         
         response_data = {
             'id': player['id'],
@@ -120,7 +128,7 @@ def register_handler(event, context):
 def me_handler(event, context):
     """GET /api/auth/me"""
     from src.middleware.auth import get_current_player
-    from src.utils.qr import generate_qr_code
+    from src.utils.roles import resolve_roles
     
     try:
         player = get_current_player(event)
@@ -140,29 +148,19 @@ def me_handler(event, context):
                     (player_id,)
                 )
                 player_data = cursor.fetchone()
-                
-                # Get player roles
-                cursor.execute(
-                    """SELECT is_gm, is_bartender, permissions 
-                    FROM player_roles WHERE player_id = %s""",
-                    (player_id,)
-                )
-                roles_data = cursor.fetchone()
         
         if not player_data:
             return error_response('Player not found', 404, 'NOT_FOUND')
         
-        # Determine role for frontend
+        # Determine role for frontend (token claims / container cache)
+        roles_data = resolve_roles(player)
         role = 'player'
-        if roles_data:
-            if roles_data.get('is_gm'):
-                role = 'gm'
-            elif roles_data.get('is_bartender'):
-                role = 'bartender'
-        
-        # Generate QR code image
-        qr_code_image = generate_qr_code(player_id)
+        if roles_data['is_gm']:
+            role = 'gm'
+        elif roles_data['is_bartender']:
+            role = 'bartender'
         
+        # Loot QR is served as immutable asset (players.qr_handler), me only references it
         response = {
             'id': player_data['id'],
             'nickname': player_data['nickname'],
@@ -173,7 +171,7 @@ def me_handler(event, context):
             'reputation': player_data['reputation'],
             'currentLives': player_data['current_lives'],
             'currentRadiation': player_data['current_radiation'],
-            'qrCode': qr_code_image,
+            'qrCodeUrl': f'/api/players/{player_id}/qr',
             'resurrectionProgress': {
                 'seconds': player_data['resurrection_progress_seconds'] or 0,
                 'percent': 0
@@ -295,6 +293,7 @@ def reset_password_handler(event, context):
     import hashlib
     from datetime import datetime
     from src.utils.auth_simple import decode_jwt_token
+    from src.utils.token_cache import revoke_player_tokens
     
     try:
         body = json.loads(event.get('body', '{}'))
@@ -344,6 +343,9 @@ def reset_password_handler(event, context):
                     (password_hash, player_id)
                 )
                 
+                # Sign out all existing sessions
+                revoke_player_tokens(cursor, player_id)
+                
                 # Mark token as used
                 cursor.execute(
                     "UPDATE password_reset_tokens SET used = TRUE WHERE id = %s",
@@ -13,7 +13,7 @@ def handler(event, context):
         params = event.get('queryStringParameters') or {}
         status = params.get('status', 'available')
         
-        with get_db() as conn:
+        with get_db(readonly=True) as conn:
             with conn.cursor() as cursor:
                 # Get player faction for filtering
                 cursor.execute(
@@ -13,6 +13,7 @@ from src.utils.inventory import (
     unequip_item,
     update_cached_bonuses
 )
+from src.utils.trade import get_trade_session, lock_trade_session, get_committed_result, sell_items
 
 
 def cors_headers():
@@ -395,115 +396,78 @@ def drop_item_handler(event, context):
 
 @require_auth
 def sell_item_handler(event, context):
-    """POST /api/inventory/sell - Sell item from backpack"""
+    """POST /api/inventory/sell - Sell backpack items to trader (bulk)
+    
+    Body: {trade_session_id, items: [{itemId, quantity}]}
+    Legacy single-item body {trade_session_id, itemId} is still accepted.
+    """
     
     player_id = event['player']['player_id']
     
     try:
         body = json.loads(event.get('body', '{}'))
-        item_id = body.get('itemId')
-        item_type = body.get('itemType', 'equipment')
+        session_id = body.get('trade_session_id') or body.get('tradeSessionId')
         
-        if not item_id:
+        items = [
+            {'item_id': item.get('itemId'), 'quantity': item.get('quantity', 1)}
+            for item in body.get('items', [])
+        ]
+        if not items and body.get('itemId'):
+            items = [{'item_id': body.get('itemId'), 'quantity': body.get('quantity', 1)}]
+        
+        if not items:
             return {
                 'statusCode': 400,
                 'headers': cors_headers(),
                 'body': json.dumps({'error': 'itemId is required'})
             }
         
+        if not session_id:
+            return {
+                'statusCode': 400,
+                'headers': cors_headers(),
+                'body': json.dumps({'error': 'trade_session_id is required (sell to a trader)'})
+            }
+        
+        session, error = get_trade_session(session_id, player_id)
+        
+        if error:
+            return {
+                'statusCode': 404 if error == 'SESSION_NOT_FOUND' else 403,
+                'headers': cors_headers(),
+                'body': json.dumps({'error': error})
+            }
+        
         with get_db() as conn:
             cursor = conn.cursor()
             
-            # Get player reputation
-            cursor.execute("SELECT reputation, balance FROM players WHERE id = %s", (player_id,))
-            player = cursor.fetchone()
-            reputation = player['reputation']
-            balance = float(player['balance'])
-            
-            # Calculate price modifier
-            price_multiplier = 1 + (reputation / 100) * 0.3
-            
-            if item_type == 'equipment':
-                # Check if in backpack
-                cursor.execute("""
-                    SELECT pe.id, et.name, et.base_price, pe.slot_type
-                    FROM player_equipment pe
-                    JOIN equipment_types et ON pe.equipment_type_id = et.id
-                    WHERE pe.id = %s AND pe.player_id = %s
-                """, (item_id, player_id))
-                
-                item = cursor.fetchone()
-                
-                if not item:
+            if lock_trade_session(cursor, session) != 'pending':
+                prev = get_committed_result(cursor, session['id'])
+                if prev and prev['type'] != 'sell':
                     return {
-                        'statusCode': 404,
+                        'statusCode': 409,
                         'headers': cors_headers(),
-                        'body': json.dumps({'error': 'Item not found'})
+                        'body': json.dumps({'error': 'SESSION_ALREADY_USED'})
                     }
-                
-                if item['slot_type'] != 'backpack':
+                if prev:
                     return {
-                        'statusCode': 400,
+                        'statusCode': 200,
                         'headers': cors_headers(),
-                        'body': json.dumps({'error': 'Item must be in backpack to sell. Unequip first.'})
+                        'body': json.dumps({
+                            'success': True,
+                            'priceReceived': float(prev['total_amount'])
+                        })
                     }
-                
-                base_price = float(item['base_price'])
-                sell_price = round(base_price * price_multiplier, 2)
-                
-                # Delete item
-                cursor.execute("DELETE FROM player_equipment WHERE id = %s", (item_id,))
-                
-                item_name = item['name']
             
-            elif item_type == 'artifact':
-                # Check if in backpack
-                cursor.execute("""
-                    SELECT a.id, at.name, at.base_value, a.slot_type
-                    FROM artifacts a
-                    JOIN artifact_types at ON a.type_id = at.id
-                    WHERE a.id = %s AND a.owner_id = %s
-                """, (item_id, player_id))
-                
-                artifact = cursor.fetchone()
-                
-                if not artifact:
-                    return {
-                        'statusCode': 404,
-                        'headers': cors_headers(),
-                        'body': json.dumps({'error': 'Artifact not found'})
-                    }
-                
-                if artifact['slot_type'] != 'backpack':
-                    return {
-                        'statusCode': 400,
-                        'headers': cors_headers(),
-                        'body': json.dumps({'error': 'Artifact must be in backpack to sell. Unequip first.'})
-                    }
-                
-                base_price = float(artifact['base_value'])
-                sell_price = round(base_price * price_multiplier, 2)
-                
-                # Delete artifact
-                cursor.execute("DELETE FROM artifacts WHERE id = %s", (item_id,))
-                
-                item_name = artifact['name']
+            result = sell_items(cursor, player_id, session, items)
             
-            else:
+            if not result['success']:
                 return {
-                    'statusCode': 400,
+                    'statusCode': 403 if result['error'] == 'PLAYER_DEAD_SELL_FORBIDDEN' else 400,
                     'headers': cors_headers(),
-                    'body': json.dumps({'error': 'Invalid item type'})
+                    'body': json.dumps({'error': result['error']})
                 }
             
-            # Add money to player
-            new_balance = balance + sell_price
-            cursor.execute("""
-                UPDATE players
-                SET balance = %s
-                WHERE id = %s
-            """, (new_balance, player_id))
-            
             conn.commit()
             
             return {
@@ -511,13 +475,18 @@ def sell_item_handler(event, context):
                 'headers': cors_headers(),
                 'body': json.dumps({
                     'success': True,
-                    'sold': {
-                        'id': item_id,
-                        'name': item_name,
-                        'basePrice': base_price
-                    },
-                    'priceReceived': sell_price,
-                    'newBalance': new_balance
+                    'sold': [
+                        {
+                            'id': line['item_id'],
+                            'name': line['name'],
+                            'quantity': line['quantity'],
+                            'unitPrice': line['unit_price']
+                        }
+                        for line in result['lines']
+                    ],
+                    'transactionId': result['transaction_id'],
+                    'priceReceived': result['total_amount'],
+                    'newBalance': result['new_balance']
                 })
             }
     
@@ -7,6 +7,7 @@ import uuid
 from src.database import get_db
 from src.middleware.auth import require_gm
 from src.utils.responses import success_response, error_response
+from src.utils.catalog import invalidate_catalog_cache
 
 @require_gm
 def list_items_handler(event, context):
@@ -118,6 +119,9 @@ def update_item_handler(event, context):
                 if cursor.rowcount == 0:
                     return error_response('Item not found', 404)
                 
+                # Invalidate trader catalog cache (prices/details changed)
+                invalidate_catalog_cache(cursor)
+                
                 conn.commit()
         
         return success_response({'message': 'Item updated successfully'})
@@ -209,6 +213,9 @@ def delete_item_handler(event, context):
                 if cursor.rowcount == 0:
                     return error_response('Item not found', 404)
                 
+                # Invalidate trader catalog cache
+                invalidate_catalog_cache(cursor)
+                
                 conn.commit()
         
         return success_response({
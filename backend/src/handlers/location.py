@@ -5,6 +5,8 @@ from src.database import get_db
 from src.middleware.auth import require_auth
 from src.utils.geo import haversine_distance, point_in_circle, get_effective_radius
 from src.config import config
+from src.utils.push import push_to_players, with_push
+from src.utils.shared_cache import get_world_snapshot
 
 # Global cache for active artifacts (Lambda container reuse)
 _artifacts_cache = {
@@ -13,19 +15,7 @@ _artifacts_cache = {
     'ttl': 900  # 15 minutes
 }
 
-def get_active_artifacts(cursor):
-    """Get active artifacts with version-based cache"""
-    # Get current cache version from DB
-    cursor.execute("SELECT version FROM cache_versions WHERE cache_key = 'artifacts'")
-    result = cursor.fetchone()
-    current_version = result['version'] if result else 0
-    
-    # Check if cache is valid
-    if (_artifacts_cache['data'] is not None and 
-        _artifacts_cache['version'] == current_version):
-        return _artifacts_cache['data']
-    
-    # Query database
+def _load_active_artifacts(cursor):
     cursor.execute("""
         SELECT a.id, a.type_id, at.name, at.description, at.rarity, at.base_value,
                at.bonus_lives, at.radiation_resist, at.other_effects, at.image_url,
@@ -37,16 +27,14 @@ def get_active_artifacts(cursor):
           AND a.spawned_at <= NOW()
           AND (a.expires_at IS NULL OR a.expires_at > NOW())
     """)
-    
-    artifacts = cursor.fetchall()
-    
-    # Update cache
-    _artifacts_cache['data'] = artifacts
-    _artifacts_cache['version'] = current_version
-    
-    return artifacts
+    return cursor.fetchall()
+
+def get_active_artifacts(cursor):
+    """Get active artifacts with version-based cache (local, then shared, then DB)"""
+    return get_world_snapshot(cursor, 'artifacts', _artifacts_cache, _load_active_artifacts)
 
 @require_auth
+@with_push
 def update_handler(event, context):
     """POST /api/location - Update player location + radiation + respawn"""
     try:
@@ -275,28 +263,31 @@ def update_handler(event, context):
                 activate_respawned_artifacts(cursor)
                 
                 # Update quest progress for patrol/visit quests
-                from src.utils.quest import update_patrol_progress, update_visit_progress, log_quest_event
+                from src.utils.quest import update_patrol_progress, update_visit_progress, log_quest_event, get_instance_progress
                 
                 cursor.execute("""
-                    SELECT id, quest_type, quest_data, auto_complete FROM contracts
-                    WHERE accepted_by = %s AND status = 'accepted' AND failed = 0
-                      AND quest_type IN ('patrol', 'visit')
+                    SELECT qi.id, qi.progress, t.quest_type, t.auto_complete
+                    FROM quest_instances qi
+                    JOIN quest_templates t ON qi.template_id = t.id
+                    WHERE qi.player_id = %s AND qi.status = 'accepted'
+                      AND t.quest_type IN ('patrol', 'visit')
                 """, (player_id,))
                 
                 # Estimate delta time (assume 15 sec between updates)
                 delta_time = 15
                 
                 for quest in cursor.fetchall():
-                    quest_data = json.loads(quest['quest_data']) if quest['quest_data'] else {}
+                    quest_data = get_instance_progress(quest['progress'])
+                    previous_data = json.dumps(quest_data)
                     
                     if quest['quest_type'] == 'visit':
                         updated_data, completed = update_visit_progress(quest_data, latitude, longitude, accuracy)
                     else:  # patrol
                         updated_data, completed = update_patrol_progress(quest_data, latitude, longitude, delta_time, accuracy)
                     
-                    if updated_data != quest_data:
+                    if json.dumps(updated_data) != previous_data:
                         cursor.execute(
-                            "UPDATE contracts SET quest_data = %s WHERE id = %s",
+                            "UPDATE quest_instances SET progress = %s WHERE id = %s",
                             (json.dumps(updated_data), quest['id'])
                         )
                         log_quest_event(cursor, quest['id'], player_id, 'progress', updated_data, 'location_update')
@@ -304,10 +295,17 @@ def update_handler(event, context):
                         # Auto-complete if enabled and objectives met
                         if completed and quest['auto_complete']:
                             cursor.execute(
-                                "UPDATE contracts SET status = 'completed', completed_at = NOW() WHERE id = %s",
+                                "UPDATE quest_instances SET status = 'completed', completed_at = NOW() WHERE id = %s",
                                 (quest['id'],)
                             )
                             log_quest_event(cursor, quest['id'], player_id, 'completed', updated_data, 'auto_complete')
+                            push_to_players([player_id], 'quest_completed', {'questId': quest['id']}, cursor)
+        
+        if radiation_update or respawn_update:
+            push_to_players([player_id], 'tick', {
+                'radiationUpdate': radiation_update,
+                'resurrectionUpdate': respawn_update
+            })
         
         response = {
             'success': True,
@@ -0,0 +1,36 @@
+"""
+Outbox handlers - drain game events to consumers
+"""
+from src.utils.outbox import drain, get_consumers, purge
+import src.utils.push  # noqa: F401 - registers 'push' consumer
+import src.utils.shared_cache  # noqa: F401 - registers 'cache' consumer
+
+DRAIN_TIME_RESERVE_MS = 10000  # Stop starting new batches this close to timeout
+
+
+def drain_handler(event, context):
+    """Scheduled: deliver outbox events to every consumer (push, cache, analytics), purge old ones"""
+    results = []
+
+    for name in get_consumers():
+        stats = {'consumer': name, 'batches': 0, 'events': 0}
+        try:
+            while context is None or context.get_remaining_time_in_millis() > DRAIN_TIME_RESERVE_MS:
+                drained = drain(name, max_batches=1)
+                stats['batches'] += drained['batches']
+                stats['events'] += drained['events']
+                if drained['batches'] == 0:
+                    break
+        except Exception as e:
+            print(f"Error draining outbox consumer {name}: {str(e)}")
+            stats['error'] = str(e)
+        results.append(stats)
+
+    purged = 0
+    try:
+        purged = purge()
+    except Exception as e:
+        print(f"Error purging outbox: {str(e)}")
+
+    print(f"Outbox drain: {results}, purged {purged}")
+    return {'consumers': results, 'purged': purged}
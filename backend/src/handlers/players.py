@@ -4,6 +4,10 @@ import random
 from datetime import datetime
 from src.database import get_db
 from src.middleware.auth import require_auth
+from src.utils.reputation import add_reputation_batch
+from src.utils.qr import get_player_qr, is_qr_cached, qr_etag
+from src.utils.push import push_to_players, with_push
+from src.utils.responses import etag_matches, not_modified_response
 from src.utils.game import calculate_loot_money, should_loot_item, should_lose_item_on_death
 
 
@@ -11,8 +15,9 @@ def cors_headers():
     return {
         'Content-Type': 'application/json',
         'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
+        'Access-Control-Allow-Headers': 'Content-Type,Authorization,If-None-Match',
+        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+        'Access-Control-Expose-Headers': 'ETag'
     }
 
 
@@ -124,12 +129,10 @@ def trigger_death(cursor, player_id, reason='radiation_zone'):
         if q['reward']:
             cursor.execute("UPDATE players SET balance = balance + %s WHERE id = %s",
                           (q['reward'], q['accepted_by']))
-        if q['reward_reputation']:
-            cursor.execute("""
-                INSERT INTO npc_reputation (id, player_id, faction, reputation)
-                VALUES (%s, %s, 'loner', %s)
-                ON DUPLICATE KEY UPDATE reputation = reputation + %s
-            """, (str(uuid.uuid4()), q['accepted_by'], q['reward_reputation'], q['reward_reputation']))
+    add_reputation_batch(cursor, [
+        {'player_id': q['accepted_by'], 'amount': q['reward_reputation'], 'faction': 'loner'}
+        for q in completed_eliminations if q['reward_reputation']
+    ])
     
     # Create death event
     cursor.execute("""
@@ -140,6 +143,8 @@ def trigger_death(cursor, player_id, reason='radiation_zone'):
         'livesRemaining': new_lives
     })))
     
+    push_to_players([player_id], 'death', {'reason': reason, 'livesRemaining': new_lives}, cursor)
+    
     return {
         'died': True,
         'reason': reason,
@@ -188,6 +193,120 @@ def handler(event, context):
         }
 
 @require_auth
+def status_handler(event, context):
+    """
+    GET /api/player/status - Volatile player fields for the header poll
+
+    Single primary-key read. ETag is the player's status_version (bumped by
+    trigger whenever status, lives, radiation, balance or resurrection
+    progress change), so unchanged polls get 304 with no body.
+    """
+    player_id = event['player']['player_id']
+
+    try:
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """SELECT status, current_lives, current_radiation, balance,
+                    resurrection_progress_seconds, status_version
+                    FROM players WHERE id = %s""",
+                    (player_id,)
+                )
+                player = cursor.fetchone()
+
+        if not player:
+            return {
+                'statusCode': 404,
+                'headers': cors_headers(),
+                'body': json.dumps({'error': {'code': 'NOT_FOUND', 'message': 'Player not found'}})
+            }
+
+        etag = f'"{player_id}:{player["status_version"]}"'
+        headers = cors_headers()
+        headers['Cache-Control'] = 'private, no-cache'
+        headers['ETag'] = etag
+
+        if etag_matches(event, etag):
+            return not_modified_response(etag, headers)
+
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': json.dumps({
+                'status': player['status'],
+                'currentLives': player['current_lives'],
+                'currentRadiation': player['current_radiation'],
+                'balance': float(player['balance']),
+                'resurrectionProgressSeconds': player['resurrection_progress_seconds'] or 0,
+                'statusVersion': player['status_version']
+            })
+        }
+
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': cors_headers(),
+            'body': json.dumps({'error': {'code': 'INTERNAL_ERROR', 'message': str(e)}})
+        }
+
+
+QR_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def qr_handler(event, context):
+    """
+    GET /api/players/{id}/qr - Player's loot QR code (SVG)
+
+    Content is deterministic (STALKER_LOOT:<id>), so it is rendered once per
+    container and served as an immutable asset with ETag. No auth: browsers
+    load it via <img>, and player ids are already public (GET /api/players).
+    Only well-formed ids of existing players are rendered; revalidations
+    (If-None-Match) are answered from the derived ETag without rendering.
+    """
+    player_id = (event.get('pathParameters') or {}).get('id')
+    try:
+        player_id = str(uuid.UUID(player_id))
+    except (ValueError, TypeError, AttributeError):
+        return {
+            'statusCode': 400,
+            'headers': cors_headers(),
+            'body': json.dumps({'error': {'code': 'BAD_REQUEST', 'message': 'Valid player id required'}})
+        }
+
+    try:
+        etag = qr_etag(player_id)
+        headers = {
+            'Content-Type': 'image/svg+xml',
+            'Access-Control-Allow-Origin': '*',
+            'Cache-Control': QR_CACHE_CONTROL,
+            'ETag': etag
+        }
+
+        if etag_matches(event, etag):
+            return not_modified_response(etag, headers)
+
+        if not is_qr_cached(player_id):
+            with get_db(readonly=True) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1 FROM players WHERE id = %s", (player_id,))
+                    if not cursor.fetchone():
+                        return {
+                            'statusCode': 404,
+                            'headers': cors_headers(),
+                            'body': json.dumps({'error': {'code': 'NOT_FOUND', 'message': 'Player not found'}})
+                        }
+
+        return {'statusCode': 200, 'headers': headers, 'body': get_player_qr(player_id)['svg']}
+
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': cors_headers(),
+            'body': json.dumps({'error': {'code': 'INTERNAL_ERROR', 'message': str(e)}})
+        }
+
+@require_auth
+@with_push
 def death_handler(event, context):
     """POST /api/player/death - Mark self as dead"""
     try:
@@ -228,6 +347,7 @@ def death_handler(event, context):
 
 @require_auth
 @require_auth
+@with_push
 def loot_handler(event, context):
     """POST /api/player/loot - Loot player via QR scan"""
     from src.utils.qr import parse_qr_code
@@ -6,75 +6,53 @@ import uuid
 from datetime import datetime
 from src.database import get_db
 from src.middleware.auth import require_auth, require_gm
-from src.utils.quest import log_quest_event
-from src.utils.reputation import add_reputation
+from src.utils.quest import (
+    initial_progress, log_quest_event, sweep_quest_lifecycle, sync_quest_factions, valid_faction_restrictions
+)
+from src.utils.reputation import add_reputation_batch
+from src.utils.quest_board import (
+    format_instance, get_quest_templates, get_templates_by_id, get_quest_board, is_on_board,
+    invalidate_quest_board_cache
+)
+from src.utils.responses import etag_matches, not_modified_response
+from src.utils.push import push_to_players, with_push
 
 CORS_HEADERS = {
     'Content-Type': 'application/json',
     'Access-Control-Allow-Origin': '*',
-    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization,If-None-Match',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Access-Control-Expose-Headers': 'ETag'
 }
 
 MAX_ACTIVE_QUESTS = 5
 
 
-def _format_quest(q):
-    """Format quest for API response"""
-    return {
-        'id': q['id'],
-        'type': q['type'],
-        'questType': q['quest_type'],
-        'title': q['title'],
-        'description': q['description'],
-        'reward': float(q['reward']),
-        'status': q['status'],
-        'failed': bool(q['failed']),
-        'failedReason': q['failed_reason'],
-        'autoComplete': bool(q['auto_complete']),
-        'questData': json.loads(q['quest_data']) if q['quest_data'] else None,
-        'issuer': {
-            'id': q['issuer_id'],
-            'nickname': q.get('issuer_nickname') or q.get('trader_name')
-        },
-        'factionRestriction': q['faction_restriction'],
-        'expiresAt': q['expires_at'].isoformat() + 'Z' if q['expires_at'] else None,
-        'acceptedAt': q['accepted_at'].isoformat() + 'Z' if q['accepted_at'] else None,
-        'createdAt': q['created_at'].isoformat() + 'Z' if q['created_at'] else None
-    }
-
-
 @require_auth
 def list_available_handler(event, context):
     """GET /api/quests - List available quests"""
     try:
         player_id = event['player']['player_id']
         
-        with get_db() as conn:
+        with get_db(readonly=True) as conn:
             with conn.cursor() as cursor:
                 cursor.execute("SELECT faction FROM players WHERE id = %s", (player_id,))
                 player = cursor.fetchone()
                 
-                cursor.execute("""
-                    SELECT c.*, 
-                           COALESCE(p.nickname, t.name) as issuer_nickname,
-                           t.name as trader_name
-                    FROM contracts c
-                    LEFT JOIN players p ON c.issuer_id = p.id
-                    LEFT JOIN traders t ON c.issuer_id = t.id
-                    WHERE c.status = 'available'
-                      AND c.quest_type IS NOT NULL
-                      AND (c.faction_restriction IS NULL OR c.faction_restriction = %s)
-                      AND c.available_at <= NOW()
-                      AND (c.expires_at IS NULL OR c.expires_at > NOW())
-                    ORDER BY c.created_at DESC
-                """, (player['faction'],))
-                quests = cursor.fetchall()
+                # Shared per-faction board (cached, invalidated by quest edits)
+                board = get_quest_board(cursor, player['faction'])
+        
+        headers = dict(CORS_HEADERS)
+        headers['ETag'] = board['etag']
+        headers['Cache-Control'] = 'private, no-cache'
+        
+        if etag_matches(event, board['etag']):
+            return not_modified_response(board['etag'], headers)
         
         return {
             'statusCode': 200,
-            'headers': CORS_HEADERS,
-            'body': json.dumps({'quests': [_format_quest(q) for q in quests]})
+            'headers': headers,
+            'body': board['body']
         }
     except Exception as e:
         return {'statusCode': 500, 'headers': CORS_HEADERS,
@@ -90,23 +68,23 @@ def list_active_handler(event, context):
         with get_db() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    SELECT c.*, 
-                           COALESCE(p.nickname, t.name) as issuer_nickname,
-                           t.name as trader_name
-                    FROM contracts c
-                    LEFT JOIN players p ON c.issuer_id = p.id
-                    LEFT JOIN traders t ON c.issuer_id = t.id
-                    WHERE c.accepted_by = %s
-                      AND c.status = 'accepted'
-                      AND c.failed = 0
-                    ORDER BY c.accepted_at DESC
+                    SELECT id, template_id, status, failed_reason, progress, accepted_at
+                    FROM quest_instances
+                    WHERE player_id = %s
+                      AND status = 'accepted'
+                    ORDER BY accepted_at DESC
                 """, (player_id,))
-                quests = cursor.fetchall()
+                instances = cursor.fetchall()
+                
+                templates = get_templates_by_id(cursor, [q['template_id'] for q in instances])
+        
+        quests = [format_instance(q, templates[q['template_id']])
+                  for q in instances if q['template_id'] in templates]
         
         return {
             'statusCode': 200,
             'headers': CORS_HEADERS,
-            'body': json.dumps({'quests': [_format_quest(q) for q in quests]})
+            'body': json.dumps({'quests': quests})
         }
     except Exception as e:
         return {'statusCode': 500, 'headers': CORS_HEADERS,
@@ -131,37 +109,38 @@ def list_completed_handler(event, context):
         with get_db() as conn:
             with conn.cursor() as cursor:
                 # Build WHERE clause
-                where = "c.accepted_by = %s AND c.status != 'available' AND c.status != 'accepted'"
+                where = "player_id = %s AND status != 'accepted'"
                 where_params = [player_id]
                 
                 if filter_type == 'completed':
-                    where += " AND c.status = 'completed'"
+                    where += " AND status = 'completed'"
                 elif filter_type == 'failed':
-                    where += " AND c.failed = 1"
+                    where += " AND status = 'failed'"
                 
                 # Get total count
-                cursor.execute(f"SELECT COUNT(*) as total FROM contracts c WHERE {where}", where_params)
+                cursor.execute(f"SELECT COUNT(*) as total FROM quest_instances WHERE {where}", where_params)
                 total = cursor.fetchone()['total']
                 
                 # Get quests
                 cursor.execute(f"""
-                    SELECT c.*, 
-                           COALESCE(p.nickname, t.name) as issuer_nickname,
-                           t.name as trader_name
-                    FROM contracts c
-                    LEFT JOIN players p ON c.issuer_id = p.id
-                    LEFT JOIN traders t ON c.issuer_id = t.id
+                    SELECT id, template_id, status, failed_reason, progress, accepted_at
+                    FROM quest_instances
                     WHERE {where}
-                    ORDER BY COALESCE(c.completed_at, c.accepted_at) DESC
+                    ORDER BY COALESCE(completed_at, accepted_at) DESC
                     LIMIT %s OFFSET %s
                 """, where_params + [limit, offset])
-                quests = cursor.fetchall()
+                instances = cursor.fetchall()
+                
+                templates = get_templates_by_id(cursor, [q['template_id'] for q in instances])
+        
+        quests = [format_instance(q, templates[q['template_id']])
+                  for q in instances if q['template_id'] in templates]
         
         return {
             'statusCode': 200,
             'headers': CORS_HEADERS,
             'body': json.dumps({
-                'quests': [_format_quest(q) for q in quests],
+                'quests': quests,
                 'pagination': {
                     'page': page,
                     'limit': limit,
@@ -183,25 +162,28 @@ def get_quest_handler(event, context):
         
         with get_db() as conn:
             with conn.cursor() as cursor:
+                # Player's quest instance or quest template
                 cursor.execute("""
-                    SELECT c.*, 
-                           COALESCE(p.nickname, t.name) as issuer_nickname,
-                           t.name as trader_name
-                    FROM contracts c
-                    LEFT JOIN players p ON c.issuer_id = p.id
-                    LEFT JOIN traders t ON c.issuer_id = t.id
-                    WHERE c.id = %s
+                    SELECT id, template_id, status, failed_reason, progress, accepted_at
+                    FROM quest_instances
+                    WHERE id = %s
                 """, (quest_id,))
-                quest = cursor.fetchone()
+                instance = cursor.fetchone()
+                
+                templates = get_templates_by_id(cursor, [instance['template_id'] if instance else quest_id])
         
-        if not quest:
+        if instance and instance['template_id'] in templates:
+            quest = format_instance(instance, templates[instance['template_id']])
+        elif quest_id in templates:
+            quest = templates[quest_id]['quest']
+        else:
             return {'statusCode': 404, 'headers': CORS_HEADERS,
                     'body': json.dumps({'error': {'code': 'NOT_FOUND', 'message': 'Quest not found'}})}
         
         return {
             'statusCode': 200,
             'headers': CORS_HEADERS,
-            'body': json.dumps({'quest': _format_quest(quest)})
+            'body': json.dumps({'quest': quest})
         }
     except Exception as e:
         return {'statusCode': 500, 'headers': CORS_HEADERS,
@@ -217,67 +199,40 @@ def accept_handler(event, context):
         
         with get_db() as conn:
             with conn.cursor() as cursor:
-                # Check active quests limit
-                cursor.execute("""
-                    SELECT COUNT(*) as cnt FROM contracts 
-                    WHERE accepted_by = %s AND status = 'accepted' AND failed = 0
-                """, (player_id,))
-                if cursor.fetchone()['cnt'] >= MAX_ACTIVE_QUESTS:
-                    return {'statusCode': 400, 'headers': CORS_HEADERS,
-                            'body': json.dumps({'error': {'code': 'MAX_QUESTS', 'message': f'Max {MAX_ACTIVE_QUESTS} active quests'}})}
-                
                 # Get player faction
                 cursor.execute("SELECT faction FROM players WHERE id = %s", (player_id,))
                 player = cursor.fetchone()
                 
-                # Get quest template
-                cursor.execute("""
-                    SELECT * FROM contracts 
-                    WHERE id = %s 
-                      AND status = 'available'
-                      AND (faction_restriction IS NULL OR faction_restriction = %s)
-                      AND (expires_at IS NULL OR expires_at > NOW())
-                """, (quest_id, player['faction']))
-                quest = cursor.fetchone()
+                # Get quest template (cached)
+                template = get_quest_templates(cursor)['by_id'].get(quest_id)
                 
-                if not quest:
+                if not template or not is_on_board(template, player['faction'], datetime.utcnow()):
                     return {'statusCode': 409, 'headers': CORS_HEADERS,
                             'body': json.dumps({'error': {'code': 'CONFLICT', 'message': 'Quest not available'}})}
                 
-                # Check if player already has this quest active
+                # Check active quests limit and if player already has this quest active
                 cursor.execute("""
-                    SELECT id FROM contracts 
-                    WHERE accepted_by = %s AND status = 'accepted' AND failed = 0
-                      AND title = %s AND quest_type = %s
-                """, (player_id, quest['title'], quest['quest_type']))
-                if cursor.fetchone():
+                    SELECT COUNT(*) as cnt, COALESCE(SUM(template_id = %s), 0) as same_quest
+                    FROM quest_instances
+                    WHERE player_id = %s AND status = 'accepted'
+                """, (quest_id, player_id))
+                active = cursor.fetchone()
+                
+                if active['cnt'] >= MAX_ACTIVE_QUESTS:
+                    return {'statusCode': 400, 'headers': CORS_HEADERS,
+                            'body': json.dumps({'error': {'code': 'MAX_QUESTS', 'message': f'Max {MAX_ACTIVE_QUESTS} active quests'}})}
+                
+                if active['same_quest']:
                     return {'statusCode': 409, 'headers': CORS_HEADERS,
                             'body': json.dumps({'error': {'code': 'ALREADY_ACTIVE', 'message': 'You already have this quest active'}})}
                 
-                # Create player's copy of quest with fresh progress
-                quest_data = json.loads(quest['quest_data']) if quest['quest_data'] else {}
-                # Reset progress
-                if 'current_count' in quest_data:
-                    quest_data['current_count'] = 0
-                if 'visited' in quest_data:
-                    quest_data['visited'] = False
-                if 'checkpoints' in quest_data:
-                    for cp in quest_data['checkpoints']:
-                        cp['visited'] = False
-                if 'accumulated_time_seconds' in quest_data:
-                    quest_data['accumulated_time_seconds'] = 0
-                if 'checkpoint_visits' in quest_data:
-                    quest_data['checkpoint_visits'] = []
-                
+                # Create player's quest instance with a snapshot of the template's initial progress
                 player_quest_id = str(uuid.uuid4())
                 cursor.execute("""
-                    INSERT INTO contracts (id, type, quest_type, issuer_id, title, description, reward,
-                                          escrow_amount, quest_data, auto_complete, faction_restriction,
-                                          status, accepted_by, accepted_at, expires_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, 0, %s, %s, %s, 'accepted', %s, NOW(), %s)
-                """, (player_quest_id, quest['quest_type'], quest['quest_type'], quest['issuer_id'],
-                      quest['title'], quest['description'], quest['reward'], json.dumps(quest_data),
-                      quest['auto_complete'], quest['faction_restriction'], player_id, quest['expires_at']))
+                    INSERT INTO quest_instances (id, template_id, player_id, progress)
+                    VALUES (%s, %s, %s, %s)
+                """, (player_quest_id, quest_id, player_id,
+                      json.dumps(initial_progress(template['quest']['questData']))))
                 
                 log_quest_event(cursor, player_quest_id, player_id, 'accepted')
         
@@ -301,9 +256,10 @@ def claim_handler(event, context):
         with get_db() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    UPDATE contracts 
-                    SET status = 'in_progress'
-                    WHERE id = %s AND accepted_by = %s AND status = 'accepted' AND auto_complete = 0
+                    UPDATE quest_instances qi
+                    JOIN quest_templates t ON qi.template_id = t.id
+                    SET qi.status = 'in_progress'
+                    WHERE qi.id = %s AND qi.player_id = %s AND qi.status = 'accepted' AND t.auto_complete = 0
                 """, (quest_id, player_id))
                 
                 if cursor.rowcount == 0:
@@ -330,10 +286,9 @@ def cancel_handler(event, context):
         with get_db() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    UPDATE contracts 
-                    SET status = 'available', accepted_by = NULL, accepted_at = NULL,
-                        quest_data = JSON_SET(COALESCE(quest_data, '{}'), '$.current_count', 0)
-                    WHERE id = %s AND accepted_by = %s AND status = 'accepted'
+                    UPDATE quest_instances
+                    SET status = 'cancelled'
+                    WHERE id = %s AND player_id = %s AND status = 'accepted'
                 """, (quest_id, player_id))
                 
                 if cursor.rowcount == 0:
@@ -393,12 +348,15 @@ def create_handler(event, context):
                     quest_data = {'item_id': body.get('itemId'), 'delivery_lat': body.get('deliveryLat'), 'delivery_lng': body.get('deliveryLng'), 'delivery_radius': body.get('deliveryRadius', 10)}
                 
                 cursor.execute("""
-                    INSERT INTO contracts (id, type, quest_type, issuer_id, title, description, reward, 
-                                          escrow_amount, quest_data, auto_complete, faction_restriction, expires_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, 0, %s, %s, %s, %s)
-                """, (quest_id, quest_type, quest_type, player_id, body.get('title'), body.get('description'),
+                    INSERT INTO quest_templates (id, quest_type, issuer_id, title, description, reward, 
+                                                quest_data, auto_complete, faction_restriction, expires_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """, (quest_id, quest_type, player_id, body.get('title'), body.get('description'),
                       body.get('reward', 0), json.dumps(quest_data), 
                       quest_type in ('visit', 'patrol'), body.get('factionRestriction'), body.get('expiresAt')))
+                
+                sync_quest_factions(cursor, quest_id)
+                invalidate_quest_board_cache(cursor)
         
         return {
             'statusCode': 201,
@@ -418,24 +376,14 @@ def admin_list_handler(event, context):
     try:
         with get_db() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT c.*, 
-                           COALESCE(p.nickname, t.name) as issuer_nickname,
-                           t.name as trader_name
-                    FROM contracts c
-                    LEFT JOIN players p ON c.issuer_id = p.id
-                    LEFT JOIN traders t ON c.issuer_id = t.id
-                    WHERE c.quest_type IS NOT NULL
-                      AND c.status = 'available'
-                    ORDER BY c.created_at DESC
-                    LIMIT 100
-                """)
-                quests = cursor.fetchall()
+                templates = get_quest_templates(cursor)
+        
+        quests = [templates['by_id'][template_id]['quest'] for template_id in templates['order'][:100]]
         
         return {
             'statusCode': 200,
             'headers': CORS_HEADERS,
-            'body': json.dumps({'quests': [_format_quest(q) for q in quests]})
+            'body': json.dumps({'quests': quests})
         }
     except Exception as e:
         return {'statusCode': 500, 'headers': CORS_HEADERS,
@@ -448,6 +396,11 @@ def admin_create_handler(event, context):
     try:
         body = json.loads(event.get('body', '{}'))
         
+        if not valid_faction_restrictions(body.get('factionRestrictions')):
+            return {'statusCode': 400, 'headers': CORS_HEADERS,
+                    'body': json.dumps({'error': {'code': 'INVALID_FACTIONS',
+                                                  'message': 'factionRestrictions must list known factions'}})}
+        
         with get_db() as conn:
             with conn.cursor() as cursor:
                 quest_id = str(uuid.uuid4())
@@ -462,12 +415,12 @@ def admin_create_handler(event, context):
                     quest_data['protected_player_id'] = body.get('targetPlayerId')
                 
                 cursor.execute("""
-                    INSERT INTO contracts (id, type, quest_type, issuer_id, title, description, 
-                                          reward, reward_item_id, reward_reputation,
-                                          target_player_id, escrow_amount, quest_data, auto_complete, 
-                                          faction_restriction, faction_restrictions, expires_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 0, %s, %s, %s, %s, %s)
-                """, (quest_id, quest_type or 'manual', quest_type, issuer_id, 
+                    INSERT INTO quest_templates (id, quest_type, issuer_id, title, description, 
+                                                reward, reward_item_id, reward_reputation,
+                                                target_player_id, quest_data, auto_complete, 
+                                                faction_restriction, faction_restrictions, expires_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """, (quest_id, quest_type or 'manual', issuer_id, 
                       body.get('title'), body.get('description'),
                       body.get('reward', 0), body.get('rewardItemId'), body.get('rewardReputation', 0),
                       target_player_id, json.dumps(quest_data), 
@@ -475,6 +428,9 @@ def admin_create_handler(event, context):
                       body.get('factionRestriction'),
                       json.dumps(body.get('factionRestrictions')) if body.get('factionRestrictions') else None,
                       body.get('expiresAt')))
+                
+                sync_quest_factions(cursor, quest_id)
+                invalidate_quest_board_cache(cursor)
         
         return {
             'statusCode': 201,
@@ -487,6 +443,7 @@ def admin_create_handler(event, context):
 
 
 @require_gm
+@with_push
 def admin_confirm_handler(event, context):
     """POST /api/admin/quests/{id}/confirm - Confirm quest completion"""
     try:
@@ -495,10 +452,12 @@ def admin_confirm_handler(event, context):
         with get_db() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    SELECT c.*, t.faction as trader_faction
-                    FROM contracts c
-                    LEFT JOIN traders t ON c.issuer_id = t.id
-                    WHERE c.id = %s AND c.status IN ('accepted', 'in_progress')
+                    SELECT qi.id, qi.player_id, t.reward, t.reward_item_id, t.reward_reputation,
+                           tr.faction as trader_faction
+                    FROM quest_instances qi
+                    JOIN quest_templates t ON qi.template_id = t.id
+                    LEFT JOIN traders tr ON t.issuer_id = tr.id
+                    WHERE qi.id = %s AND qi.status IN ('accepted', 'in_progress')
                 """, (quest_id,))
                 quest = cursor.fetchone()
                 
@@ -506,21 +465,26 @@ def admin_confirm_handler(event, context):
                     return {'statusCode': 404, 'headers': CORS_HEADERS,
                             'body': json.dumps({'error': {'code': 'NOT_FOUND', 'message': 'Quest not found or not ready'}})}
                 
-                player_id = quest['accepted_by']
+                player_id = quest['player_id']
                 rewards_given = {}
                 
-                # Pay money reward
+                # Pay money reward and update stats in one statement
+                cursor.execute("""
+                    UPDATE players
+                    SET balance = balance + %s,
+                        total_contracts_completed = total_contracts_completed + 1
+                    WHERE id = %s
+                """, (quest['reward'] or 0, player_id))
                 if quest['reward']:
-                    cursor.execute("UPDATE players SET balance = balance + %s WHERE id = %s", 
-                                  (quest['reward'], player_id))
                     rewards_given['money'] = float(quest['reward'])
                 
-                # Pay reputation reward
+                # Pay reputation reward (single upsert)
                 if quest['reward_reputation']:
-                    if quest['trader_faction']:
-                        add_reputation(cursor, player_id, quest['reward_reputation'], faction=quest['trader_faction'])
-                    else:
-                        add_reputation(cursor, player_id, quest['reward_reputation'], faction='loner')
+                    add_reputation_batch(cursor, [{
+                        'player_id': player_id,
+                        'amount': quest['reward_reputation'],
+                        'faction': quest['trader_faction'] or 'loner'
+                    }])
                     rewards_given['reputation'] = quest['reward_reputation']
                 
                 # Give item reward
@@ -532,19 +496,14 @@ def admin_confirm_handler(event, context):
                     """, (str(uuid.uuid4()), player_id, quest['reward_item_id']))
                     rewards_given['item_id'] = quest['reward_item_id']
                 
-                # Update stats
-                cursor.execute("""
-                    UPDATE players SET total_contracts_completed = total_contracts_completed + 1 
-                    WHERE id = %s
-                """, (player_id,))
-                
                 # Complete quest
                 cursor.execute("""
-                    UPDATE contracts SET status = 'completed', completed_at = NOW()
+                    UPDATE quest_instances SET status = 'completed', completed_at = NOW()
                     WHERE id = %s
                 """, (quest_id,))
                 
                 log_quest_event(cursor, quest_id, player_id, 'completed')
+                push_to_players([player_id], 'quest_completed', {'questId': quest_id, 'rewards': rewards_given}, cursor)
         
         return {
             'statusCode': 200,
@@ -564,7 +523,16 @@ def admin_delete_handler(event, context):
         
         with get_db() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("DELETE FROM contracts WHERE id = %s", (quest_id,))
+                # Delete unused template, archive it if players have instances (keeps history)
+                cursor.execute("""
+                    DELETE FROM quest_templates
+                    WHERE id = %s
+                      AND NOT EXISTS (SELECT 1 FROM quest_instances WHERE template_id = %s)
+                """, (quest_id, quest_id))
+                
+                if cursor.rowcount == 0:
+                    cursor.execute("UPDATE quest_templates SET status = 'archived' WHERE id = %s", (quest_id,))
+                invalidate_quest_board_cache(cursor)
         
         return {
             'statusCode': 200,
@@ -583,6 +551,11 @@ def admin_update_handler(event, context):
         quest_id = event['pathParameters']['id']
         body = json.loads(event.get('body', '{}'))
         
+        if not valid_faction_restrictions(body.get('factionRestrictions')):
+            return {'statusCode': 400, 'headers': CORS_HEADERS,
+                    'body': json.dumps({'error': {'code': 'INVALID_FACTIONS',
+                                                  'message': 'factionRestrictions must list known factions'}})}
+        
         with get_db() as conn:
             with conn.cursor() as cursor:
                 # Build update query dynamically
@@ -604,6 +577,10 @@ def admin_update_handler(event, context):
                 if 'expiresAt' in body:
                     updates.append("expires_at = %s")
                     params.append(body['expiresAt'])
+                    # Revive a swept quest whose deadline moved out (or was removed);
+                    # MySQL assigns left to right, so this sees the new expires_at
+                    updates.append("""status = IF(status = 'expired' AND (expires_at IS NULL OR expires_at > NOW()),
+                                                  'available', status)""")
                 if 'factionRestriction' in body:
                     updates.append("faction_restriction = %s")
                     params.append(body['factionRestriction'])
@@ -616,11 +593,16 @@ def admin_update_handler(event, context):
                             'body': json.dumps({'error': {'code': 'BAD_REQUEST', 'message': 'No fields to update'}})}
                 
                 params.append(quest_id)
-                cursor.execute(f"UPDATE contracts SET {', '.join(updates)} WHERE id = %s", params)
+                cursor.execute(f"UPDATE quest_templates SET {', '.join(updates)} WHERE id = %s", params)
                 
                 if cursor.rowcount == 0:
                     return {'statusCode': 404, 'headers': CORS_HEADERS,
                             'body': json.dumps({'error': {'code': 'NOT_FOUND', 'message': 'Quest not found'}})}
+                
+                if 'factionRestriction' in body or 'factionRestrictions' in body:
+                    sync_quest_factions(cursor, quest_id)
+                
+                invalidate_quest_board_cache(cursor)
         
         return {
             'statusCode': 200,
@@ -630,3 +612,23 @@ def admin_update_handler(event, context):
     except Exception as e:
         return {'statusCode': 500, 'headers': CORS_HEADERS,
                 'body': json.dumps({'error': {'code': 'INTERNAL_ERROR', 'message': str(e)}})}
+
+
+# ============ Scheduled ============
+
+def sweep_handler(event, context):
+    """Scheduled: expire quest templates and fail timed-out quest instances"""
+    try:
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                result = sweep_quest_lifecycle(cursor)
+                
+                if result['expired_templates']:
+                    invalidate_quest_board_cache(cursor)
+        
+        print(f"Quest sweep: {result}")
+        return result
+        
+    except Exception as e:
+        print(f"Error in sweep_handler: {str(e)}")
+        return {'error': str(e)}
@@ -0,0 +1,212 @@
+"""
+API router - one Lambda for all REST endpoints (ApiLayout=mono)
+
+Dispatches by method + path to the same src.handlers functions (CodeUri
+../backend/) the per-endpoint functions run in ApiLayout=split, so both
+layouts serve the same code; the upload endpoint keeps its own function
+(../backend-upload/) in both layouts. Handler
+modules are imported on first use of one of their routes, so a cold start
+only pays for the module it serves; afterwards every route shares the
+container's warm DB connections (DB_POOL_SIZE) and world caches.
+
+Keep ROUTES in sync with the Api events in infrastructure/template.yaml.
+"""
+import re
+import json
+import importlib
+from typing import Callable, Dict, Optional, Tuple
+from src.utils.responses import cors_headers, handle_cors
+
+# (method, path template, 'module.function' in src.handlers)
+ROUTES = [
+    ('POST', '/api/log', 'log.log_handler'),
+
+    # Auth
+    ('POST', '/api/auth/login', 'auth.login_handler'),
+    ('POST', '/api/auth/register', 'auth.register_handler'),
+    ('GET', '/api/auth/me', 'auth.me_handler'),
+    ('POST', '/api/auth/logout', 'auth.logout_handler'),
+    ('POST', '/api/auth/forgot-password', 'auth.forgot_password_handler'),
+    ('POST', '/api/auth/reset-password', 'auth.reset_password_handler'),
+
+    # Players
+    ('GET', '/api/player/status', 'players.status_handler'),
+    ('POST', '/api/player/respawn', 'players.respawn_handler'),
+    ('GET', '/api/players', 'players.handler'),
+    ('GET', '/api/players/{id}', 'players.handler'),
+    ('PUT', '/api/players/{id}', 'players.handler'),
+    ('GET', '/api/players/{id}/qr', 'players.qr_handler'),
+
+    # Location
+    ('POST', '/api/location', 'location.update_handler'),
+    ('GET', '/api/location/me', 'location.update_handler'),
+    ('GET', '/api/zones/current', 'location.update_handler'),
+
+    # Artifacts
+    ('GET', '/api/artifacts', 'artifacts.handler'),
+    ('POST', '/api/artifacts/extract/start', 'artifacts.start_extraction_handler'),
+    ('POST', '/api/artifacts/extract/complete', 'artifacts.complete_extraction_handler'),
+    ('POST', '/api/artifacts/extract/cancel', 'artifacts.cancel_extraction_handler'),
+    ('POST', '/api/artifacts/drop', 'artifacts.drop_handler'),
+    ('POST', '/api/artifacts/sell', 'artifacts.sell_handler'),
+
+    # Inventory
+    ('GET', '/api/inventory', 'inventory.get_inventory_handler'),
+    ('POST', '/api/inventory/equip', 'inventory.equip_item_handler'),
+    ('POST', '/api/inventory/unequip', 'inventory.unequip_item_handler'),
+    ('POST', '/api/inventory/use', 'inventory.use_consumable_handler'),
+    ('POST', '/api/inventory/drop', 'inventory.drop_item_handler'),
+    ('POST', '/api/inventory/sell', 'inventory.sell_item_handler'),
+
+    # Contracts, zones
+    ('GET', '/api/contracts', 'contracts.handler'),
+    ('POST', '/api/contracts', 'contracts.handler'),
+    ('POST', '/api/contracts/{id}/accept', 'contracts.handler'),
+    ('GET', '/api/zones', 'zones.handler'),
+    ('POST', '/api/zones/{id}/control', 'zones.handler'),
+
+    # Trade
+    ('GET', '/api/traders', 'trade.get_traders_handler'),
+    ('GET', '/api/traders/{id}/quests', 'trade.get_trader_quests_handler'),
+    ('POST', '/api/trade/session/start', 'trade.start_session_handler'),
+    ('GET', '/api/trade/catalog', 'trade.get_catalog_handler'),
+    ('GET', '/api/trade/backpack', 'trade.get_backpack_handler'),
+    ('POST', '/api/trade/buy', 'trade.buy_handler'),
+    ('POST', '/api/trade/sell', 'trade.sell_handler'),
+    ('POST', '/api/trade/redeem', 'trade.redeem_handler'),
+
+    # Quests
+    ('GET', '/api/quests', 'quests.list_available_handler'),
+    ('GET', '/api/quests/active', 'quests.list_active_handler'),
+    ('GET', '/api/quests/completed', 'quests.list_completed_handler'),
+    ('GET', '/api/quests/{id}', 'quests.get_quest_handler'),
+    ('POST', '/api/quests/{id}/accept', 'quests.accept_handler'),
+    ('POST', '/api/quests/{id}/claim', 'quests.claim_handler'),
+    ('POST', '/api/quests/{id}/cancel', 'quests.cancel_handler'),
+    ('POST', '/api/quests/create', 'quests.create_handler'),
+
+    # GM
+    ('GET', '/api/admin/locations', 'admin.handler'),
+    ('POST', '/api/admin/zones', 'admin.handler'),
+    ('PUT', '/api/admin/zones/{id}', 'admin.handler'),
+    ('GET', '/api/admin/events', 'admin.handler'),
+    ('POST', '/api/admin/broadcast', 'admin.handler'),
+    ('GET', '/api/admin/players', 'admin.handler'),
+    ('GET', '/api/admin/live', 'admin.live_handler'),
+    ('GET', '/api/admin/history', 'admin.history_handler'),
+    ('GET', '/api/admin/locations/{id}/history', 'admin.history_handler'),
+    ('GET', '/api/admin/players/{id}/history', 'admin.history_handler'),
+    ('PUT', '/api/admin/players/{id}', 'admin.update_player_handler'),
+    ('POST', '/api/admin/players/{id}/resurrect', 'admin.resurrect_player_handler'),
+    ('POST', '/api/admin/artifacts/spawn', 'admin.spawn_artifact_handler'),
+    ('GET', '/api/admin/artifacts/spawned', 'admin.get_spawned_artifacts_handler'),
+    ('DELETE', '/api/admin/artifacts/{id}', 'admin.delete_artifact_handler'),
+    ('POST', '/api/admin/artifacts/{id}/reset', 'admin.reset_artifact_to_map_handler'),
+    ('POST', '/api/admin/artifacts/{id}/remove-and-reset', 'admin.remove_and_reset_artifact_handler'),
+    ('GET', '/api/admin/zones/radiation', 'admin.get_radiation_zones_handler'),
+    ('POST', '/api/admin/zones/radiation', 'admin.create_radiation_zone_handler'),
+    ('PUT', '/api/admin/zones/radiation/{id}', 'admin.update_radiation_zone_handler'),
+    ('DELETE', '/api/admin/zones/radiation/{id}', 'admin.delete_radiation_zone_handler'),
+    ('GET', '/api/admin/zones/respawn', 'admin.get_respawn_zones_handler'),
+    ('POST', '/api/admin/zones/respawn', 'admin.create_respawn_zone_handler'),
+    ('PUT', '/api/admin/zones/respawn/{id}', 'admin.update_respawn_zone_handler'),
+    ('DELETE', '/api/admin/zones/respawn/{id}', 'admin.delete_respawn_zone_handler'),
+    ('GET', '/api/admin/traders', 'traders.list_traders_handler'),
+    ('POST', '/api/admin/traders', 'traders.create_trader_handler'),
+    ('PUT', '/api/admin/traders/{id}', 'traders.update_trader_handler'),
+    ('DELETE', '/api/admin/traders/{id}', 'traders.delete_trader_handler'),
+    ('GET', '/api/admin/traders/{id}/inventory', 'traders.get_trader_inventory_handler'),
+    ('PUT', '/api/admin/traders/{id}/inventory', 'traders.update_trader_inventory_handler'),
+    ('GET', '/api/admin/traders/{id}/quests', 'traders.get_trader_quests_handler'),
+    ('PUT', '/api/admin/traders/{id}/quests', 'traders.update_trader_quests_handler'),
+    ('GET', '/api/admin/items', 'items.list_items_handler'),
+    ('POST', '/api/admin/items', 'items.create_item_handler'),
+    ('PUT', '/api/admin/items/{id}', 'items.update_item_handler'),
+    ('DELETE', '/api/admin/items/{id}', 'items.delete_item_handler'),
+    ('GET', '/api/admin/artifact-types', 'artifact_types.handler'),
+    ('POST', '/api/admin/artifact-types', 'artifact_types.handler'),
+    ('PUT', '/api/admin/artifact-types/{id}', 'artifact_types.handler'),
+    ('DELETE', '/api/admin/artifact-types/{id}', 'artifact_types.handler'),
+    ('GET', '/api/admin/quests', 'quests.admin_list_handler'),
+    ('POST', '/api/admin/quests', 'quests.admin_create_handler'),
+    ('PUT', '/api/admin/quests/{id}', 'quests.admin_update_handler'),
+    ('DELETE', '/api/admin/quests/{id}', 'quests.admin_delete_handler'),
+    ('POST', '/api/admin/quests/{id}/confirm', 'quests.admin_confirm_handler'),
+]
+
+_PARAM = re.compile(r'\{(\w+)\}')
+
+
+def _compile(template: str):
+    """Path template -> (regex, specificity key: literal segments sort before {params})"""
+    pattern = _PARAM.sub(lambda m: f'(?P<{m.group(1)}>[^/]+)', template)
+    specificity = tuple(segment.startswith('{') for segment in template.strip('/').split('/'))
+    return re.compile(f'^{pattern}$'), specificity
+
+
+# method -> [(regex, path template, target)], most specific first
+_routes = {}
+for _method, _template, _target in ROUTES:
+    _regex, _specificity = _compile(_template)
+    _routes.setdefault(_method, []).append((_specificity, _regex, _template, _target))
+for _method in _routes:
+    _routes[_method] = [route[1:] for route in sorted(_routes[_method], key=lambda route: route[0])]
+
+# 'module.function' -> handler (imported on first request)
+_handlers = {}
+
+
+def _load(target: str) -> Callable:
+    handler = _handlers.get(target)
+    if handler is None:
+        module_name, function_name = target.rsplit('.', 1)
+        module = importlib.import_module(f'src.handlers.{module_name}')
+        handler = _handlers[target] = getattr(module, function_name)
+    return handler
+
+
+def match(method: str, path: str) -> Optional[Tuple[str, str, Dict[str, str]]]:
+    """(path template, target, path parameters) for request, None if no route"""
+    for regex, template, target in _routes.get(method, ()):
+        m = regex.match(path)
+        if m:
+            return template, target, m.groupdict()
+    return None
+
+
+def _error(event, status_code: int, code: str, message: str) -> Dict:
+    return {
+        'statusCode': status_code,
+        'headers': cors_headers(event),
+        'body': json.dumps({'error': {'code': code, 'message': message}})
+    }
+
+
+def handler(event, context):
+    """API Gateway proxy (ANY /api/{proxy+}) -> route handler"""
+    method = event.get('httpMethod', '')
+    path = (event.get('path') or '').rstrip('/') or '/'
+
+    if method == 'OPTIONS':
+        return handle_cors(event)
+
+    route = match(method, path)
+    if route is None:
+        allowed = [m for m in _routes if m != method and match(m, path)]
+        if allowed:
+            return _error(event, 405, 'METHOD_NOT_ALLOWED', f'{method} not allowed on {path}')
+        return _error(event, 404, 'NOT_FOUND', f'No route for {method} {path}')
+
+    template, target, params = route
+    # Same event shape API Gateway gives the per-endpoint functions
+    event['resource'] = template
+    event['pathParameters'] = params or None
+
+    try:
+        route_handler = _load(target)
+    except Exception as e:
+        print(json.dumps({'event': 'route_import_error', 'route': f'{method} {template}',
+                          'target': target, 'error': str(e)}))
+        return _error(event, 500, 'INTERNAL_ERROR', 'Route unavailable')
+
+    return route_handler(event, context)
@@ -5,20 +5,32 @@ Handles trading operations between players and traders (NPC/Bartenders)
 
 import json
 import uuid
-from datetime import datetime, timedelta
 from decimal import Decimal
 from src.database import get_db
 from src.middleware.auth import require_auth
 from src.utils.geo import haversine_distance, get_effective_radius
+from src.utils.catalog import get_trader_catalog, calculate_buy_price, calculate_sell_price
+from src.utils.trade import (
+    create_trade_session, get_trade_session, lock_trade_session,
+    get_committed_result, purge_expired_trade_sessions, sell_items
+)
+from src.utils.responses import etag_matches, not_modified_response
+from src.utils.outbox import record_event
+from src.utils.reputation import get_reputation_vector, trader_discount
 
 CORS_HEADERS = {
     'Content-Type': 'application/json',
     'Access-Control-Allow-Origin': '*',
-    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization,If-None-Match',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Access-Control-Expose-Headers': 'ETag'
 }
 
-SESSION_TIMEOUT_MINUTES = 5
+PURGE_BATCH_SIZE = 1000
+PURGE_MAX_BATCHES = 50
+
+TRADER_QUESTS_PAGE_SIZE = 50
+TRADER_QUESTS_MAX_PAGE_SIZE = 100
 
 
 @require_auth
@@ -43,7 +55,7 @@ def start_session_handler(event, context):
         with get_db() as conn:
             with conn.cursor() as cursor:
                 # Check if player is alive
-                cursor.execute("SELECT status FROM players WHERE id = %s", (player_id,))
+                cursor.execute("SELECT status, reputation_version FROM players WHERE id = %s", (player_id,))
                 player = cursor.fetchone()
                 if player and player['status'] == 'dead':
                     return {
@@ -54,8 +66,8 @@ def start_session_handler(event, context):
                 
                 # Get trader info
                 cursor.execute("""
-                    SELECT id, name, type, latitude, longitude, 
-                           interaction_radius, commission_buy_pct, 
+                    SELECT id, name, type, faction, latitude, longitude,
+                           interaction_radius, commission_buy_pct,
                            commission_sell_pct, is_active
                     FROM traders
                     WHERE id = %s
@@ -107,31 +119,28 @@ def start_session_handler(event, context):
                             })
                         }
                 
-                # Create session
-                session_id = str(uuid.uuid4())
-                expires_at = datetime.utcnow() + timedelta(minutes=SESSION_TIMEOUT_MINUTES)
+                # Reputation discount for this trader (NPC rep, then faction rep),
+                # from the player's reputation vector cached per container
+                vector = get_reputation_vector(cursor, player_id, player['reputation_version'] if player else 0)
+                discount_pct = trader_discount(vector, trader['id'], trader['faction'])
                 
-                cursor.execute("""
-                    INSERT INTO trade_sessions 
-                    (id, player_id, trader_id, status, expires_at)
-                    VALUES (%s, %s, %s, 'pending', %s)
-                """, (session_id, player_id, trader_id, expires_at))
-                
-                conn.commit()
+                # Issue signed session token with discounted commissions (row is created on buy/sell commit)
+                token, session = create_trade_session(player_id, trader, discount_pct)
                 
                 return {
                     'statusCode': 200,
                     'headers': CORS_HEADERS,
                     'body': json.dumps({
-                        'trade_session_id': session_id,
+                        'trade_session_id': token,
                         'trader': {
                             'id': trader['id'],
                             'name': trader['name'],
                             'type': trader['type'],
                             'commission_buy_pct': trader['commission_buy_pct'],
-                            'commission_sell_pct': trader['commission_sell_pct']
+                            'commission_sell_pct': trader['commission_sell_pct'],
+                            'reputation_discount_pct': discount_pct
                         },
-                        'expires_at': expires_at.isoformat() + 'Z'
+                        'expires_at': session['expires_at'].isoformat() + 'Z'
                     })
                 }
                 
@@ -146,7 +155,7 @@ def start_session_handler(event, context):
 
 @require_auth
 def get_catalog_handler(event, context):
-    """GET /api/trade/catalog?trade_session_id={uuid} - Get trader's catalog"""
+    """GET /api/trade/catalog?trade_session_id={token} - Get trader's catalog"""
     try:
         player_id = event['player']['player_id']
         params = event.get('queryStringParameters', {}) or {}
@@ -159,85 +168,33 @@ def get_catalog_handler(event, context):
                 'body': json.dumps({'error': 'MISSING_SESSION_ID'})
             }
         
+        # Validate session token (no DB lookup)
+        session, error = get_trade_session(session_id, player_id)
+        
+        if error:
+            return {
+                'statusCode': 404 if error == 'SESSION_NOT_FOUND' else 403,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': error})
+            }
+        
         with get_db() as conn:
             with conn.cursor() as cursor:
-                # Validate session
-                cursor.execute("""
-                    SELECT trader_id, expires_at, status
-                    FROM trade_sessions
-                    WHERE id = %s AND player_id = %s
-                """, (session_id, player_id))
-                
-                session = cursor.fetchone()
-                
-                if not session:
-                    return {
-                        'statusCode': 404,
-                        'headers': CORS_HEADERS,
-                        'body': json.dumps({'error': 'SESSION_NOT_FOUND'})
-                    }
+                # Get catalog (cached per trader, invalidated by GM edits), priced
+                # with the session's (reputation discounted) buy commission
+                catalog = get_trader_catalog(cursor, session['trader_id'], session['commission_buy_pct'])
                 
-                if session['expires_at'] < datetime.utcnow():
-                    return {
-                        'statusCode': 403,
-                        'headers': CORS_HEADERS,
-                        'body': json.dumps({'error': 'SESSION_EXPIRED'})
-                    }
-                
-                # Get trader commission
-                cursor.execute("""
-                    SELECT commission_buy_pct
-                    FROM traders
-                    WHERE id = %s
-                """, (session['trader_id'],))
-                
-                trader = cursor.fetchone()
-                commission = trader['commission_buy_pct']
-                
-                # Get catalog items
-                cursor.execute("""
-                    SELECT 
-                        i.id as item_def_id,
-                        i.name,
-                        i.description,
-                        i.image_url,
-                        i.type,
-                        i.base_price,
-                        i.is_stackable,
-                        i.extra_lives,
-                        i.wounds_protection,
-                        i.radiation_resistance,
-                        i.anti_radiation
-                    FROM item_definitions i
-                    JOIN trader_inventory ti ON i.id = ti.item_def_id
-                    WHERE ti.trader_id = %s 
-                      AND ti.is_available = TRUE
-                      AND i.is_active = TRUE
-                    ORDER BY i.type, i.name
-                """, (session['trader_id'],))
+                headers = dict(CORS_HEADERS)
+                headers['ETag'] = catalog['etag']
+                headers['Cache-Control'] = 'private, no-cache'
                 
-                items = []
-                for row in cursor.fetchall():
-                    buy_price = round(row['base_price'] * (1 + commission / 100))
-                    items.append({
-                        'item_def_id': row['item_def_id'],
-                        'name': row['name'],
-                        'description': row['description'],
-                        'image_url': row['image_url'],
-                        'type': row['type'],
-                        'base_price': row['base_price'],
-                        'buy_price': buy_price,
-                        'is_stackable': bool(row['is_stackable']),
-                        'extra_lives': row['extra_lives'],
-                        'wounds_protection': row['wounds_protection'],
-                        'radiation_resistance': row['radiation_resistance'],
-                        'anti_radiation': row['anti_radiation']
-                    })
+                if etag_matches(event, catalog['etag']):
+                    return not_modified_response(catalog['etag'], headers)
                 
                 return {
                     'statusCode': 200,
-                    'headers': CORS_HEADERS,
-                    'body': json.dumps({'items': items})
+                    'headers': headers,
+                    'body': catalog['body']
                 }
                 
     except Exception as e:
@@ -251,7 +208,7 @@ def get_catalog_handler(event, context):
 
 @require_auth
 def get_backpack_handler(event, context):
-    """GET /api/trade/backpack?trade_session_id={uuid} - Get player's backpack for selling"""
+    """GET /api/trade/backpack?trade_session_id={token} - Get player's backpack for selling"""
     try:
         player_id = event['player']['player_id']
         params = event.get('queryStringParameters', {}) or {}
@@ -264,31 +221,18 @@ def get_backpack_handler(event, context):
                 'body': json.dumps({'error': 'MISSING_SESSION_ID'})
             }
         
+        # Validate session token (no DB lookup)
+        session, error = get_trade_session(session_id, player_id)
+        
+        if error:
+            return {
+                'statusCode': 404 if error == 'SESSION_NOT_FOUND' else 403,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': error})
+            }
+        
         with get_db() as conn:
             with conn.cursor() as cursor:
-                # Validate session
-                cursor.execute("""
-                    SELECT trader_id, expires_at, status
-                    FROM trade_sessions
-                    WHERE id = %s AND player_id = %s
-                """, (session_id, player_id))
-                
-                session = cursor.fetchone()
-                
-                if not session:
-                    return {
-                        'statusCode': 404,
-                        'headers': CORS_HEADERS,
-                        'body': json.dumps({'error': 'SESSION_NOT_FOUND'})
-                    }
-                
-                if session['expires_at'] < datetime.utcnow():
-                    return {
-                        'statusCode': 403,
-                        'headers': CORS_HEADERS,
-                        'body': json.dumps({'error': 'SESSION_EXPIRED'})
-                    }
-                
                 # Check player is alive
                 cursor.execute("SELECT status FROM players WHERE id = %s", (player_id,))
                 player_status = cursor.fetchone()['status']
@@ -300,15 +244,8 @@ def get_backpack_handler(event, context):
                         'body': json.dumps({'error': 'PLAYER_DEAD_SELL_FORBIDDEN'})
                     }
                 
-                # Get trader commission
-                cursor.execute("""
-                    SELECT commission_sell_pct
-                    FROM traders
-                    WHERE id = %s
-                """, (session['trader_id'],))
-                
-                trader = cursor.fetchone()
-                commission = trader['commission_sell_pct']
+                # Trader commission is carried by the session token
+                commission = session['commission_sell_pct']
                 
                 # Get backpack items (consumables from item_definitions)
                 cursor.execute("""
@@ -365,7 +302,7 @@ def get_backpack_handler(event, context):
                 
                 # Add consumables
                 for row in consumables:
-                    sell_price = round(row['base_price'] * (1 - commission / 100))
+                    sell_price = calculate_sell_price(row['base_price'], commission)
                     items.append({
                         'item_id': str(row['item_id']),
                         'item_def_id': row['item_def_id'],
@@ -387,7 +324,7 @@ def get_backpack_handler(event, context):
                 
                 # Add artifacts
                 for row in artifacts:
-                    sell_price = round(float(row['base_price']) * (1 - commission / 100))
+                    sell_price = calculate_sell_price(row['base_price'], commission)
                     items.append({
                         'item_id': str(row['item_id']),
                         'item_def_id': row['item_def_id'],
@@ -440,40 +377,27 @@ def buy_handler(event, context):
                 'body': json.dumps({'error': 'MISSING_REQUIRED_FIELDS'})
             }
         
+        # Validate session token (no DB lookup)
+        session, error = get_trade_session(session_id, player_id)
+        
+        if error:
+            return {
+                'statusCode': 404 if error == 'SESSION_NOT_FOUND' else 403,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': error})
+            }
+        
         with get_db() as conn:
             with conn.cursor() as cursor:
-                # Validate session
-                cursor.execute("""
-                    SELECT trader_id, expires_at, status
-                    FROM trade_sessions
-                    WHERE id = %s AND player_id = %s
-                """, (session_id, player_id))
-                
-                session = cursor.fetchone()
-                
-                if not session:
-                    return {
-                        'statusCode': 404,
-                        'headers': CORS_HEADERS,
-                        'body': json.dumps({'error': 'SESSION_NOT_FOUND'})
-                    }
-                
-                if session['expires_at'] < datetime.utcnow():
-                    return {
-                        'statusCode': 403,
-                        'headers': CORS_HEADERS,
-                        'body': json.dumps({'error': 'SESSION_EXPIRED'})
-                    }
-                
-                if session['status'] != 'pending':
+                if lock_trade_session(cursor, session) != 'pending':
                     # Idempotency: return previous result
-                    cursor.execute("""
-                        SELECT result, error_code, total_amount
-                        FROM trade_transactions
-                        WHERE trade_session_id = %s
-                    """, (session_id,))
-                    
-                    prev = cursor.fetchone()
+                    prev = get_committed_result(cursor, session['id'])
+                    if prev and prev['type'] != 'buy':
+                        return {
+                            'statusCode': 409,
+                            'headers': CORS_HEADERS,
+                            'body': json.dumps({'error': 'SESSION_ALREADY_USED'})
+                        }
                     if prev:
                         if prev['result'] == 'success':
                             return {
@@ -481,7 +405,7 @@ def buy_handler(event, context):
                                 'headers': CORS_HEADERS,
                                 'body': json.dumps({
                                     'success': True,
-                                    'total_amount': prev['total_amount']
+                                    'total_amount': float(prev['total_amount'])
                                 })
                             }
                         else:
@@ -491,21 +415,8 @@ def buy_handler(event, context):
                                 'body': json.dumps({'error': prev['error_code']})
                             }
                 
-                # Get trader commission
-                cursor.execute("""
-                    SELECT commission_buy_pct
-                    FROM traders
-                    WHERE id = %s
-                """, (session['trader_id'],))
-                
-                trader = cursor.fetchone()
-                commission = trader['commission_buy_pct']
-                
-                # Validate items and calculate total
-                total_amount = 0
-                lines = []
-                slots_needed = 0
-                
+                # Merge cart lines by item (one stack per item type)
+                cart = {}
                 for item in items:
                     item_def_id = item.get('item_def_id')
                     quantity = item.get('quantity', 1)
@@ -513,27 +424,55 @@ def buy_handler(event, context):
                     if quantity <= 0:
                         continue
                     
-                    # Get item info
-                    cursor.execute("""
-                        SELECT i.base_price, i.is_stackable, i.name
-                        FROM item_definitions i
-                        JOIN trader_inventory ti ON i.id = ti.item_def_id
-                        WHERE i.id = %s 
-                          AND ti.trader_id = %s
-                          AND ti.is_available = TRUE
-                          AND i.is_active = TRUE
-                    """, (item_def_id, session['trader_id']))
-                    
-                    item_info = cursor.fetchone()
-                    
-                    if not item_info:
-                        return {
-                            'statusCode': 400,
-                            'headers': CORS_HEADERS,
-                            'body': json.dumps({'error': 'INVALID_ITEM'})
-                        }
-                    
-                    unit_price = round(item_info['base_price'] * (1 + commission / 100))
+                    cart[item_def_id] = cart.get(item_def_id, 0) + quantity
+                
+                if not cart:
+                    return {
+                        'statusCode': 400,
+                        'headers': CORS_HEADERS,
+                        'body': json.dumps({'error': 'MISSING_REQUIRED_FIELDS'})
+                    }
+                
+                item_ids = list(cart.keys())
+                placeholders = ', '.join(['%s'] * len(item_ids))
+                
+                # Get all cart items in one lookup
+                cursor.execute(f"""
+                    SELECT i.id, i.base_price, i.is_stackable, i.name
+                    FROM item_definitions i
+                    JOIN trader_inventory ti ON i.id = ti.item_def_id
+                    WHERE ti.trader_id = %s
+                      AND ti.is_available = TRUE
+                      AND i.is_active = TRUE
+                      AND i.id IN ({placeholders})
+                """, [session['trader_id']] + item_ids)
+                
+                item_infos = {row['id']: row for row in cursor.fetchall()}
+                
+                if len(item_infos) != len(item_ids):
+                    return {
+                        'statusCode': 400,
+                        'headers': CORS_HEADERS,
+                        'body': json.dumps({'error': 'INVALID_ITEM'})
+                    }
+                
+                # Get existing stacks in one lookup (1 slot per new item type)
+                cursor.execute(f"""
+                    SELECT item_id FROM player_inventory
+                    WHERE player_id = %s AND item_type = 'consumable'
+                      AND item_id IN ({placeholders})
+                """, [player_id] + item_ids)
+                
+                stacked = {row['item_id'] for row in cursor.fetchall()}
+                slots_needed = len(set(item_ids) - stacked)
+                
+                # Calculate line prices and total
+                total_amount = 0
+                lines = []
+                
+                for item_def_id, quantity in cart.items():
+                    item_info = item_infos[item_def_id]
+                    unit_price = calculate_buy_price(item_info['base_price'], session['commission_buy_pct'])
                     total_amount += unit_price * quantity
                     
                     lines.append({
@@ -542,21 +481,15 @@ def buy_handler(event, context):
                         'quantity': quantity,
                         'unit_price': unit_price
                     })
-                    
-                    # Calculate slots needed (1 slot per item type, quantity stored in field)
-                    cursor.execute("""
-                        SELECT id FROM player_inventory
-                        WHERE player_id = %s AND item_id = %s AND item_type = 'consumable'
-                    """, (player_id, item_def_id))
-                    
-                    if not cursor.fetchone():
-                        slots_needed += 1
                 
-                # Check player balance
+                # Check player balance and backpack usage (row locked until commit)
                 cursor.execute("""
-                    SELECT balance, backpack_capacity
-                    FROM players
-                    WHERE id = %s
+                    SELECT p.balance, p.backpack_capacity,
+                           (SELECT COUNT(*) FROM player_inventory pi
+                            WHERE pi.player_id = p.id AND pi.slot_type = 'backpack') as used_slots
+                    FROM players p
+                    WHERE p.id = %s
+                    FOR UPDATE
                 """, (player_id,))
                 
                 player_data = cursor.fetchone()
@@ -569,12 +502,12 @@ def buy_handler(event, context):
                         (id, trade_session_id, type, player_id, trader_id, 
                          total_amount, lines_json, result, error_code)
                         VALUES (%s, %s, 'buy', %s, %s, %s, %s, 'failed', 'INSUFFICIENT_FUNDS')
-                    """, (transaction_id, session_id, player_id, 
+                    """, (transaction_id, session['id'], player_id, 
                           session['trader_id'], total_amount, json.dumps(lines)))
                     
                     cursor.execute("""
                         UPDATE trade_sessions SET status = 'failed' WHERE id = %s
-                    """, (session_id,))
+                    """, (session['id'],))
                     
                     conn.commit()
                     
@@ -585,13 +518,7 @@ def buy_handler(event, context):
                     }
                 
                 # Check backpack space
-                cursor.execute("""
-                    SELECT COUNT(*) as used_slots
-                    FROM player_inventory
-                    WHERE player_id = %s AND slot_type = 'backpack'
-                """, (player_id,))
-                
-                used_slots = cursor.fetchone()['used_slots']
+                used_slots = player_data['used_slots']
                 free_slots = player_data['backpack_capacity'] - used_slots
                 
                 if slots_needed > free_slots:
@@ -602,12 +529,12 @@ def buy_handler(event, context):
                         (id, trade_session_id, type, player_id, trader_id, 
                          total_amount, lines_json, result, error_code)
                         VALUES (%s, %s, 'buy', %s, %s, %s, %s, 'failed', 'INVENTORY_FULL')
-                    """, (transaction_id, session_id, player_id, 
+                    """, (transaction_id, session['id'], player_id, 
                           session['trader_id'], total_amount, json.dumps(lines)))
                     
                     cursor.execute("""
                         UPDATE trade_sessions SET status = 'failed' WHERE id = %s
-                    """, (session_id,))
+                    """, (session['id'],))
                     
                     conn.commit()
                     
@@ -629,29 +556,18 @@ def buy_handler(event, context):
                     WHERE id = %s
                 """, (total_amount, player_id))
                 
-                # 2. Add items to player_inventory
+                # 2. Add items to player_inventory (new stacks inserted, existing stacks grow)
+                values = ', '.join(["(%s, 'consumable', %s, 'backpack', %s)"] * len(lines))
+                params = []
                 for line in lines:
-                    # Check if item already exists (regardless of stackable)
-                    cursor.execute("""
-                        SELECT id, quantity FROM player_inventory
-                        WHERE player_id = %s AND item_id = %s AND item_type = 'consumable'
-                    """, (player_id, line['item_def_id']))
-                    
-                    existing = cursor.fetchone()
-                    if existing:
-                        # Update quantity
-                        cursor.execute("""
-                            UPDATE player_inventory
-                            SET quantity = quantity + %s
-                            WHERE id = %s
-                        """, (line['quantity'], existing['id']))
-                    else:
-                        # Insert new
-                        cursor.execute("""
-                            INSERT INTO player_inventory
-                            (player_id, item_type, item_id, slot_type, quantity)
-                            VALUES (%s, 'consumable', %s, 'backpack', %s)
-                        """, (player_id, line['item_def_id'], line['quantity']))
+                    params.extend([player_id, line['item_def_id'], line['quantity']])
+                
+                cursor.execute(f"""
+                    INSERT INTO player_inventory
+                    (player_id, item_type, item_id, slot_type, quantity)
+                    VALUES {values}
+                    ON DUPLICATE KEY UPDATE quantity = quantity + VALUES(quantity)
+                """, params)
                 
                 # 3. Record transaction
                 transaction_id = str(uuid.uuid4())
@@ -660,20 +576,20 @@ def buy_handler(event, context):
                     (id, trade_session_id, type, player_id, trader_id, 
                      total_amount, lines_json, result)
                     VALUES (%s, %s, 'buy', %s, %s, %s, %s, 'success')
-                """, (transaction_id, session_id, player_id, 
+                """, (transaction_id, session['id'], player_id, 
                       session['trader_id'], total_amount, json.dumps(lines)))
+                record_event(cursor, 'trade', {
+                    'type': 'buy', 'transactionId': transaction_id,
+                    'traderId': session['trader_id'], 'totalAmount': total_amount, 'lines': lines
+                }, player_id=player_id)
                 
                 # 4. Update session
                 cursor.execute("""
                     UPDATE trade_sessions SET status = 'success' WHERE id = %s
-                """, (session_id,))
+                """, (session['id'],))
                 
-                # Get new balance
-                cursor.execute("""
-                    SELECT balance FROM players WHERE id = %s
-                """, (player_id,))
-                
-                new_balance = float(cursor.fetchone()['balance'])
+                # New balance (player row is locked, no re-read needed)
+                new_balance = float(player_data['balance']) - total_amount
                 
                 conn.commit()
                 
@@ -715,191 +631,46 @@ def sell_handler(event, context):
                 'body': json.dumps({'error': 'MISSING_REQUIRED_FIELDS'})
             }
         
+        # Validate session token (no DB lookup)
+        session, error = get_trade_session(session_id, player_id)
+        
+        if error:
+            return {
+                'statusCode': 404 if error == 'SESSION_NOT_FOUND' else 403,
+                'headers': CORS_HEADERS,
+                'body': json.dumps({'error': error})
+            }
+        
         with get_db() as conn:
             with conn.cursor() as cursor:
-                # Validate session
-                cursor.execute("""
-                    SELECT trader_id, expires_at, status
-                    FROM trade_sessions
-                    WHERE id = %s AND player_id = %s
-                """, (session_id, player_id))
-                
-                session = cursor.fetchone()
-                
-                if not session:
-                    return {
-                        'statusCode': 404,
-                        'headers': CORS_HEADERS,
-                        'body': json.dumps({'error': 'SESSION_NOT_FOUND'})
-                    }
-                
-                if session['expires_at'] < datetime.utcnow():
-                    return {
-                        'statusCode': 403,
-                        'headers': CORS_HEADERS,
-                        'body': json.dumps({'error': 'SESSION_EXPIRED'})
-                    }
-                
-                # Check player is alive
-                cursor.execute("SELECT status FROM players WHERE id = %s", (player_id,))
-                player_status = cursor.fetchone()['status']
-                
-                if player_status == 'dead':
-                    return {
-                        'statusCode': 403,
-                        'headers': CORS_HEADERS,
-                        'body': json.dumps({'error': 'PLAYER_DEAD_SELL_FORBIDDEN'})
-                    }
-                
-                # Get trader commission
-                cursor.execute("""
-                    SELECT commission_sell_pct
-                    FROM traders
-                    WHERE id = %s
-                """, (session['trader_id'],))
-                
-                trader = cursor.fetchone()
-                commission = trader['commission_sell_pct']
-                
-                # Validate items and calculate total
-                total_amount = 0
-                lines = []
-                
-                for item in items:
-                    item_id = item.get('item_id')
-                    quantity = item.get('quantity', 1)
-                    
-                    if quantity <= 0:
-                        continue
-                    
-                    # Try to get consumable from player_inventory
-                    cursor.execute("""
-                        SELECT 
-                            pi.quantity as available_qty,
-                            pi.item_id as item_def_id,
-                            i.name,
-                            i.base_price,
-                            i.is_sellable,
-                            i.is_stackable,
-                            'consumable' as item_type
-                        FROM player_inventory pi
-                        JOIN item_definitions i ON pi.item_id = i.id
-                        WHERE pi.id = %s AND pi.player_id = %s AND pi.item_type = 'consumable'
-                    """, (item_id, player_id))
-                    
-                    item_info = cursor.fetchone()
-                    
-                    # If not found, try artifact from player_inventory
-                    if not item_info:
-                        cursor.execute("""
-                            SELECT 
-                                1 as available_qty,
-                                pi.item_id as item_def_id,
-                                at.name,
-                                at.base_value as base_price,
-                                TRUE as is_sellable,
-                                FALSE as is_stackable,
-                                'artifact' as item_type
-                            FROM player_inventory pi
-                            JOIN artifact_types at ON pi.item_id = at.id
-                            WHERE pi.id = %s AND pi.player_id = %s 
-                              AND pi.item_type = 'artifact'
-                              AND pi.slot_type = 'backpack'
-                        """, (item_id, player_id))
-                        
-                        item_info = cursor.fetchone()
-                    
-                    if not item_info:
-                        return {
-                            'statusCode': 400,
-                            'headers': CORS_HEADERS,
-                            'body': json.dumps({'error': 'ITEM_NOT_IN_BACKPACK'})
-                        }
-                    
-                    if not item_info['is_sellable']:
+                if lock_trade_session(cursor, session) != 'pending':
+                    # Idempotency: return previous result
+                    prev = get_committed_result(cursor, session['id'])
+                    if prev and prev['type'] != 'sell':
                         return {
-                            'statusCode': 400,
+                            'statusCode': 409,
                             'headers': CORS_HEADERS,
-                            'body': json.dumps({'error': 'ITEM_NOT_SELLABLE'})
+                            'body': json.dumps({'error': 'SESSION_ALREADY_USED'})
                         }
-                    
-                    if quantity > item_info['available_qty']:
+                    if prev:
                         return {
-                            'statusCode': 400,
+                            'statusCode': 200,
                             'headers': CORS_HEADERS,
-                            'body': json.dumps({'error': 'INVALID_QUANTITY'})
+                            'body': json.dumps({
+                                'success': True,
+                                'total_amount': float(prev['total_amount'])
+                            })
                         }
-                    
-                    unit_price = round(item_info['base_price'] * (1 - commission / 100))
-                    total_amount += unit_price * quantity
-                    
-                    lines.append({
-                        'item_id': item_id,
-                        'item_def_id': item_info['item_def_id'],
-                        'name': item_info['name'],
-                        'quantity': quantity,
-                        'unit_price': unit_price,
-                        'is_stackable': item_info['is_stackable'],
-                        'item_type': item_info['item_type']
-                    })
                 
-                # Execute transaction
-                # 1. Remove items from inventory
-                for line in lines:
-                    if line['item_type'] == 'artifact':
-                        # Delete artifact from player_inventory
-                        cursor.execute("""
-                            DELETE FROM player_inventory WHERE id = %s
-                        """, (line['item_id'],))
-                    else:
-                        # Handle consumable from player_inventory
-                        cursor.execute("""
-                            SELECT quantity FROM player_inventory WHERE id = %s
-                        """, (line['item_id'],))
-                        
-                        current_qty = cursor.fetchone()['quantity']
-                        
-                        if current_qty <= line['quantity']:
-                            # Delete if selling all
-                            cursor.execute("""
-                                DELETE FROM player_inventory WHERE id = %s
-                            """, (line['item_id'],))
-                        else:
-                            # Decrease quantity
-                            cursor.execute("""
-                                UPDATE player_inventory
-                                SET quantity = quantity - %s
-                                WHERE id = %s
-                            """, (line['quantity'], line['item_id']))
-                
-                # 2. Add money
-                cursor.execute("""
-                    UPDATE players
-                    SET balance = balance + %s
-                    WHERE id = %s
-                """, (total_amount, player_id))
+                # Price, remove and pay out all lines in one pass
+                result = sell_items(cursor, player_id, session, items)
                 
-                # 3. Record transaction
-                transaction_id = str(uuid.uuid4())
-                cursor.execute("""
-                    INSERT INTO trade_transactions
-                    (id, trade_session_id, type, player_id, trader_id, 
-                     total_amount, lines_json, result)
-                    VALUES (%s, %s, 'sell', %s, %s, %s, %s, 'success')
-                """, (transaction_id, session_id, player_id, 
-                      session['trader_id'], total_amount, json.dumps(lines)))
-                
-                # 4. Update session
-                cursor.execute("""
-                    UPDATE trade_sessions SET status = 'success' WHERE id = %s
-                """, (session_id,))
-                
-                # Get new balance
-                cursor.execute("""
-                    SELECT balance FROM players WHERE id = %s
-                """, (player_id,))
-                
-                new_balance = float(cursor.fetchone()['balance'])
+                if not result['success']:
+                    return {
+                        'statusCode': 403 if result['error'] == 'PLAYER_DEAD_SELL_FORBIDDEN' else 400,
+                        'headers': CORS_HEADERS,
+                        'body': json.dumps({'error': result['error']})
+                    }
                 
                 conn.commit()
                 
@@ -908,10 +679,10 @@ def sell_handler(event, context):
                     'headers': CORS_HEADERS,
                     'body': json.dumps({
                         'success': True,
-                        'transaction_id': transaction_id,
-                        'total_amount': total_amount,
-                        'new_balance': new_balance,
-                        'items_removed': lines
+                        'transaction_id': result['transaction_id'],
+                        'total_amount': result['total_amount'],
+                        'new_balance': result['new_balance'],
+                        'items_removed': result['lines']
                     })
                 }
                 
@@ -1012,7 +783,7 @@ def redeem_handler(event, context):
 def get_traders_handler(event, context):
     """GET /api/traders - Get list of active traders"""
     try:
-        with get_db() as conn:
+        with get_db(readonly=True) as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
                     SELECT 
@@ -1058,6 +829,12 @@ def get_trader_quests_handler(event, context):
     try:
         trader_id = event['pathParameters']['id']
         player_id = event['player']['player_id']
+        params = event.get('queryStringParameters') or {}
+        
+        # Pagination
+        page = max(1, int(params.get('page', 1)))
+        limit = min(max(1, int(params.get('limit', TRADER_QUESTS_PAGE_SIZE))), TRADER_QUESTS_MAX_PAGE_SIZE)
+        offset = (page - 1) * limit
         
         with get_db() as conn:
             with conn.cursor() as cursor:
@@ -1105,33 +882,29 @@ def get_trader_quests_handler(event, context):
                             })
                         }
                 
-                # Get quests assigned to this trader
+                # Get quests assigned to this trader that player's faction may take
                 cursor.execute("""
                     SELECT c.id, c.title, c.description, c.quest_type, 
                            c.reward, c.reward_reputation, c.reward_item_id,
-                           c.faction_restriction, c.faction_restrictions, c.expires_at, c.quest_data,
+                           c.expires_at, c.quest_data,
                            i.name as reward_item_name
                     FROM trader_quests tq
-                    JOIN contracts c ON tq.quest_id = c.id
+                    JOIN quest_templates c ON tq.quest_id = c.id
+                    JOIN quest_template_factions qf
+                        ON qf.quest_id = c.id AND qf.faction IN ('any', %s)
                     LEFT JOIN item_definitions i ON c.reward_item_id = i.id
                     WHERE tq.trader_id = %s 
                       AND tq.is_active = 1
                       AND c.status = 'available'
-                      AND c.quest_type IS NOT NULL
-                      AND (c.expires_at IS NULL OR c.expires_at > NOW())
-                    ORDER BY c.reward DESC
-                """, (trader_id,))
+                    ORDER BY c.reward DESC, c.id
+                    LIMIT %s OFFSET %s
+                """, (player_faction or 'any', trader_id, limit + 1, offset))
+                
+                rows = cursor.fetchall()
+                has_more = len(rows) > limit
                 
                 quests = []
-                for q in cursor.fetchall():
-                    # Check faction restrictions
-                    if q['faction_restrictions']:
-                        allowed = json.loads(q['faction_restrictions'])
-                        if player_faction not in allowed:
-                            continue
-                    elif q['faction_restriction'] and q['faction_restriction'] != player_faction:
-                        continue
-                    
+                for q in rows[:limit]:
                     quest_data = json.loads(q['quest_data']) if q['quest_data'] else {}
                     quests.append({
                         'id': q['id'],
@@ -1149,7 +922,14 @@ def get_trader_quests_handler(event, context):
                 return {
                     'statusCode': 200,
                     'headers': CORS_HEADERS,
-                    'body': json.dumps({'quests': quests})
+                    'body': json.dumps({
+                        'quests': quests,
+                        'pagination': {
+                            'page': page,
+                            'limit': limit,
+                            'hasMore': has_more
+                        }
+                    })
                 }
                 
     except Exception as e:
@@ -1159,3 +939,26 @@ def get_trader_quests_handler(event, context):
             'headers': CORS_HEADERS,
             'body': json.dumps({'error': 'INTERNAL_ERROR', 'message': str(e)})
         }
+
+
+def purge_sessions_handler(event, context):
+    """Scheduled: purge expired trade sessions in batches"""
+    total = 0
+    
+    try:
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                for _ in range(PURGE_MAX_BATCHES):
+                    deleted = purge_expired_trade_sessions(cursor, batch_size=PURGE_BATCH_SIZE)
+                    conn.commit()
+                    total += deleted
+                    
+                    if deleted < PURGE_BATCH_SIZE:
+                        break
+        
+        print(f"Purged {total} expired trade sessions")
+        return {'purged': total}
+        
+    except Exception as e:
+        print(f"Error in purge_sessions_handler: {str(e)}")
+        return {'purged': total, 'error': str(e)}
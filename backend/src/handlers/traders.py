@@ -7,6 +7,7 @@ import uuid
 from src.database import get_db
 from src.middleware.auth import require_gm
 from src.utils.responses import success_response, error_response
+from src.utils.catalog import invalidate_catalog_cache
 
 @require_gm
 def list_traders_handler(event, context):
@@ -103,6 +104,7 @@ def update_trader_handler(event, context):
                 cursor.execute(f"UPDATE traders SET {', '.join(updates)} WHERE id = %s", params)
                 if cursor.rowcount == 0:
                     return error_response('Trader not found', 404)
+                invalidate_catalog_cache(cursor)
                 conn.commit()
         
         return success_response({'message': 'Trader updated'})
@@ -123,6 +125,7 @@ def delete_trader_handler(event, context):
                 cursor.execute("DELETE FROM traders WHERE id = %s", (trader_id,))
                 if cursor.rowcount == 0:
                     return error_response('Trader not found', 404)
+                invalidate_catalog_cache(cursor)
                 conn.commit()
         
         return success_response({'message': 'Trader deleted'})
@@ -171,6 +174,9 @@ def update_trader_inventory_handler(event, context):
                         VALUES (%s, %s, %s, 1)
                     """, (str(uuid.uuid4()), trader_id, item_id))
                 
+                # Invalidate trader catalog cache
+                invalidate_catalog_cache(cursor)
+                
                 conn.commit()
         
         return success_response({'message': 'Inventory updated', 'count': len(item_ids)})
@@ -189,7 +195,7 @@ def get_trader_quests_handler(event, context):
                 cursor.execute("""
                     SELECT tq.quest_id, c.title, c.quest_type, c.reward
                     FROM trader_quests tq
-                    JOIN contracts c ON tq.quest_id = c.id
+                    JOIN quest_templates c ON tq.quest_id = c.id
                     WHERE tq.trader_id = %s AND tq.is_active = 1
                     ORDER BY c.title
                 """, (trader_id,))
@@ -1,8 +1,7 @@
 import json
-import boto3
-from src.utils.auth import decode_jwt_token
-
-dynamodb = boto3.resource('dynamodb')
+from src.database import get_db
+from src.utils.token_cache import verify_token
+from src.utils.push import get_push_backend
 
 def connect_handler(event, context):
     """WebSocket $connect"""
@@ -10,28 +9,43 @@ def connect_handler(event, context):
         # Get token from query string
         query_params = event.get('queryStringParameters') or {}
         token = query_params.get('token')
-        
+
         if not token:
             return {'statusCode': 401}
-        
+
         # Verify token
-        payload = decode_jwt_token(token)
+        payload = verify_token(token)
         if not payload:
             return {'statusCode': 401}
-        
+
+        backend = get_push_backend()
+        if backend is None:
+            return {'statusCode': 503}
+
+        # Faction and active game session for group sends (fixed for connection lifetime)
+        player_id = payload['player_id']
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT p.faction, sp.session_id
+                    FROM players p
+                    LEFT JOIN session_players sp ON sp.player_id = p.id
+                         AND sp.session_id IN (SELECT id FROM game_sessions WHERE status = 'active')
+                    WHERE p.id = %s
+                    LIMIT 1
+                """, (player_id,))
+                player = cursor.fetchone()
+
+        if not player:
+            return {'statusCode': 401}
+
         # Store connection
         connection_id = event['requestContext']['connectionId']
-        player_id = payload['player_id']
-        
-        table = dynamodb.Table('pda-zone-connections-dev')
-        table.put_item(Item={
-            'connectionId': connection_id,
-            'playerId': player_id,
-            'connectedAt': context.get_remaining_time_in_millis()
-        })
-        
+        store, _ = backend
+        store.add(connection_id, player_id, player['faction'], player['session_id'])
+
         return {'statusCode': 200}
-    
+
     except Exception as e:
         print(f"Connect error: {e}")
         return {'statusCode': 500}
@@ -40,31 +54,38 @@ def disconnect_handler(event, context):
     """WebSocket $disconnect"""
     try:
         connection_id = event['requestContext']['connectionId']
-        
-        table = dynamodb.Table('pda-zone-connections-dev')
-        table.delete_item(Key={'connectionId': connection_id})
-        
+
+        backend = get_push_backend()
+        if backend:
+            store, _ = backend
+            store.remove([connection_id])
+
         return {'statusCode': 200}
-    
+
     except Exception as e:
         print(f"Disconnect error: {e}")
         return {'statusCode': 500}
 
 def message_handler(event, context):
-    """WebSocket $default (messages)"""
+    """
+    WebSocket $default (messages)
+
+    Server -> client traffic goes through src.utils.push; clients only
+    send keepalive pings here.
+    """
     try:
-        connection_id = event['requestContext']['connectionId']
-        body = json.loads(event.get('body', '{}'))
-        
-        # Handle different message types
-        action = body.get('action')
-        
-        if action == 'ping':
-            return {'statusCode': 200}
-        
-        # Echo back for now
-        return {'statusCode': 200}
-    
+        body = json.loads(event.get('body') or '{}')
+
+        if body.get('action') == 'ping':
+            # Keepalive extends registry entry TTL
+            backend = get_push_backend()
+            if backend:
+                store, _ = backend
+                store.touch(event['requestContext']['connectionId'])
+            return {'statusCode': 200, 'body': json.dumps({'type': 'pong'})}
+
+        return {'statusCode': 400}
+
     except Exception as e:
         print(f"Message error: {e}")
         return {'statusCode': 500}
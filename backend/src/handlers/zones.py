@@ -9,7 +9,7 @@ from src.config import config
 def handler(event, context):
     """GET /api/zones - Get all zones"""
     try:
-        with get_db() as conn:
+        with get_db(readonly=True) as conn:
             with conn.cursor() as cursor:
                 # Get radiation zones
                 cursor.execute(
@@ -1,47 +1,56 @@
 from functools import wraps
 from typing import Optional
-from src.utils.auth_simple import decode_jwt_token
+from src.utils.token_cache import verify_token
+from src.utils.sql_profiler import profile_sql
+
+AUTH_COOKIE = 'auth_token='
+
+def _cookie_token(cookie_header: str) -> Optional[str]:
+    """Find auth_token value in Cookie header without parsing other cookies"""
+    start = cookie_header.find(AUTH_COOKIE)
+    while start > 0 and cookie_header[start - 1] not in '; ':
+        start = cookie_header.find(AUTH_COOKIE, start + 1)
+    if start < 0:
+        return None
+    start += len(AUTH_COOKIE)
+    end = cookie_header.find(';', start)
+    return cookie_header[start:end if end >= 0 else None].strip() or None
 
 def get_current_player(event: dict) -> Optional[dict]:
     """Extract player from JWT token in event (from Authorization header or Cookie)"""
-    headers = event.get('headers', {})
+    headers = event.get('headers') or {}
     
-    # Try Authorization header first
-    auth_header = headers.get('Authorization') or headers.get('authorization')
+    # Try Authorization header first ("Bearer <token>")
     token = None
-    
-    if auth_header:
-        # Extract token from "Bearer <token>"
-        parts = auth_header.split()
-        if len(parts) == 2 and parts[0].lower() == 'bearer':
-            token = parts[1]
+    auth_header = headers.get('Authorization') or headers.get('authorization')
+    if auth_header and auth_header[:7].lower() == 'bearer ':
+        token = auth_header[7:].strip() or None
     
     # If no Authorization header, try Cookie
     if not token:
         cookie_header = headers.get('Cookie') or headers.get('cookie')
         if cookie_header:
-            # Parse cookies
-            cookies = {}
-            for cookie in cookie_header.split(';'):
-                cookie = cookie.strip()
-                if '=' in cookie:
-                    key, value = cookie.split('=', 1)
-                    cookies[key] = value
-            
-            token = cookies.get('auth_token')
+            token = _cookie_token(cookie_header)
     
     if not token:
         return None
     
-    payload = decode_jwt_token(token)
+    # Verified claims are cached per container until exp
+    payload = verify_token(token)
     
     if not payload:
         return None
     
-    return {'player_id': payload.get('player_id')}
+    return {
+        'player_id': payload.get('player_id'),
+        'roles': payload.get('roles'),
+        'role_version': payload.get('rv')
+    }
 
 def require_auth(handler):
     """Decorator to require authentication"""
+    handler = profile_sql(handler)
+
     @wraps(handler)
     def wrapper(event, context):
         player = get_current_player(event)
@@ -63,6 +72,8 @@ def require_auth(handler):
 
 def require_gm(handler):
     """Decorator to require GM role"""
+    handler = profile_sql(handler)
+
     @wraps(handler)
     def wrapper(event, context):
         player = get_current_player(event)
@@ -72,15 +83,11 @@ def require_gm(handler):
                 'body': '{"error": {"code": "UNAUTHORIZED", "message": "Authentication required"}}'
             }
         
-        # Check if player is GM
-        from src.database import execute_query
-        result = execute_query(
-            "SELECT is_gm FROM player_roles WHERE player_id = %s",
-            (player['player_id'],),
-            fetch_one=True
-        )
+        # Check if player is GM (token claims / container cache, see resolve_roles)
+        from src.utils.roles import resolve_roles
+        roles = resolve_roles(player)
         
-        if not result or not result.get('is_gm'):
+        if not roles['is_gm']:
             return {
                 'statusCode': 403,
                 'body': '{"error": {"code": "FORBIDDEN", "message": "GM access required"}}'
@@ -22,14 +22,16 @@ def create_jwt_token(player_id: str) -> str:
     return jwt.encode(payload, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
 
 def decode_jwt_token(token: str) -> Optional[dict]:
-    """Decode and verify JWT token"""
+    """Decode and verify login JWT token (typed tokens, e.g. trade sessions, are rejected)"""
     try:
         payload = jwt.decode(token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    if 'typ' in payload:
+        return None
+    return payload
 
 def generate_qr_code(player_id: str) -> str:
     """Generate unique QR code for player"""
@@ -11,25 +11,37 @@ def verify_password(password: str, hashed: str) -> bool:
     """Verify password against hash"""
     return hash_password(password) == hashed
 
-def create_jwt_token(player_id: str, expires_hours: int = None) -> str:
-    """Create JWT token for player"""
+def create_jwt_token(player_id: str, expires_hours: int = None,
+                     roles: dict = None, role_version: int = None,
+                     token_version: int = 0) -> str:
+    """
+    Create JWT token for player.
+    roles/role_version: optional signed role claims (see src.utils.roles.resolve_roles)
+    token_version: player's token_version, older tokens are revoked (see src.utils.token_cache)
+    """
     if expires_hours is None:
         expires_hours = config.JWT_EXPIRATION_HOURS
     
     payload = {
         'player_id': player_id,
         'exp': datetime.utcnow() + timedelta(hours=expires_hours),
-        'iat': datetime.utcnow()
+        'iat': datetime.utcnow(),
+        'tv': token_version
     }
+    if roles is not None:
+        payload['roles'] = {'is_gm': bool(roles.get('is_gm')), 'is_bartender': bool(roles.get('is_bartender'))}
+        payload['rv'] = role_version
     return jwt.encode(payload, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
 
 def decode_jwt_token(token: str):
-    """Decode and verify JWT token"""
+    """Decode and verify login JWT token (typed tokens, e.g. trade sessions, are rejected)"""
     try:
         payload = jwt.decode(token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM])
-        return payload
     except:
         return None
+    if 'typ' in payload:
+        return None
+    return payload
 
 def generate_qr_code(player_id: str) -> str:
     """Generate unique QR code for player"""
@@ -0,0 +1,123 @@
+"""
+Cache staleness policy and metrics
+
+Each versioned cache declares how stale it may be served. Its version is
+re-checked (shared cache, then cache_versions) at most once per window per
+container, so a warm container answers most reads without a round trip.
+Writes made by this container are visible to it immediately; other containers
+pick them up within the window.
+
+Invalidations are also published as outbox events ('cache_invalidated'); the
+'cache' consumer re-drops shared version keys and notifies subscribers of the
+in-process invalidation bus (stand-in for an SNS topic, for long-lived
+processes and local runs).
+"""
+import json
+import time
+from collections import defaultdict
+from typing import Callable, Dict
+
+# cache_versions key -> seconds a cached version may be served without re-checking
+CACHE_STALENESS_SECONDS = {
+    'artifacts': 5,
+    'radiation_zones': 10,
+    'respawn_zones': 10,
+    'quest_board': 10,
+    'trader_catalog': 60,
+}
+
+CACHE_METRICS_LOG_EVERY = 1000  # Log metrics every N lookups per cache
+
+# cache_key -> {'version': int, 'checked_at': float}
+_versions = {}
+
+_metrics = defaultdict(lambda: {
+    'hits': 0, 'misses': 0, 'version_checks': 0, 'invalidations': 0,
+    'stale_reads': 0, 'staleness_total': 0.0, 'staleness_max': 0.0
+})
+
+_subscribers = []
+
+
+def cached_version(cursor, cache_key: str) -> int:
+    """Version of cache_key, re-checked at most once per its staleness window"""
+    from src.utils.shared_cache import get_cache_version
+
+    now = time.monotonic()
+    metrics = _metrics[cache_key]
+    entry = _versions.get(cache_key)
+
+    if entry is not None:
+        age = now - entry['checked_at']
+        if age < CACHE_STALENESS_SECONDS.get(cache_key, 0):
+            metrics['stale_reads'] += 1
+            metrics['staleness_total'] += age
+            metrics['staleness_max'] = max(metrics['staleness_max'], age)
+            return entry['version']
+
+    version = get_cache_version(cursor, cache_key)
+    metrics['version_checks'] += 1
+    _versions[cache_key] = {'version': version, 'checked_at': now}
+    return version
+
+
+def replica_lags(cursor, cache_key: str, version: int) -> bool:
+    """
+    True if cursor reads from a replica that hasn't replicated `version` yet;
+    rows it loaded are older than `version` and must not be cached under it
+    """
+    from src.database import is_replica
+    from src.utils.shared_cache import get_cache_version
+
+    return is_replica(cursor) and get_cache_version(cursor, cache_key) < version
+
+
+def record_lookup(cache_key: str, hit: bool):
+    """Count cache hit/miss, log metrics periodically"""
+    metrics = _metrics[cache_key]
+    metrics['hits' if hit else 'misses'] += 1
+
+    lookups = metrics['hits'] + metrics['misses']
+    if lookups % CACHE_METRICS_LOG_EVERY == 0:
+        print(json.dumps({'event': 'cache_metrics', 'cache': cache_key, **_summary(metrics)}))
+
+
+def invalidate_local(cache_key: str):
+    """Force version re-check on next read in this container"""
+    _versions.pop(cache_key, None)
+    _metrics[cache_key]['invalidations'] += 1
+
+
+def _summary(metrics: Dict) -> Dict:
+    lookups = metrics['hits'] + metrics['misses']
+    return {
+        'hits': metrics['hits'],
+        'misses': metrics['misses'],
+        'hit_rate': round(metrics['hits'] / lookups, 3) if lookups else None,
+        'version_checks': metrics['version_checks'],
+        'invalidations': metrics['invalidations'],
+        'stale_reads': metrics['stale_reads'],
+        'staleness_avg': round(metrics['staleness_total'] / metrics['stale_reads'], 3)
+        if metrics['stale_reads'] else 0.0,
+        'staleness_max': round(metrics['staleness_max'], 3)
+    }
+
+
+def get_cache_metrics() -> Dict[str, Dict]:
+    """Per-cache hits, misses, version checks and served staleness (seconds)"""
+    return {cache_key: _summary(metrics) for cache_key, metrics in _metrics.items()}
+
+
+def subscribe_invalidations(callback: Callable[[str], None]):
+    """Register fn(cache_key) called for every consumed invalidation"""
+    _subscribers.append(callback)
+
+
+def publish_invalidation(cache_key: str):
+    """Deliver invalidation to this process and its subscribers"""
+    invalidate_local(cache_key)
+    for callback in _subscribers:
+        try:
+            callback(cache_key)
+        except Exception as e:
+            print(f"Invalidation subscriber error: {e}")
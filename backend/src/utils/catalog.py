@@ -0,0 +1,114 @@
+"""
+Trader catalog cache utilities
+"""
+import json
+import hashlib
+from src.utils.cache_policy import cached_version, record_lookup
+from src.utils.shared_cache import bump_cache_version
+
+# Global cache for trader catalogs (Lambda container reuse)
+# trader_id -> {'version': int, 'rows': list,
+#               'priced': {commission_pct: {'items': list, 'body': str, 'etag': str}}}
+_catalog_cache = {}
+
+
+def invalidate_catalog_cache(cursor):
+    """Invalidate trader catalog cache by incrementing version"""
+    bump_cache_version(cursor, 'trader_catalog')
+
+
+def get_catalog_version(cursor) -> int:
+    """Get current trader catalog version (re-checked at most once per staleness window)"""
+    return cached_version(cursor, 'trader_catalog')
+
+
+def calculate_buy_price(base_price: int, commission_pct: int) -> int:
+    """Buy price = base price + trader buy commission"""
+    return round(base_price * (1 + commission_pct / 100))
+
+
+def calculate_sell_price(base_price, commission_pct: int) -> int:
+    """Sell price = base price - trader sell commission"""
+    return round(float(base_price) * (1 - commission_pct / 100))
+
+
+def _load_catalog(cursor, trader_id: str) -> list:
+    """Query trader's catalog"""
+    cursor.execute("""
+        SELECT
+            i.id as item_def_id,
+            i.name,
+            i.description,
+            i.image_url,
+            i.type,
+            i.base_price,
+            i.is_stackable,
+            i.extra_lives,
+            i.wounds_protection,
+            i.radiation_resistance,
+            i.anti_radiation
+        FROM item_definitions i
+        JOIN trader_inventory ti ON i.id = ti.item_def_id
+        WHERE ti.trader_id = %s
+          AND ti.is_available = TRUE
+          AND i.is_active = TRUE
+        ORDER BY i.type, i.name
+    """, (trader_id,))
+
+    return cursor.fetchall()
+
+
+def _price_catalog(rows: list, commission: int) -> dict:
+    """Catalog items with buy prices for commission, serialized once"""
+    items = []
+    for row in rows:
+        items.append({
+            'item_def_id': row['item_def_id'],
+            'name': row['name'],
+            'description': row['description'],
+            'image_url': row['image_url'],
+            'type': row['type'],
+            'base_price': row['base_price'],
+            'buy_price': calculate_buy_price(row['base_price'], commission),
+            'is_stackable': bool(row['is_stackable']),
+            'extra_lives': row['extra_lives'],
+            'wounds_protection': row['wounds_protection'],
+            'radiation_resistance': row['radiation_resistance'],
+            'anti_radiation': row['anti_radiation']
+        })
+
+    body = json.dumps({'items': items})
+    return {
+        'items': items,
+        'body': body,
+        'etag': '"' + hashlib.md5(body.encode()).hexdigest() + '"'
+    }
+
+
+def get_trader_catalog(cursor, trader_id: str, commission_pct: int) -> dict:
+    """
+    Get trader's catalog with version-based cache, priced with commission_pct
+    (the session's buy commission after reputation discount).
+
+    Returns:
+        Dict with 'items' (list), 'body' (serialized JSON response body)
+        and 'etag' (quoted entity tag for If-None-Match)
+    """
+    current_version = get_catalog_version(cursor)
+
+    cached = _catalog_cache.get(trader_id)
+    if cached is not None and cached['version'] == current_version:
+        record_lookup('trader_catalog', hit=True)
+    else:
+        record_lookup('trader_catalog', hit=False)
+        cached = _catalog_cache[trader_id] = {
+            'version': current_version,
+            'rows': _load_catalog(cursor, trader_id),
+            'priced': {}
+        }
+
+    priced = cached['priced'].get(commission_pct)
+    if priced is None:
+        priced = cached['priced'][commission_pct] = _price_catalog(cached['rows'], commission_pct)
+
+    return priced
@@ -0,0 +1,164 @@
+"""
+WebSocket connection registry
+
+Connections are indexed by player, faction and game session, so targeted
+sends cost O(recipients) instead of a table scan. Entries expire
+CONNECTION_TTL_SECONDS after $connect or the last client ping: DynamoDB TTL
+deletes them eventually, readers skip expired entries until then.
+"""
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+CONNECTION_TTL_SECONDS = 900  # API Gateway drops connections idle for 10 minutes
+
+# Lookup index -> (DynamoDB GSI, attribute)
+CONNECTION_INDEXES = {
+    'player': ('playerIdIndex', 'playerId'),
+    'faction': ('factionIndex', 'faction'),
+    'session': ('sessionIdIndex', 'sessionId'),
+}
+
+
+def _expires_at() -> int:
+    return int(time.time()) + CONNECTION_TTL_SECONDS
+
+
+class InMemoryConnectionStore:
+    """Local stand-in for the WebSocket connections table"""
+
+    def __init__(self):
+        self.connections = {}  # connection_id -> {'player', 'faction', 'session', 'ttl'}
+        self._indexes = {index: defaultdict(set) for index in CONNECTION_INDEXES}
+
+    def add(self, connection_id: str, player_id: str,
+            faction: Optional[str] = None, session_id: Optional[str] = None):
+        self.remove([connection_id])
+        entry = {'player': player_id, 'faction': faction, 'session': session_id, 'ttl': _expires_at()}
+        self.connections[connection_id] = entry
+        for index in CONNECTION_INDEXES:
+            if entry[index] is not None:
+                self._indexes[index][entry[index]].add(connection_id)
+
+    def touch(self, connection_id: str):
+        entry = self.connections.get(connection_id)
+        if entry:
+            entry['ttl'] = _expires_at()
+
+    def remove(self, connection_ids: Iterable[str]):
+        for connection_id in connection_ids:
+            entry = self.connections.pop(connection_id, None)
+            if entry is None:
+                continue
+            for index in CONNECTION_INDEXES:
+                members = self._indexes[index].get(entry[index])
+                if members is not None:
+                    members.discard(connection_id)
+                    if not members:
+                        del self._indexes[index][entry[index]]
+
+    def lookup(self, index: str, values: Iterable[str]) -> Dict[str, List[str]]:
+        now = time.time()
+        return {
+            value: [cid for cid in self._indexes[index].get(value, ()) if self.connections[cid]['ttl'] > now]
+            for value in set(values)
+        }
+
+    def all(self) -> List[str]:
+        now = time.time()
+        return [cid for cid, entry in self.connections.items() if entry['ttl'] > now]
+
+    def purge_expired(self) -> int:
+        """Drop expired entries (what DynamoDB TTL does for the real table)"""
+        now = time.time()
+        expired = [cid for cid, entry in self.connections.items() if entry['ttl'] <= now]
+        self.remove(expired)
+        return len(expired)
+
+
+class DynamoConnectionStore:
+    """
+    WebSocket connections in DynamoDB: connectionId key, `ttl` expiry attribute,
+    sparse GSIs playerIdIndex / factionIndex / sessionIdIndex. Lookups on an
+    index not deployed yet (missing from indexes) fall back to a filtered scan.
+    """
+
+    def __init__(self, table_name: str, indexes: Iterable[str] = CONNECTION_INDEXES):
+        import boto3
+        self.table = boto3.resource('dynamodb').Table(table_name)
+        self.indexes = set(indexes)
+
+    def add(self, connection_id: str, player_id: str,
+            faction: Optional[str] = None, session_id: Optional[str] = None):
+        item = {
+            'connectionId': connection_id,
+            'playerId': player_id,
+            'connectedAt': int(time.time()),
+            'ttl': _expires_at()
+        }
+        # GSI key attributes must be absent (not null) for sparse indexes
+        if faction:
+            item['faction'] = faction
+        if session_id:
+            item['sessionId'] = session_id
+        self.table.put_item(Item=item)
+
+    def touch(self, connection_id: str):
+        self.table.update_item(
+            Key={'connectionId': connection_id},
+            UpdateExpression='SET #ttl = :ttl',
+            ConditionExpression='attribute_exists(connectionId)',
+            ExpressionAttributeNames={'#ttl': 'ttl'},
+            ExpressionAttributeValues={':ttl': _expires_at()}
+        )
+
+    def remove(self, connection_ids: Iterable[str]):
+        # batch_writer sends deletes 25 per BatchWriteItem and retries unprocessed ones
+        with self.table.batch_writer(overwrite_by_pkeys=['connectionId']) as batch:
+            for connection_id in connection_ids:
+                batch.delete_item(Key={'connectionId': connection_id})
+
+    def lookup(self, index: str, values: Iterable[str]) -> Dict[str, List[str]]:
+        index_name, attribute = CONNECTION_INDEXES[index]
+        indexed = index in self.indexes
+        now = int(time.time())
+        result = {}
+        for value in set(values):
+            kwargs = {
+                'FilterExpression': '#ttl > :now',
+                'ProjectionExpression': 'connectionId',
+                'ExpressionAttributeNames': {'#key': attribute, '#ttl': 'ttl'},
+                'ExpressionAttributeValues': {':value': value, ':now': now}
+            }
+            if indexed:
+                kwargs.update(IndexName=index_name, KeyConditionExpression='#key = :value')
+            else:
+                kwargs['FilterExpression'] = '#key = :value AND #ttl > :now'
+            connection_ids = []
+            while True:
+                response = (self.table.query if indexed else self.table.scan)(**kwargs)
+                connection_ids.extend(item['connectionId'] for item in response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            result[value] = connection_ids
+        return result
+
+    def all(self) -> List[str]:
+        connection_ids = []
+        kwargs = {
+            'FilterExpression': '#ttl > :now',
+            'ProjectionExpression': 'connectionId',
+            'ExpressionAttributeNames': {'#ttl': 'ttl'},
+            'ExpressionAttributeValues': {':now': int(time.time())}
+        }
+        while True:
+            response = self.table.scan(**kwargs)
+            connection_ids.extend(item['connectionId'] for item in response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                return connection_ids
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def purge_expired(self) -> int:
+        """Expired items are deleted by DynamoDB TTL"""
+        return 0
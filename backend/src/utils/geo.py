@@ -1,5 +1,5 @@
 from math import radians, cos, sin, asin, sqrt
-from typing import Tuple
+from typing import List, Tuple
 
 # GPS accuracy max buffers (meters) per mechanic type
 GPS_ACCURACY_BUFFERS = {
@@ -49,3 +49,69 @@ def point_in_circle(point_lat: float, point_lng: float,
                     accuracy: float = 0, mechanic: str = 'zone') -> bool:
     """Check if point is inside circle (for radiation zones)"""
     return is_within_radius(point_lat, point_lng, center_lat, center_lng, radius, accuracy, mechanic)
+
+def _to_local_meters(lat: float, lng: float, ref_lat: float, ref_lng: float) -> Tuple[float, float]:
+    """Equirectangular projection around reference point (meters, fine for game-area tracks)"""
+    r = 6371000
+    x = radians(lng - ref_lng) * r * cos(radians(ref_lat))
+    y = radians(lat - ref_lat) * r
+    return x, y
+
+def _segment_distance(p: Tuple[float, float], a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """Distance from point p to segment a-b (projected meters)"""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    if dx == 0 and dy == 0:
+        return sqrt((p[0] - a[0]) ** 2 + (p[1] - a[1]) ** 2)
+    t = max(0.0, min(1.0, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / (dx * dx + dy * dy)))
+    return sqrt((p[0] - a[0] - t * dx) ** 2 + (p[1] - a[1] - t * dy) ** 2)
+
+def simplify_track(points: List, tolerance: float) -> List:
+    """
+    Douglas-Peucker simplification of track (iterative, no recursion limit).
+    points: [(lat, lng, ...), ...] - extra tuple fields (e.g. timestamp) are kept
+    tolerance: max deviation in meters
+    """
+    if len(points) < 3 or tolerance <= 0:
+        return list(points)
+
+    ref_lat, ref_lng = points[0][0], points[0][1]
+    projected = [_to_local_meters(p[0], p[1], ref_lat, ref_lng) for p in points]
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        max_distance, index = 0.0, None
+        for i in range(first + 1, last):
+            distance = _segment_distance(projected[i], projected[first], projected[last])
+            if distance > max_distance:
+                max_distance, index = distance, i
+        if index is not None and max_distance > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return [p for p, kept in zip(points, keep) if kept]
+
+def _encode_value(value: int) -> str:
+    value = ~(value << 1) if value < 0 else value << 1
+    chunks = []
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+    return ''.join(chunks)
+
+def encode_polyline(points: List, precision: int = 5) -> str:
+    """Encode [(lat, lng, ...), ...] with Google encoded polyline algorithm"""
+    factor = 10 ** precision
+    result = []
+    prev_lat = prev_lng = 0
+    for p in points:
+        lat, lng = int(round(p[0] * factor)), int(round(p[1] * factor))
+        result.append(_encode_value(lat - prev_lat))
+        result.append(_encode_value(lng - prev_lng))
+        prev_lat, prev_lng = lat, lng
+    return ''.join(result)
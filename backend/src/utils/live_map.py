@@ -0,0 +1,204 @@
+"""
+GM live map snapshot (shared by all GMs in a container)
+"""
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Optional
+from src.config import config
+from src.database import get_db
+from src.utils.pagination import stream_rows
+
+LIVE_SECTIONS = ('players', 'artifacts', 'radiationZones', 'respawnZones', 'controlPoints')
+LIVE_HISTORY_SIZE = 12  # Previous snapshots kept for "changes since" deltas
+
+# Global snapshot cache (Lambda container reuse)
+# {'id': int, 'built_at': float, 'sections': {section: {entity_id: entity_json}},
+#  'body': str, 'etag': str, 'deltas': {since_id: body}}
+_live_snapshot = None
+
+# Entity hashes of recent snapshots: snapshot_id -> {section: {entity_id: md5}}
+_live_history = OrderedDict()
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() + 'Z' if value else None
+
+
+def _load_sections(conn) -> Dict[str, Dict[str, str]]:
+    """Query live map state, serialize each entity once"""
+    sections = {section: {} for section in LIVE_SECTIONS}
+
+    for p in stream_rows(conn, """
+        SELECT p.id, p.nickname, p.faction, p.status, p.current_lives, p.current_radiation,
+               pl.latitude, pl.longitude, pl.updated_at
+        FROM players p
+        JOIN player_locations pl ON p.id = pl.player_id
+    """):
+        sections['players'][p['id']] = json.dumps({
+            'id': p['id'],
+            'nickname': p['nickname'],
+            'faction': p['faction'],
+            'status': p['status'],
+            'lives': p['current_lives'],
+            'radiation': p['current_radiation'],
+            'location': {
+                'latitude': float(p['latitude']),
+                'longitude': float(p['longitude']),
+                'updatedAt': _iso(p['updated_at'])
+            }
+        })
+
+    for a in stream_rows(conn, """
+        SELECT a.id, a.type_id, at.name as type_name, a.latitude, a.longitude,
+               a.state, a.owner_id, a.extracting_by, a.expires_at
+        FROM artifacts a
+        JOIN artifact_types at ON a.type_id = at.id
+        WHERE a.state IN ('hidden', 'visible', 'extracting', 'respawning')
+          AND (a.expires_at IS NULL OR a.expires_at > NOW())
+    """):
+        sections['artifacts'][a['id']] = json.dumps({
+            'id': a['id'],
+            'typeId': a['type_id'],
+            'typeName': a['type_name'],
+            'latitude': float(a['latitude']),
+            'longitude': float(a['longitude']),
+            'state': a['state'],
+            'ownerId': a['owner_id'],
+            'extractingBy': a['extracting_by'],
+            'expiresAt': _iso(a['expires_at'])
+        })
+
+    with conn.cursor() as cursor:
+        for table, section, extra in (('radiation_zones', 'radiationZones', 'radiation_level'),
+                                      ('respawn_zones', 'respawnZones', 'respawn_time_seconds')):
+            cursor.execute(f"""
+                SELECT id, name, center_lat, center_lng, radius, {extra},
+                       active_from, active_to
+                FROM {table}
+                WHERE active = TRUE
+                  AND (active_to IS NULL OR active_to > NOW())
+            """)
+            for z in cursor.fetchall():
+                zone = {
+                    'id': z['id'],
+                    'name': z['name'],
+                    'centerLat': float(z['center_lat']),
+                    'centerLng': float(z['center_lng']),
+                    'radius': z['radius'],
+                    'activeFrom': _iso(z['active_from']),
+                    'activeTo': _iso(z['active_to'])
+                }
+                if extra == 'radiation_level':
+                    zone['radiationLevel'] = z['radiation_level']
+                else:
+                    zone['respawnTimeSeconds'] = z['respawn_time_seconds']
+                sections[section][z['id']] = json.dumps(zone)
+
+        cursor.execute("""
+            SELECT cp.id, cp.name, cp.latitude, cp.longitude, cp.controlled_by_faction,
+                   cp.controlled_by_player, p.nickname as controlled_by_nickname,
+                   cp.captured_at, cp.capturing_by
+            FROM control_points cp
+            LEFT JOIN players p ON cp.controlled_by_player = p.id
+            WHERE cp.active = TRUE
+        """)
+        for cp in cursor.fetchall():
+            sections['controlPoints'][cp['id']] = json.dumps({
+                'id': cp['id'],
+                'name': cp['name'],
+                'latitude': float(cp['latitude']),
+                'longitude': float(cp['longitude']),
+                'controlledByFaction': cp['controlled_by_faction'],
+                'controlledByPlayer': cp['controlled_by_player'],
+                'controlledByNickname': cp['controlled_by_nickname'],
+                'capturedAt': _iso(cp['captured_at']),
+                'capturingBy': cp['capturing_by']
+            })
+
+    return sections
+
+
+def _build_snapshot(sections: Dict[str, Dict[str, str]], snapshot_id: int) -> dict:
+    """Serialize full snapshot body"""
+    parts = ['"snapshotId": %d' % snapshot_id, '"full": true']
+    for section in LIVE_SECTIONS:
+        parts.append('"%s": [%s]' % (section, ', '.join(sections[section].values())))
+    body = '{' + ', '.join(parts) + '}'
+
+    return {
+        'id': snapshot_id,
+        'built_at': time.monotonic(),
+        'sections': sections,
+        'body': body,
+        'etag': '"' + hashlib.md5(body.encode()).hexdigest() + '"',
+        'deltas': {}
+    }
+
+
+def _entity_hashes(sections: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    return {
+        section: {entity_id: hashlib.md5(value.encode()).hexdigest()
+                  for entity_id, value in entities.items()}
+        for section, entities in sections.items()
+    }
+
+
+def get_live_snapshot() -> dict:
+    """
+    Get live map snapshot, rebuilt at most once per LIVE_MAP_TTL_SECONDS
+    per container and shared by all GM requests (no DB connection on hit).
+
+    Returns:
+        Dict with 'id' (snapshot id, build time in ms), 'body' and 'etag'
+    """
+    global _live_snapshot
+
+    if (_live_snapshot is not None
+            and time.monotonic() - _live_snapshot['built_at'] < config.LIVE_MAP_TTL_SECONDS):
+        return _live_snapshot
+
+    with get_db(readonly=True) as conn:
+        sections = _load_sections(conn)
+    snapshot_id = max(int(time.time() * 1000), _live_snapshot['id'] + 1 if _live_snapshot else 0)
+    _live_snapshot = _build_snapshot(sections, snapshot_id)
+
+    _live_history[snapshot_id] = _entity_hashes(sections)
+    while len(_live_history) > LIVE_HISTORY_SIZE:
+        _live_history.popitem(last=False)
+
+    return _live_snapshot
+
+
+def get_live_delta(snapshot: dict, since_id: int) -> Optional[str]:
+    """
+    Serialize changes between snapshot `since_id` and current snapshot.
+    Returns None if since_id is unknown to this container (client needs full snapshot).
+    """
+    if since_id in snapshot['deltas']:
+        return snapshot['deltas'][since_id]
+
+    previous = _live_history.get(since_id)
+    current = _live_history.get(snapshot['id'])
+    if previous is None or current is None:
+        return None
+
+    changed = []
+    removed = []
+    for section in LIVE_SECTIONS:
+        entities = snapshot['sections'][section]
+        old, new = previous[section], current[section]
+        changed.append('"%s": [%s]' % (section, ', '.join(
+            entities[entity_id] for entity_id, digest in new.items() if old.get(entity_id) != digest
+        )))
+        removed.append('"%s": %s' % (section, json.dumps(
+            [entity_id for entity_id in old if entity_id not in new]
+        )))
+
+    body = ('{"snapshotId": %d, "since": %d, "full": false, ' % (snapshot['id'], since_id)
+            + '"changed": {' + ', '.join(changed) + '}, '
+            + '"removed": {' + ', '.join(removed) + '}}')
+    snapshot['deltas'][since_id] = body
+
+    return body
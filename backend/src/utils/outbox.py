@@ -0,0 +1,260 @@
+"""
+Transactional outbox for game events
+
+record_event() inserts into event_outbox on the caller's cursor, so an event
+commits or rolls back together with the state change it describes.
+Consumers drain the outbox in id order, in batches, and keep their position
+in outbox_checkpoints. Delivery is at-least-once: a batch is redelivered if
+the consumer fails before its checkpoint commits.
+
+AUTO_INCREMENT ids are allocated at insert, not at commit, so an id below a
+consumer's checkpoint can still become visible (long transaction). Ids
+skipped by a checkpoint are kept in outbox_checkpoints.gaps and re-checked
+on every drain; an event found there is delivered late (out of id order).
+A gap is given up only after OUTBOX_GAP_TIMEOUT_SECONDS, longer than any
+Lambda invocation can hold a transaction open.
+
+Delivered events are purged after OUTBOX_RETENTION_DAYS (purge()).
+"""
+import json
+import time
+from typing import Callable, Dict, List, Optional
+from src.database import get_db
+
+OUTBOX_BATCH_SIZE = 200
+OUTBOX_SETTLE_SECONDS = 5  # Wait this long for an id gap to fill before skipping it (keeps id order)
+OUTBOX_GAP_TIMEOUT_SECONDS = 900  # Skipped ids re-checked this long (Lambda max runtime), then rolled back
+OUTBOX_RETENTION_DAYS = 7
+OUTBOX_PURGE_BATCH_SIZE = 5000
+
+# Registered consumers: name -> fn(events)
+_consumers = {}
+
+
+def outbox_consumer(name: str):
+    """Decorator: register fn(events: List[Dict]) as outbox consumer `name`"""
+    def register(fn):
+        _consumers[name] = fn
+        return fn
+    return register
+
+
+def get_consumers() -> Dict[str, Callable]:
+    return dict(_consumers)
+
+
+def record_event(cursor, event_type: str, data: Dict, player_id: Optional[str] = None,
+                 recipients: Optional[Dict[str, List[str]]] = None):
+    """
+    Append event to outbox in the caller's transaction.
+
+    Args:
+        event_type: e.g. 'death', 'quest_completed', 'trade'
+        data: JSON-serializable payload
+        player_id: subject of the event, if any
+        recipients: push targets {'player'|'faction'|'session': [...]}, None = everyone
+    """
+    cursor.execute(
+        """INSERT INTO event_outbox (event_type, player_id, recipients, data)
+        VALUES (%s, %s, %s, %s)""",
+        (event_type, player_id, json.dumps(recipients) if recipients is not None else None, json.dumps(data))
+    )
+
+
+_EVENT_COLUMNS = """
+    id, event_type, player_id, recipients, data,
+    CAST(UNIX_TIMESTAMP(created_at) * 1000 AS UNSIGNED) AS ts,
+    TIMESTAMPDIFF(MICROSECOND, created_at, NOW(3)) / 1000000 AS age
+"""
+
+
+def _to_event(row) -> Dict:
+    return {
+        'id': row['id'],
+        'event_type': row['event_type'],
+        'player_id': row['player_id'],
+        'recipients': json.loads(row['recipients']) if row['recipients'] else None,
+        'data': json.loads(row['data']),
+        'ts': row['ts']
+    }
+
+
+def _committed_prefix(rows: List[Dict], last_id: int, gaps: List[List], now: float) -> List[Dict]:
+    """
+    Rows up to the first id gap younger than OUTBOX_SETTLE_SECONDS (may still
+    commit shortly). Older gaps are skipped and appended to gaps as
+    [first_id, last_id, skipped_at] for later re-checks.
+    """
+    expected = last_id + 1
+    committed = []
+    for row in rows:
+        if row['id'] != expected:
+            if row['age'] < OUTBOX_SETTLE_SECONDS:
+                break
+            gaps.append([expected, row['id'] - 1, now])
+        committed.append(row)
+        expected = row['id'] + 1
+    return committed
+
+
+def _without_ids(gaps: List[List], ids: List[int]) -> List[List]:
+    """Gap ranges with ids (now delivered) cut out"""
+    result = []
+    for first, last, skipped_at in gaps:
+        start = first
+        for found in sorted(i for i in ids if first <= i <= last):
+            if found > start:
+                result.append([start, found - 1, skipped_at])
+            start = found + 1
+        if start <= last:
+            result.append([start, last, skipped_at])
+    return result
+
+
+def _late_rows(cursor, gaps: List[List], now: float):
+    """
+    Events that committed into skipped ids since the last drain.
+    Returns (rows, remaining gaps); gaps past OUTBOX_GAP_TIMEOUT_SECONDS are dropped.
+    """
+    expired = [gap for gap in gaps if now - gap[2] >= OUTBOX_GAP_TIMEOUT_SECONDS]
+    if expired:
+        print(json.dumps({'event': 'outbox_gaps_expired', 'gaps': [gap[:2] for gap in expired]}))
+    gaps = [gap for gap in gaps if now - gap[2] < OUTBOX_GAP_TIMEOUT_SECONDS]
+    if not gaps:
+        return [], gaps
+
+    cursor.execute(
+        f"SELECT {_EVENT_COLUMNS} FROM event_outbox WHERE "
+        + ' OR '.join(['id BETWEEN %s AND %s'] * len(gaps)) + " ORDER BY id",
+        [bound for gap in gaps for bound in gap[:2]]
+    )
+    rows = cursor.fetchall()
+    return rows, _without_ids(gaps, [row['id'] for row in rows])
+
+
+def drain(consumer: str, handler: Optional[Callable] = None, batch_size: int = OUTBOX_BATCH_SIZE,
+          max_batches: Optional[int] = None, skip_locked: bool = False) -> Dict:
+    """
+    Feed new outbox events to consumer in batches, advancing its checkpoint
+    after each batch. The checkpoint row is locked while a batch is handled,
+    so concurrent drains of one consumer are serialized. Late events from
+    skipped ids are delivered with the next batch.
+
+    Args:
+        consumer: checkpoint name (also registry key if handler is None)
+        skip_locked: return immediately if another drain holds the checkpoint
+    Returns: {'consumer', 'batches', 'events', 'late', 'last_id'}
+    """
+    handler = handler or _consumers[consumer]
+    stats = {'consumer': consumer, 'batches': 0, 'events': 0, 'late': 0, 'last_id': None}
+
+    while max_batches is None or stats['batches'] < max_batches:
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                if skip_locked:
+                    cursor.execute(
+                        "SELECT last_id, gaps FROM outbox_checkpoints WHERE consumer = %s FOR UPDATE SKIP LOCKED",
+                        (consumer,)
+                    )
+                else:
+                    cursor.execute(
+                        "INSERT IGNORE INTO outbox_checkpoints (consumer, last_id) VALUES (%s, 0)",
+                        (consumer,)
+                    )
+                    cursor.execute(
+                        "SELECT last_id, gaps FROM outbox_checkpoints WHERE consumer = %s FOR UPDATE",
+                        (consumer,)
+                    )
+                checkpoint = cursor.fetchone()
+                if not checkpoint:
+                    break  # Busy (or unknown consumer with skip_locked)
+
+                now = time.time()
+                last_id = checkpoint['last_id']
+                known_gaps = json.loads(checkpoint['gaps']) if checkpoint['gaps'] else []
+                late, gaps = _late_rows(cursor, known_gaps, now)
+
+                cursor.execute(
+                    f"SELECT {_EVENT_COLUMNS} FROM event_outbox WHERE id > %s ORDER BY id LIMIT %s",
+                    (last_id, batch_size)
+                )
+                fetched = cursor.fetchall()
+                rows = _committed_prefix(fetched, last_id, gaps, now)
+
+                if late or rows:
+                    handler([_to_event(row) for row in late + rows])
+                if late or rows or gaps != known_gaps:
+                    cursor.execute(
+                        "UPDATE outbox_checkpoints SET last_id = %s, gaps = %s WHERE consumer = %s",
+                        (rows[-1]['id'] if rows else last_id, json.dumps(gaps) if gaps else None, consumer)
+                    )
+                if not (late or rows):
+                    break
+
+        stats['batches'] += 1
+        stats['events'] += len(late) + len(rows)
+        stats['late'] += len(late)
+        stats['last_id'] = rows[-1]['id'] if rows else last_id
+
+        if len(rows) < len(fetched) or len(fetched) < batch_size:
+            break
+
+    return stats
+
+
+def purge(retention_days: int = OUTBOX_RETENTION_DAYS, batch_size: int = OUTBOX_PURGE_BATCH_SIZE) -> int:
+    """
+    Delete up to batch_size events that every consumer's checkpoint has
+    passed and that are older than retention_days.
+    Returns number of events deleted.
+    """
+    with get_db() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """DELETE FROM event_outbox
+                WHERE id <= (SELECT MIN(last_id) FROM outbox_checkpoints)
+                AND created_at < NOW(3) - INTERVAL %s DAY
+                ORDER BY id LIMIT %s""",
+                (retention_days, batch_size)
+            )
+            return cursor.rowcount
+
+
+def replay(handler: Callable, from_id: int = 0, to_id: Optional[int] = None,
+           batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    """
+    Feed outbox events with from_id < id <= to_id to handler, ignoring and
+    not touching checkpoints (local runs, tests, backfills).
+    Returns number of events replayed.
+    """
+    replayed = 0
+    last_id = from_id
+    with get_db() as conn:
+        with conn.cursor() as cursor:
+            while True:
+                cursor.execute(
+                    f"""SELECT {_EVENT_COLUMNS} FROM event_outbox
+                    WHERE id > %s AND (%s IS NULL OR id <= %s)
+                    ORDER BY id LIMIT %s""",
+                    (last_id, to_id, to_id, batch_size)
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    return replayed
+                handler([_to_event(row) for row in rows])
+                replayed += len(rows)
+                last_id = rows[-1]['id']
+
+
+@outbox_consumer('analytics')
+def export_analytics(events: List[Dict]):
+    """Emit events as structured log lines (CloudWatch subscription exports them)"""
+    for event in events:
+        print(json.dumps({
+            'event': 'game_event',
+            'id': event['id'],
+            'type': event['event_type'],
+            'player_id': event['player_id'],
+            'ts': event['ts'],
+            'data': event['data']
+        }))
@@ -0,0 +1,64 @@
+"""
+Keyset pagination and streaming query utilities
+"""
+import json
+import base64
+import binascii
+from typing import Iterator, List, Optional
+
+import pymysql
+
+FETCH_BATCH_SIZE = 500
+
+
+def encode_cursor(values: List) -> str:
+    """Encode keyset position (last row's sort key) as opaque URL-safe token"""
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token: Optional[str], size: int) -> Optional[List]:
+    """
+    Decode keyset cursor token.
+    Returns list of `size` sort key values, None if token is empty.
+    Raises ValueError on malformed token.
+    """
+    if not token:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError('Malformed cursor')
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Malformed cursor')
+
+    return values
+
+
+def parse_limit(value, default: int, maximum: int) -> int:
+    """Parse page size query parameter, clamped to 1..maximum"""
+    if value in (None, ''):
+        return default
+    return max(1, min(maximum, int(value)))
+
+
+def stream_rows(conn, query: str, params=None,
+                batch_size: int = FETCH_BATCH_SIZE) -> Iterator[dict]:
+    """
+    Execute query on unbuffered server-side cursor (SSDictCursor) and yield
+    rows in fetchmany batches, so the full result set is never held in memory.
+    The generator must be exhausted (or closed) before the connection is reused.
+    """
+    cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+    try:
+        cursor.execute(query, params or ())
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
@@ -0,0 +1,254 @@
+"""
+Real-time push to WebSocket clients (API Gateway management API)
+
+Handlers publish events while they work (push_to_players, push_to_factions,
+push_to_session, broadcast) and the @with_push decorator sends them after the
+handler returned successfully. Events for the same connection are coalesced
+into one frame: {"events": [{"type", "data", "ts"}, ...]}.
+
+Passing the handler's cursor makes an event durable: it is recorded in the
+outbox within the transaction and delivered by the 'push' outbox consumer
+(drained right after the response, and by the scheduled outbox drain if that
+was missed). Without a cursor the event is ephemeral (e.g. tick updates) and
+sent directly, best effort.
+
+PUSH_BACKEND selects the transport: 'aws' (DynamoDB connections table +
+management API), 'memory' (in-process stand-ins for local runs) or 'off'.
+"""
+import json
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Dict, Iterable, List, Optional
+from src.config import config
+from src.utils.connections import CONNECTION_INDEXES, InMemoryConnectionStore, DynamoConnectionStore
+from src.utils.outbox import record_event, outbox_consumer, drain
+
+PUSH_EVENT_TYPES = ('tick', 'death', 'quest_completed', 'artifact_taken', 'zone_changed')
+
+PUSH_SEND_CHUNK_SIZE = 50  # Frames per worker task; smaller fan-outs are sent inline
+PUSH_SEND_WORKERS = 8
+
+
+class InMemoryGateway:
+    """Local stand-in for the API Gateway management API, records sent frames"""
+
+    def __init__(self):
+        self.sent = defaultdict(list)  # connection_id -> [decoded frame, ...]
+        self.gone = set()  # connection ids answering 410 Gone
+
+    def post(self, connection_id: str, data: bytes) -> bool:
+        if connection_id in self.gone:
+            return False
+        self.sent[connection_id].append(json.loads(data))
+        return True
+
+
+class ApiGatewayManagement:
+    """API Gateway management API client (post_to_connection)"""
+
+    def __init__(self, endpoint: str):
+        import boto3
+        self.client = boto3.client('apigatewaymanagementapi', endpoint_url=endpoint)
+
+    def post(self, connection_id: str, data: bytes) -> bool:
+        """Returns False if connection is gone (410)"""
+        try:
+            self.client.post_to_connection(ConnectionId=connection_id, Data=data)
+            return True
+        except self.client.exceptions.GoneException:
+            return False
+
+
+_backend = None  # (store, gateway), created on first use
+_executor = None  # Send pool, reused across invocations
+
+# Ephemeral events queued by current invocation: [(recipients or None for everyone, event), ...]
+_pending = []
+_durable = {'recorded': False}  # Outbox events recorded by current invocation
+
+
+def set_push_backend(store, gateway):
+    """Override transport (local runner / offline tests)"""
+    global _backend
+    _backend = (store, gateway)
+
+
+def get_push_backend():
+    """Connection store and gateway for PUSH_BACKEND"""
+    global _backend
+    if _backend is None:
+        if config.PUSH_BACKEND == 'memory':
+            _backend = (InMemoryConnectionStore(), InMemoryGateway())
+        elif config.PUSH_BACKEND == 'aws':
+            indexes = [index for index in CONNECTION_INDEXES
+                       if index != 'session' or config.CONNECTION_SESSION_INDEX]
+            _backend = (DynamoConnectionStore(config.CONNECTIONS_TABLE, indexes),
+                        ApiGatewayManagement(config.WEBSOCKET_API_ENDPOINT))
+    return _backend
+
+
+def _event(event_type: str, data: Dict) -> Dict:
+    return {'type': event_type, 'data': data, 'ts': int(time.time() * 1000)}
+
+
+def _publish(recipients: Optional[Dict[str, List[str]]], event_type: str, data: Dict, cursor=None):
+    if cursor is not None:
+        players = (recipients or {}).get('player', [])
+        record_event(cursor, event_type, data,
+                     player_id=players[0] if len(players) == 1 else None, recipients=recipients)
+        _durable['recorded'] = True
+    else:
+        _pending.append((recipients, _event(event_type, data)))
+
+
+def _targeted(index: str, values: Iterable[str], event_type: str, data: Dict, cursor=None):
+    values = [value for value in values if value]
+    if values:
+        _publish({index: values}, event_type, data, cursor)
+
+
+def push_to_players(player_ids: Iterable[str], event_type: str, data: Dict, cursor=None):
+    """Publish event to all connections of given players"""
+    _targeted('player', player_ids, event_type, data, cursor)
+
+
+def push_to_factions(factions: Iterable[str], event_type: str, data: Dict, cursor=None):
+    """Publish event to all connected members of given factions"""
+    _targeted('faction', factions, event_type, data, cursor)
+
+
+def push_to_session(session_id: str, event_type: str, data: Dict, cursor=None):
+    """Publish event to all connected players of a game session"""
+    _targeted('session', [session_id], event_type, data, cursor)
+
+
+def broadcast(event_type: str, data: Dict, cursor=None):
+    """Publish event to every connected client"""
+    _publish(None, event_type, data, cursor)
+
+
+def clear_pushes():
+    """Drop queued ephemeral events (handler failed)"""
+    del _pending[:]
+    _durable['recorded'] = False
+
+
+def _send_chunk(gateway, chunk: List) -> List[str]:
+    """Post frames, return connection ids answering 410 Gone"""
+    return [connection_id for connection_id, frame in chunk if not gateway.post(connection_id, frame)]
+
+
+def send_frames(gateway, frames: Dict[str, bytes]) -> List[str]:
+    """
+    Post one frame per connection, chunked across the send pool.
+    Returns connection ids that are gone.
+    """
+    global _executor
+
+    items = list(frames.items())
+    if len(items) <= PUSH_SEND_CHUNK_SIZE:
+        return _send_chunk(gateway, items)
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PUSH_SEND_WORKERS)
+
+    chunks = [items[i:i + PUSH_SEND_CHUNK_SIZE] for i in range(0, len(items), PUSH_SEND_CHUNK_SIZE)]
+    return [connection_id for gone in _executor.map(lambda chunk: _send_chunk(gateway, chunk), chunks)
+            for connection_id in gone]
+
+
+def deliver(queued: List) -> Dict:
+    """
+    Send events, one frame per connection.
+    Connections answering 410 Gone are removed in one batch.
+
+    Args:
+        queued: [(recipients {index: [values]} or None for everyone, event), ...]
+    Returns: {'events': int, 'frames': int, 'gone': int}
+    """
+    stats = {'events': len(queued), 'frames': 0, 'gone': 0}
+    backend = get_push_backend()
+    if not queued or backend is None:
+        return stats
+
+    store, gateway = backend
+
+    # Resolve recipients once per index for all events
+    wanted = defaultdict(set)
+    for recipients, _ in queued:
+        for index, values in (recipients or {}).items():
+            wanted[index].update(values)
+    resolved = {index: store.lookup(index, values) for index, values in wanted.items()}
+    everyone = store.all() if any(recipients is None for recipients, _ in queued) else []
+
+    events_by_connection = defaultdict(list)
+    for recipients, event in queued:
+        if recipients is None:
+            targets = everyone
+        else:
+            targets = [cid for index, values in recipients.items()
+                       for value in values for cid in resolved[index].get(value, [])]
+        for connection_id in dict.fromkeys(targets):
+            events_by_connection[connection_id].append(event)
+
+    frames = {connection_id: json.dumps({'events': events}).encode()
+              for connection_id, events in events_by_connection.items()}
+    gone = send_frames(gateway, frames)
+    stats['frames'] = len(frames) - len(gone)
+
+    if gone:
+        store.remove(gone)
+        stats['gone'] = len(gone)
+
+    return stats
+
+
+def flush_pushes() -> Dict:
+    """
+    Send queued ephemeral events.
+    Best effort: errors are logged, never raised to the handler.
+    """
+    queued = list(_pending)
+    del _pending[:]
+
+    try:
+        return deliver(queued)
+    except Exception as e:
+        print(f"Push flush error: {e}")
+        return {'events': len(queued), 'frames': 0, 'gone': 0}
+
+
+@outbox_consumer('push')
+def deliver_outbox_events(events: List[Dict]):
+    """Outbox consumer: push durable events (errors propagate, batch is retried)"""
+    deliver([
+        (event['recipients'], {'type': event['event_type'], 'data': event['data'], 'ts': event['ts']})
+        for event in events if event['event_type'] in PUSH_EVENT_TYPES
+    ])
+
+
+def with_push(handler):
+    """Decorator: send events published by handler after a successful (< 400) response"""
+    @wraps(handler)
+    def wrapper(event, context):
+        clear_pushes()
+        try:
+            response = handler(event, context)
+        except Exception:
+            clear_pushes()
+            raise
+
+        if isinstance(response, dict) and response.get('statusCode', 200) < 400:
+            if _durable['recorded'] and get_push_backend() is not None:
+                try:
+                    # Another drain in progress will pick our events up
+                    drain('push', skip_locked=True, max_batches=1)
+                except Exception as e:
+                    print(f"Push drain error: {e}")
+            flush_pushes()
+        clear_pushes()
+        return response
+
+    return wrapper
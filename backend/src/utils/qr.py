@@ -4,18 +4,21 @@ QR Code generation utilities for player looting system
 import qrcode
 import qrcode.image.svg
 import io
+import base64
+import hashlib
+from collections import OrderedDict
 
+QR_CACHE_SIZE = 4096
+QR_RENDER_VERSION = 1  # Bump when rendering options change (changes every ETag)
 
-def generate_qr_code(player_id: str) -> str:
-    """
-    Generate QR code for player looting (SVG format - no Pillow needed)
-    
-    Args:
-        player_id: Player UUID
-        
-    Returns:
-        SVG data URI string
-    """
+# Global QR cache (Lambda container reuse)
+# player_id -> {'svg': str, 'etag': str}, least recently used first.
+# QR content is deterministic (STALKER_LOOT:<player_id>), so entries never go stale.
+_qr_cache = OrderedDict()
+
+
+def _render_qr_svg(player_id: str) -> str:
+    """Render loot QR code as SVG (no Pillow needed)"""
     # QR data format
     qr_data = f"STALKER_LOOT:{player_id}"
     
@@ -36,11 +39,53 @@ def generate_qr_code(player_id: str) -> str:
     # Convert to string
     buffer = io.BytesIO()
     img.save(buffer)
-    svg_str = buffer.getvalue().decode('utf-8')
+    return buffer.getvalue().decode('utf-8')
+
+
+def qr_etag(player_id: str) -> str:
+    """Entity tag of player's loot QR, derived from its content without rendering"""
+    return '"' + hashlib.md5(f"{QR_RENDER_VERSION}:STALKER_LOOT:{player_id}".encode()).hexdigest() + '"'
+
+
+def is_qr_cached(player_id: str) -> bool:
+    """True if player's loot QR is already rendered in this container"""
+    return player_id in _qr_cache
+
+
+def get_player_qr(player_id: str) -> dict:
+    """
+    Get player's loot QR code, rendered once per container.
+
+    Returns:
+        Dict with 'svg' (SVG document) and 'etag' (quoted entity tag)
+    """
+    entry = _qr_cache.get(player_id)
+    if entry is not None:
+        _qr_cache.move_to_end(player_id)
+        return entry
+
+    entry = {
+        'svg': _render_qr_svg(player_id),
+        'etag': qr_etag(player_id)
+    }
+    _qr_cache[player_id] = entry
+    if len(_qr_cache) > QR_CACHE_SIZE:
+        _qr_cache.popitem(last=False)
+
+    return entry
+
+
+def generate_qr_code(player_id: str) -> str:
+    """
+    Generate QR code for player looting (SVG format - no Pillow needed)
     
-    # Return as data URI
-    import base64
-    svg_base64 = base64.b64encode(svg_str.encode()).decode()
+    Args:
+        player_id: Player UUID
+        
+    Returns:
+        SVG data URI string
+    """
+    svg_base64 = base64.b64encode(get_player_qr(player_id)['svg'].encode()).decode()
     return f"data:image/svg+xml;base64,{svg_base64}"
 
 
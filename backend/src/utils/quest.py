@@ -7,6 +7,37 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List
 
 
+def initial_progress(quest_data: Optional[Dict]) -> Dict:
+    """Fresh progress for a newly accepted quest from template quest_data"""
+    quest_data = dict(quest_data or {})
+    
+    if 'current_count' in quest_data:
+        quest_data['current_count'] = 0
+    if 'current_counts' in quest_data:
+        quest_data['current_counts'] = {type_id: 0 for type_id in quest_data['current_counts']}
+    if 'visited' in quest_data:
+        quest_data['visited'] = False
+    if 'checkpoints' in quest_data:
+        quest_data['checkpoints'] = [dict(cp, visited=False) for cp in quest_data['checkpoints']]
+    if 'accumulated_time_seconds' in quest_data:
+        quest_data['accumulated_time_seconds'] = 0
+    if 'checkpoint_visits' in quest_data:
+        quest_data['checkpoint_visits'] = []
+    
+    return quest_data
+
+
+def get_instance_progress(progress) -> Dict:
+    """
+    Quest instance progress (quest_instances.progress JSON, snapshot of the
+    template's initial_progress taken on accept, so later template edits
+    don't change accepted quests).
+    """
+    if not progress:
+        return {}
+    return json.loads(progress) if isinstance(progress, str) else progress
+
+
 def update_artifact_collection_progress(quest_data: Dict, artifact_type_id: str) -> tuple[Dict, bool]:
     """
     Update artifact collection quest progress when player picks up artifact.
@@ -128,16 +159,124 @@ def log_quest_event(cursor, quest_id: str, player_id: str, event_type: str,
           json.dumps(progress_data) if progress_data else None, reason))
 
 
+FACTIONS = ('stalker', 'bandit', 'mercenary', 'duty', 'freedom', 'loner')
+
+
+def get_eligible_factions(faction_restriction: Optional[str], faction_restrictions) -> List[str]:
+    """Factions allowed to take a quest ('any' when unrestricted)"""
+    if isinstance(faction_restrictions, str):
+        faction_restrictions = json.loads(faction_restrictions)
+    
+    if faction_restrictions:
+        factions = [f for f in dict.fromkeys(faction_restrictions) if f in FACTIONS]
+        if factions:
+            return factions
+    if faction_restriction:
+        return [faction_restriction]
+    return ['any']
+
+
+def valid_faction_restrictions(faction_restrictions) -> bool:
+    """factionRestrictions request value: empty/None or a list of known factions"""
+    if not faction_restrictions:
+        return True
+    return (isinstance(faction_restrictions, list)
+            and all(f in FACTIONS for f in faction_restrictions))
+
+
+def sync_quest_factions(cursor, quest_id: str):
+    """Rebuild quest_template_factions rows of a template (call after create/update)"""
+    cursor.execute("""
+        SELECT faction_restriction, faction_restrictions
+        FROM quest_templates WHERE id = %s
+    """, (quest_id,))
+    template = cursor.fetchone()
+    
+    cursor.execute("DELETE FROM quest_template_factions WHERE quest_id = %s", (quest_id,))
+    
+    if not template:
+        return
+    
+    factions = get_eligible_factions(template['faction_restriction'], template['faction_restrictions'])
+    if factions:
+        cursor.execute(f"""
+            INSERT INTO quest_template_factions (quest_id, faction)
+            VALUES {', '.join(['(%s, %s)'] * len(factions))}
+        """, [value for faction in factions for value in (quest_id, faction)])
+
+
+def log_quest_events(cursor, events: List[Dict]):
+    """
+    Log many quest events with one multi-row insert.
+    events: [{'quest_id', 'player_id', 'event_type', 'progress_data'?, 'reason'?}, ...]
+    """
+    if not events:
+        return
+    
+    params = []
+    for event in events:
+        progress_data = event.get('progress_data')
+        params.extend([str(uuid.uuid4()), event['quest_id'], event['player_id'], event['event_type'],
+                       json.dumps(progress_data) if progress_data else None, event.get('reason')])
+    
+    values = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(events))
+    cursor.execute(f"""
+        INSERT INTO quest_progress_events (id, quest_id, player_id, event_type, progress_data, event_reason)
+        VALUES {values}
+    """, params)
+
+
+def sweep_quest_lifecycle(cursor, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Bulk-apply quest expiry (called on schedule).
+    - accepted instances past their template deadline fail with reason 'timeout'
+    - available templates past expires_at become 'expired'
+    Returns counts: {'timed_out': int, 'expired_templates': int}
+    """
+    cursor.execute("""
+        SELECT qi.id, qi.player_id
+        FROM quest_instances qi
+        JOIN quest_templates t ON qi.template_id = t.id
+        WHERE qi.status = 'accepted'
+          AND t.expires_at <= NOW()
+        LIMIT %s
+    """, (batch_size,))
+    timed_out = cursor.fetchall()
+    
+    if timed_out:
+        placeholders = ', '.join(['%s'] * len(timed_out))
+        cursor.execute(f"""
+            UPDATE quest_instances
+            SET status = 'failed', failed_reason = 'timeout'
+            WHERE status = 'accepted' AND id IN ({placeholders})
+        """, [q['id'] for q in timed_out])
+        
+        log_quest_events(cursor, [{
+            'quest_id': q['id'],
+            'player_id': q['player_id'],
+            'event_type': 'failed',
+            'reason': 'timeout'
+        } for q in timed_out])
+    
+    cursor.execute("""
+        UPDATE quest_templates
+        SET status = 'expired'
+        WHERE status = 'available'
+          AND expires_at <= NOW()
+    """)
+    expired_templates = cursor.rowcount
+    
+    return {'timed_out': len(timed_out), 'expired_templates': expired_templates}
+
+
 def fail_player_quests(cursor, player_id: str, reason: str = 'player_death'):
     """Fail all active quests for player (called on death)"""
     cursor.execute("""
-        UPDATE contracts 
-        SET failed = TRUE, 
-            failed_reason = %s,
-            status = 'failed'
-        WHERE accepted_by = %s 
+        UPDATE quest_instances 
+        SET status = 'failed',
+            failed_reason = %s
+        WHERE player_id = %s 
           AND status = 'accepted'
-          AND failed = 0
     """, (reason, player_id))
     return cursor.rowcount
 
@@ -148,15 +287,14 @@ def fail_artifact_quests_for_others(cursor, artifact_type_id: str, picker_player
     Called when artifact is picked up.
     """
     cursor.execute("""
-        UPDATE contracts 
-        SET failed = TRUE, 
-            failed_reason = 'artifact_taken_by_other',
-            status = 'failed'
-        WHERE quest_type = 'artifact_collection'
-          AND status = 'accepted'
-          AND failed = 0
-          AND accepted_by != %s
-          AND JSON_EXTRACT(quest_data, '$.artifact_type_id') = %s
+        UPDATE quest_instances qi
+        JOIN quest_templates t ON qi.template_id = t.id
+        SET qi.status = 'failed',
+            qi.failed_reason = 'artifact_taken_by_other'
+        WHERE t.quest_type = 'artifact_collection'
+          AND qi.status = 'accepted'
+          AND qi.player_id != %s
+          AND JSON_EXTRACT(t.quest_data, '$.artifact_type_id') = %s
     """, (picker_player_id, artifact_type_id))
     return cursor.rowcount
 
@@ -167,14 +305,13 @@ def fail_protection_quests(cursor, dead_player_id: str):
     Called from death handler.
     """
     cursor.execute("""
-        UPDATE contracts 
-        SET failed = TRUE, 
-            failed_reason = 'protected_player_died',
-            status = 'failed'
-        WHERE quest_type = 'protection'
-          AND status = 'accepted'
-          AND failed = 0
-          AND target_player_id = %s
+        UPDATE quest_instances qi
+        JOIN quest_templates t ON qi.template_id = t.id
+        SET qi.status = 'failed',
+            qi.failed_reason = 'protected_player_died'
+        WHERE t.quest_type = 'protection'
+          AND qi.status = 'accepted'
+          AND t.target_player_id = %s
     """, (dead_player_id,))
     return cursor.rowcount
 
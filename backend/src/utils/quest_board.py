@@ -0,0 +1,233 @@
+"""
+Quest template cache and quest board utilities
+"""
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, Iterable
+from src.utils.quest import get_instance_progress
+from src.utils.cache_policy import cached_version, record_lookup, replica_lags
+from src.utils.shared_cache import bump_cache_version
+
+# Global cache for board quest templates (status 'available', Lambda container reuse)
+# {'version': int, 'by_id': {template_id: template}, 'order': [template_id, ...]}
+# template = {'id', 'status', 'faction', 'available_at', 'expires_at', 'quest', 'json'}
+_quest_templates_cache = {'version': None, 'by_id': {}, 'order': []}
+
+# Pre-serialized board per faction (None = players without faction)
+# faction -> {'version': int, 'valid_from', 'valid_until', 'body': str, 'etag': str}
+_quest_board_cache = {}
+
+
+def invalidate_quest_board_cache(cursor):
+    """Invalidate quest template/board cache by incrementing version"""
+    bump_cache_version(cursor, 'quest_board')
+
+
+def get_quest_board_version(cursor) -> int:
+    """Get current quest board version (re-checked at most once per staleness window)"""
+    return cached_version(cursor, 'quest_board')
+
+
+def format_quest(q):
+    """Format quest template for API response"""
+    return {
+        'id': q['id'],
+        'type': q['quest_type'],
+        'questType': q['quest_type'],
+        'title': q['title'],
+        'description': q['description'],
+        'reward': float(q['reward']),
+        'status': q['status'],
+        'failed': False,
+        'failedReason': None,
+        'autoComplete': bool(q['auto_complete']),
+        'questData': json.loads(q['quest_data']) if q['quest_data'] else None,
+        'issuer': {
+            'id': q['issuer_id'],
+            'nickname': q.get('issuer_nickname') or q.get('trader_name')
+        },
+        'factionRestriction': q['faction_restriction'],
+        'expiresAt': q['expires_at'].isoformat() + 'Z' if q['expires_at'] else None,
+        'acceptedAt': None,
+        'createdAt': q['created_at'].isoformat() + 'Z' if q['created_at'] else None
+    }
+
+
+def format_instance(instance, template):
+    """Format player's quest instance (slim row + cached template) for API response"""
+    quest = dict(template['quest'])
+    quest.update({
+        'id': instance['id'],
+        'templateId': template['id'],
+        'status': instance['status'],
+        'failed': instance['status'] == 'failed',
+        'failedReason': instance['failed_reason'],
+        'questData': get_instance_progress(instance['progress']),
+        'acceptedAt': instance['accepted_at'].isoformat() + 'Z' if instance['accepted_at'] else None
+    })
+    return quest
+
+
+TEMPLATE_SELECT = """
+    SELECT t.*,
+           COALESCE(p.nickname, tr.name) as issuer_nickname,
+           tr.name as trader_name
+    FROM quest_templates t
+    LEFT JOIN players p ON t.issuer_id = p.id
+    LEFT JOIN traders tr ON t.issuer_id = tr.id
+"""
+
+
+def _template_entry(q) -> dict:
+    """Cached template entry with the quest serialized once"""
+    quest = format_quest(q)
+    return {
+        'id': q['id'],
+        'status': q['status'],
+        'faction': q['faction_restriction'],
+        'available_at': q['available_at'],
+        'expires_at': q['expires_at'],
+        'quest': quest,
+        'json': json.dumps(quest)
+    }
+
+
+def _load_quest_templates(cursor) -> dict:
+    """Query board quest templates (status 'available') and serialize each once"""
+    cursor.execute(TEMPLATE_SELECT + """
+        WHERE t.status = 'available'
+        ORDER BY t.created_at DESC
+    """)
+
+    by_id = {}
+    order = []
+    for q in cursor.fetchall():
+        by_id[q['id']] = _template_entry(q)
+        order.append(q['id'])
+
+    return {'by_id': by_id, 'order': order}
+
+
+def get_quest_templates(cursor) -> dict:
+    """
+    Get board quest templates (status 'available') with version-based cache.
+
+    Returns:
+        Dict with 'by_id' ({template_id: template}) and 'order' (newest first)
+    """
+    global _quest_templates_cache
+
+    current_version = get_quest_board_version(cursor)
+
+    record_lookup('quest_board', hit=_quest_templates_cache['version'] == current_version)
+
+    if _quest_templates_cache['version'] != current_version:
+        templates = _load_quest_templates(cursor)
+        if replica_lags(cursor, 'quest_board', current_version):
+            templates['version'] = None  # Older than current_version, not cached
+            return templates
+        templates['version'] = current_version
+        _quest_templates_cache = templates
+
+    return _quest_templates_cache
+
+
+def get_templates_by_id(cursor, template_ids: Iterable[str]) -> Dict[str, dict]:
+    """
+    Templates of template_ids (e.g. of player's quest instances): board
+    templates from the cache, expired / archived ones queried by id.
+    """
+    board = get_quest_templates(cursor)['by_id']
+    templates = {}
+    missing = []
+    for template_id in dict.fromkeys(template_ids):
+        if template_id in board:
+            templates[template_id] = board[template_id]
+        else:
+            missing.append(template_id)
+
+    if missing:
+        placeholders = ', '.join(['%s'] * len(missing))
+        cursor.execute(TEMPLATE_SELECT + f"WHERE t.id IN ({placeholders})", missing)
+        for q in cursor.fetchall():
+            templates[q['id']] = _template_entry(q)
+
+    return templates
+
+
+def is_on_board(template, faction, now: datetime) -> bool:
+    """Check template is available to faction right now"""
+    if template['status'] != 'available':
+        return False
+    if template['faction'] is not None and template['faction'] != faction:
+        return False
+    if template['available_at'] and template['available_at'] > now:
+        return False
+    if template['expires_at'] and template['expires_at'] <= now:
+        return False
+    return True
+
+
+def _build_board(templates: dict, faction, now: datetime) -> dict:
+    """Filter faction board by time window, serialize, and compute how long it stays valid"""
+    visible = []
+    valid_from = datetime.min
+    valid_until = datetime.max
+
+    for template_id in templates['order']:
+        q = templates['by_id'][template_id]
+        if q['status'] != 'available':
+            continue
+        if q['faction'] is not None and q['faction'] != faction:
+            continue
+
+        available_at, expires_at = q['available_at'], q['expires_at']
+
+        # Board changes when a quest becomes available or expires
+        if available_at and available_at > now:
+            valid_until = min(valid_until, available_at)
+            continue
+        if available_at:
+            valid_from = max(valid_from, available_at)
+
+        if expires_at and expires_at <= now:
+            valid_from = max(valid_from, expires_at)
+            continue
+        if expires_at:
+            valid_until = min(valid_until, expires_at)
+
+        visible.append(q['json'])
+
+    body = '{"quests": [' + ', '.join(visible) + ']}'
+
+    return {
+        'valid_from': valid_from,
+        'valid_until': valid_until,
+        'body': body,
+        'etag': '"' + hashlib.md5(body.encode()).hexdigest() + '"'
+    }
+
+
+def get_quest_board(cursor, faction) -> dict:
+    """
+    Get quest board for faction with version-based cache.
+    Time window (available_at / expires_at) is applied in memory, so the
+    cached board is reused until the next quest becomes available or expires.
+
+    Returns:
+        Dict with 'body' (serialized JSON response body) and 'etag'
+    """
+    templates = get_quest_templates(cursor)
+    now = datetime.utcnow()
+
+    cached = _quest_board_cache.get(faction)
+    if (cached is not None and cached['version'] == templates['version']
+            and cached['valid_from'] <= now < cached['valid_until']):
+        return cached
+
+    entry = _build_board(templates, faction, now)
+    entry['version'] = templates['version']
+    _quest_board_cache[faction] = entry
+
+    return entry
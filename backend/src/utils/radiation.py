@@ -2,6 +2,7 @@
 Radiation calculation utilities
 """
 from src.utils.geo import haversine_distance, point_in_circle
+from src.utils.shared_cache import get_world_snapshot
 from datetime import datetime
 import math
 
@@ -13,35 +14,18 @@ _radiation_zones_cache = {
 
 
 def get_active_radiation_zones(cursor, now):
-    """Get active radiation zones with cache"""
-    global _radiation_zones_cache
-    
-    # Check cache version
-    cursor.execute("SELECT version FROM cache_versions WHERE cache_key = 'radiation_zones'")
-    result = cursor.fetchone()
-    current_version = result['version'] if result else 0
-    
-    # Return cached if valid
-    if (_radiation_zones_cache['data'] is not None and 
-        _radiation_zones_cache['version'] == current_version):
-        return _radiation_zones_cache['data']
-    
-    # Query active zones
-    cursor.execute("""
-        SELECT id, name, center_lat, center_lng, radius, radiation_level
-        FROM radiation_zones
-        WHERE active = TRUE
-          AND (active_from IS NULL OR active_from <= %s)
-          AND (active_to IS NULL OR active_to > %s)
-    """, (now, now))
-    
-    zones = cursor.fetchall()
-    
-    # Update cache
-    _radiation_zones_cache['data'] = zones
-    _radiation_zones_cache['version'] = current_version
-    
-    return zones
+    """Get active radiation zones with version-based cache (local, then shared, then DB)"""
+    def load(cursor):
+        cursor.execute("""
+            SELECT id, name, center_lat, center_lng, radius, radiation_level
+            FROM radiation_zones
+            WHERE active = TRUE
+              AND (active_from IS NULL OR active_from <= %s)
+              AND (active_to IS NULL OR active_to > %s)
+        """, (now, now))
+        return cursor.fetchall()
+
+    return get_world_snapshot(cursor, 'radiation_zones', _radiation_zones_cache, load)
 
 
 def get_player_radiation_resist(cursor, player_id):
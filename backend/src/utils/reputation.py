@@ -1,45 +1,126 @@
 """
 Reputation system utilities
 """
-from typing import Optional
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
 
-def get_reputation(cursor, player_id: str, npc_id: Optional[str] = None, 
+MAX_DISCOUNT_PCT = 100
+REPUTATION_PER_DISCOUNT_PCT = 100
+REPUTATION_CACHE_SIZE = 4096
+
+# Global reputation vectors (Lambda container reuse), least recently used first
+# player_id -> {'version': players.reputation_version, 'npc': {npc_id: rep}, 'faction': {faction: rep}}
+_vectors = OrderedDict()
+
+
+def get_reputation(cursor, player_id: str, npc_id: Optional[str] = None,
                   faction: Optional[str] = None) -> int:
     """Get player's reputation with NPC or faction"""
     if npc_id:
         cursor.execute("""
-            SELECT reputation FROM npc_reputation 
+            SELECT reputation FROM npc_reputation
             WHERE player_id = %s AND npc_id = %s
         """, (player_id, npc_id))
     elif faction:
         cursor.execute("""
-            SELECT reputation FROM npc_reputation 
+            SELECT reputation FROM npc_reputation
             WHERE player_id = %s AND faction = %s AND npc_id IS NULL
         """, (player_id, faction))
     else:
         return 0
-    
+
     row = cursor.fetchone()
     return row['reputation'] if row else 0
 
 
-def add_reputation(cursor, player_id: str, amount: int, 
+def load_reputation_vector(cursor, player_id: str) -> Dict:
+    """
+    Load player's whole reputation vector in one query.
+    Returns: {'npc': {npc_id: rep}, 'faction': {faction: rep}}
+    """
+    cursor.execute("""
+        SELECT npc_id, faction, reputation
+        FROM npc_reputation
+        WHERE player_id = %s
+    """, (player_id,))
+
+    vector = {'npc': {}, 'faction': {}}
+    for row in cursor.fetchall():
+        if row['npc_id']:
+            vector['npc'][row['npc_id']] = row['reputation']
+        elif row['faction']:
+            vector['faction'][row['faction']] = row['reputation']
+
+    return vector
+
+
+def get_reputation_vector(cursor, player_id: str, version: int) -> Dict:
+    """
+    Player's reputation vector, cached per container.
+    version: player's current players.reputation_version (bumped by trigger on
+    every npc_reputation write), read by the caller with the player row.
+    """
+    cached = _vectors.get(player_id)
+    if cached is not None and cached['version'] == version:
+        _vectors.move_to_end(player_id)
+        return cached
+
+    vector = load_reputation_vector(cursor, player_id)
+    vector['version'] = version
+    _vectors[player_id] = vector
+    _vectors.move_to_end(player_id)
+    if len(_vectors) > REPUTATION_CACHE_SIZE:
+        _vectors.popitem(last=False)
+
+    return vector
+
+
+def add_reputation(cursor, player_id: str, amount: int,
                   npc_id: Optional[str] = None, faction: Optional[str] = None):
     """Add reputation to player (NPC-specific or faction-wide)"""
-    import uuid
-    
-    if npc_id:
-        cursor.execute("""
-            INSERT INTO npc_reputation (id, player_id, npc_id, reputation)
-            VALUES (%s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE reputation = reputation + %s
-        """, (str(uuid.uuid4()), player_id, npc_id, amount, amount))
-    elif faction:
-        cursor.execute("""
-            INSERT INTO npc_reputation (id, player_id, faction, reputation)
-            VALUES (%s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE reputation = reputation + %s
-        """, (str(uuid.uuid4()), player_id, faction, amount, amount))
+    add_reputation_batch(cursor, [{
+        'player_id': player_id,
+        'amount': amount,
+        'npc_id': npc_id,
+        'faction': faction
+    }])
+
+
+def add_reputation_batch(cursor, rewards: Iterable[Dict]) -> int:
+    """
+    Apply reputation rewards as one multi-row upsert.
+
+    Args:
+        rewards: [{'player_id', 'amount', 'npc_id' or 'faction'}, ...]
+                 Rewards for the same (player, npc/faction) are merged.
+
+    Returns: number of distinct reputation rows touched
+    """
+    merged = {}
+    for reward in rewards:
+        npc_id = reward.get('npc_id')
+        faction = None if npc_id else reward.get('faction')
+        if not reward.get('amount') or not (npc_id or faction):
+            continue
+
+        key = (reward['player_id'], npc_id, faction)
+        merged[key] = merged.get(key, 0) + reward['amount']
+
+    if not merged:
+        return 0
+
+    params: List = []
+    for (player_id, npc_id, faction), amount in merged.items():
+        params.extend([player_id, npc_id, faction, amount])
+
+    values = ', '.join(['(UUID(), %s, %s, %s, %s)'] * len(merged))
+    cursor.execute(f"""
+        INSERT INTO npc_reputation (id, player_id, npc_id, faction, reputation)
+        VALUES {values}
+        ON DUPLICATE KEY UPDATE reputation = reputation + VALUES(reputation)
+    """, params)
+
+    return len(merged)
 
 
 def calculate_discount(reputation: int) -> int:
@@ -47,21 +128,31 @@ def calculate_discount(reputation: int) -> int:
     Calculate commission discount based on reputation.
     1% discount per 100 reputation, max 100% at 10,000 rep.
     """
-    return min(100, max(0, reputation // 100))
-
-
-def get_trader_discount(cursor, player_id: str, trader_id: str) -> int:
-    """Get discount for player when trading with specific trader"""
-    # Check NPC-specific reputation first
-    npc_rep = get_reputation(cursor, player_id, npc_id=trader_id)
-    if npc_rep > 0:
-        return calculate_discount(npc_rep)
-    
-    # Check faction-wide reputation
-    cursor.execute("SELECT faction FROM traders WHERE id = %s", (trader_id,))
-    row = cursor.fetchone()
-    if row and row['faction']:
-        faction_rep = get_reputation(cursor, player_id, faction=row['faction'])
-        return calculate_discount(faction_rep)
-    
-    return 0
+    return min(MAX_DISCOUNT_PCT, max(0, reputation // REPUTATION_PER_DISCOUNT_PCT))
+
+
+# Discount by reputation bucket (REPUTATION_PER_DISCOUNT_PCT points each), from calculate_discount
+DISCOUNT_TABLE = tuple(calculate_discount(bucket * REPUTATION_PER_DISCOUNT_PCT)
+                       for bucket in range(MAX_DISCOUNT_PCT + 1))
+
+
+def discount_for(reputation: Optional[int]) -> int:
+    """calculate_discount via DISCOUNT_TABLE"""
+    bucket = (reputation or 0) // REPUTATION_PER_DISCOUNT_PCT
+    return DISCOUNT_TABLE[min(max(bucket, 0), MAX_DISCOUNT_PCT)]
+
+
+def trader_discount(vector: Dict, trader_id: str, faction: Optional[str]) -> int:
+    """Discount for trader from player's NPC reputation, else faction reputation"""
+    npc_rep = vector['npc'].get(trader_id)
+    if npc_rep and npc_rep > 0:
+        return discount_for(npc_rep)
+
+    return discount_for(vector['faction'].get(faction))
+
+
+def discounted_commission(commission_pct, discount_pct: int):
+    """Trader commission after reputation discount (100% discount = no commission)"""
+    if not discount_pct:
+        return commission_pct
+    return round(commission_pct * (MAX_DISCOUNT_PCT - discount_pct) / MAX_DISCOUNT_PCT, 2)
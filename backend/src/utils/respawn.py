@@ -7,6 +7,7 @@ import json
 from datetime import datetime, timedelta
 from typing import Tuple
 from src.utils.geo import point_in_circle
+from src.utils.shared_cache import get_world_snapshot
 
 def random_point_in_radius(center_lat: float, center_lng: float, 
                           radius_meters: int) -> Tuple[float, float]:
@@ -113,35 +114,18 @@ _respawn_zones_cache = {
 
 
 def get_active_respawn_zones(cursor, now):
-    """Get active respawn zones with cache"""
-    global _respawn_zones_cache
-    
-    # Check cache version
-    cursor.execute("SELECT version FROM cache_versions WHERE cache_key = 'respawn_zones'")
-    result = cursor.fetchone()
-    current_version = result['version'] if result else 0
-    
-    # Return cached if valid
-    if (_respawn_zones_cache['data'] is not None and 
-        _respawn_zones_cache['version'] == current_version):
-        return _respawn_zones_cache['data']
-    
-    # Query active zones
-    cursor.execute("""
-        SELECT id, name, center_lat, center_lng, radius, respawn_time_seconds
-        FROM respawn_zones
-        WHERE active = TRUE
-          AND (active_from IS NULL OR active_from <= %s)
-          AND (active_to IS NULL OR active_to > %s)
-    """, (now, now))
-    
-    zones = cursor.fetchall()
-    
-    # Update cache
-    _respawn_zones_cache['data'] = zones
-    _respawn_zones_cache['version'] = current_version
-    
-    return zones
+    """Get active respawn zones with version-based cache (local, then shared, then DB)"""
+    def load(cursor):
+        cursor.execute("""
+            SELECT id, name, center_lat, center_lng, radius, respawn_time_seconds
+            FROM respawn_zones
+            WHERE active = TRUE
+              AND (active_from IS NULL OR active_from <= %s)
+              AND (active_to IS NULL OR active_to > %s)
+        """, (now, now))
+        return cursor.fetchall()
+
+    return get_world_snapshot(cursor, 'respawn_zones', _respawn_zones_cache, load)
 
 
 def update_resurrection_progress(cursor, player, location, now, accuracy=0):
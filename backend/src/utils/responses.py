@@ -71,3 +71,33 @@ def error_response(message, status_code=400, code='ERROR', event=None, with_cred
         'headers': cors_headers(event, with_credentials),
         'body': json.dumps({'error': {'code': code, 'message': message}})
     }
+
+def get_header(event, name):
+    """Get request header value (case-insensitive)"""
+    headers = (event or {}).get('headers') or {}
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+def etag_matches(event, etag):
+    """Check If-None-Match request header against current ETag"""
+    if_none_match = get_header(event, 'If-None-Match')
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    # Weak comparison: W/"x" matches "x"
+    return any(tag == etag or tag == 'W/' + etag for tag in candidates)
+
+def not_modified_response(etag, headers=None):
+    """Return 304 Not Modified response (empty body)"""
+    response_headers = dict(headers or {})
+    response_headers['ETag'] = etag
+    return {
+        'statusCode': 304,
+        'headers': response_headers,
+        'body': ''
+    }
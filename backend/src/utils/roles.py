@@ -0,0 +1,91 @@
+"""
+Player role resolver with per-container cache
+"""
+import time
+from typing import Dict, Optional
+from src.database import get_db
+
+ROLE_VERSION_CHECK_SECONDS = 30  # Max time other containers keep serving revoked roles
+
+NO_ROLES = {'is_gm': False, 'is_bartender': False}
+
+# Global role cache (Lambda container reuse)
+# {'version': int, 'checked_at': float, 'players': {player_id: {'is_gm', 'is_bartender'}}}
+_role_cache = {'version': None, 'checked_at': 0.0, 'players': {}}
+
+
+def get_roles_version(cursor) -> int:
+    """Get current player roles version from DB"""
+    cursor.execute("SELECT version FROM cache_versions WHERE cache_key = 'player_roles'")
+    result = cursor.fetchone()
+    return result['version'] if result else 0
+
+
+def invalidate_role_cache(cursor):
+    """Invalidate role cache (and role claims in issued tokens) by incrementing version"""
+    cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'player_roles'")
+    _role_cache['version'] = None
+    _role_cache['players'] = {}
+
+
+def resolve_roles(player: Dict) -> Dict:
+    """
+    Resolve player's roles without a DB round trip in the common case.
+
+    1. Roles version is re-checked at most once per ROLE_VERSION_CHECK_SECONDS;
+       a change drops all cached roles.
+    2. Cached roles for the player are used as is.
+    3. Role claims signed into the token are trusted if they were issued at the
+       current roles version (any role change bumps the version).
+    4. Otherwise player_roles is read once and cached.
+
+    Args:
+        player: {'player_id', 'roles', 'role_version'} from get_current_player
+    Returns: {'is_gm': bool, 'is_bartender': bool}
+    """
+    now = time.monotonic()
+    player_id = player['player_id']
+
+    version_check_due = (_role_cache['version'] is None
+                         or now - _role_cache['checked_at'] >= ROLE_VERSION_CHECK_SECONDS)
+
+    if not version_check_due:
+        cached = _role_cache['players'].get(player_id)
+        if cached is not None:
+            return cached
+        if _claims_current(player):
+            return _cache_roles(player_id, player['roles'])
+
+    with get_db() as conn:
+        with conn.cursor() as cursor:
+            if version_check_due:
+                version = get_roles_version(cursor)
+                if version != _role_cache['version']:
+                    _role_cache['version'] = version
+                    _role_cache['players'] = {}
+                _role_cache['checked_at'] = now
+
+                cached = _role_cache['players'].get(player_id)
+                if cached is not None:
+                    return cached
+                if _claims_current(player):
+                    return _cache_roles(player_id, player['roles'])
+
+            cursor.execute(
+                "SELECT is_gm, is_bartender FROM player_roles WHERE player_id = %s",
+                (player_id,)
+            )
+            row = cursor.fetchone()
+
+    roles = {'is_gm': bool(row['is_gm']), 'is_bartender': bool(row['is_bartender'])} if row else NO_ROLES
+    return _cache_roles(player_id, roles)
+
+
+def _claims_current(player: Dict) -> bool:
+    return player.get('roles') is not None and player.get('role_version') == _role_cache['version']
+
+
+def _cache_roles(player_id: str, roles: Optional[Dict]) -> Dict:
+    entry = {'is_gm': bool(roles.get('is_gm')), 'is_bartender': bool(roles.get('is_bartender'))}
+    _role_cache['players'][player_id] = entry
+    return entry
@@ -0,0 +1,267 @@
+"""
+Shared world-state cache tier (Redis protocol)
+
+Three layers, cheapest first:
+1. In-process cache of the container ({'data', 'version'} dicts in the owning modules)
+2. Shared cache: cache version counters and serialized snapshots per version,
+   shared by all warm containers
+3. MySQL: cache_versions / the source tables, touched only on shared cache miss
+
+SHARED_CACHE_URL selects the backend: redis://host:port/db (needs the `redis`
+package), memory:// (in-process stand-in for local runs and tests) or empty
+(disabled: versions are read from MySQL as before).
+
+Writers bump the version with bump_cache_version(); the shared version key is
+dropped after the transaction commits (and again by the 'cache' outbox
+consumer), and kept with a short TTL so a reader racing the commit can't pin a
+stale version for long. How often readers re-check versions is set per cache
+in src.utils.cache_policy. On a replica connection the version is read from
+the replica itself, so it always matches the (possibly lagging) rows loaded
+with it, and is never written back to the shared version key.
+"""
+import json
+import time
+import datetime
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+from src.config import config
+from src.database import after_commit, is_replica
+from src.utils.cache_policy import (
+    cached_version, record_lookup, invalidate_local, publish_invalidation, replica_lags
+)
+from src.utils.outbox import record_event, outbox_consumer
+
+VERSION_TTL_SECONDS = 30  # Bound on staleness of a shared version key
+SNAPSHOT_TTL_SECONDS = 3600
+RETRY_AFTER_ERROR_SECONDS = 30  # Shared cache errors fall back to MySQL for this long
+
+KEY_PREFIX = 'pda:'
+
+
+class InMemoryRedis:
+    """In-process stand-in for the Redis commands used here"""
+
+    def __init__(self):
+        self.data = {}  # key -> (value, expires_at or None)
+
+    def _alive(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._alive(key)
+        return entry[0] if entry else None
+
+    def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value, ex: Optional[int] = None):
+        if isinstance(value, str):
+            value = value.encode()
+        elif isinstance(value, int):
+            value = str(value).encode()
+        self.data[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+
+_client = {'instance': None, 'url': None, 'disabled_until': 0.0}
+
+_stats = {'hits': 0, 'misses': 0, 'errors': 0}
+
+
+def set_shared_cache(client):
+    """Override backend (tests, local runner); None disables"""
+    _client['instance'] = client
+    _client['url'] = config.SHARED_CACHE_URL
+    _client['disabled_until'] = 0.0
+
+
+def get_shared_cache():
+    """Shared cache client for SHARED_CACHE_URL, None if disabled or unavailable"""
+    if time.monotonic() < _client['disabled_until']:
+        return None
+
+    url = config.SHARED_CACHE_URL
+    if _client['url'] != url:
+        _client['url'] = url
+        _client['instance'] = None
+        if url.startswith('memory://'):
+            _client['instance'] = InMemoryRedis()
+        elif url:
+            try:
+                import redis
+                _client['instance'] = redis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+            except ImportError:
+                print("Shared cache disabled: redis package not installed")
+
+    return _client['instance']
+
+
+def _failed(e: Exception):
+    """Back off to MySQL after a shared cache error"""
+    _stats['errors'] += 1
+    _client['disabled_until'] = time.monotonic() + RETRY_AFTER_ERROR_SECONDS
+    print(f"Shared cache error: {e}")
+
+
+def get_shared_cache_stats() -> Dict:
+    return dict(_stats)
+
+
+def _default(value):
+    if isinstance(value, datetime.datetime):
+        return {'__dt__': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'__d__': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'__dec__': str(value)}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _object_hook(obj):
+    if len(obj) == 1:
+        if '__dt__' in obj:
+            return datetime.datetime.fromisoformat(obj['__dt__'])
+        if '__d__' in obj:
+            return datetime.date.fromisoformat(obj['__d__'])
+        if '__dec__' in obj:
+            return Decimal(obj['__dec__'])
+    return obj
+
+
+def encode_snapshot(data) -> bytes:
+    """Serialize DB rows (datetime and Decimal values round-trip exactly)"""
+    return json.dumps(data, default=_default, separators=(',', ':')).encode()
+
+
+def decode_snapshot(raw: bytes):
+    return json.loads(raw, object_hook=_object_hook)
+
+
+def _version_key(cache_key: str) -> str:
+    return f'{KEY_PREFIX}version:{cache_key}'
+
+
+def _snapshot_key(cache_key: str, version: int) -> str:
+    return f'{KEY_PREFIX}snapshot:{cache_key}:{version}'
+
+
+def _db_version(cursor, cache_key: str) -> int:
+    cursor.execute("SELECT version FROM cache_versions WHERE cache_key = %s", (cache_key,))
+    result = cursor.fetchone()
+    return result['version'] if result else 0
+
+
+def get_cache_version(cursor, cache_key: str) -> int:
+    """Current cache version: shared cache first, MySQL on miss (then shared)"""
+    if is_replica(cursor):
+        return _db_version(cursor, cache_key)
+
+    shared = get_shared_cache()
+    if shared is not None:
+        try:
+            raw = shared.get(_version_key(cache_key))
+            if raw is not None:
+                return int(raw)
+        except Exception as e:
+            _failed(e)
+            shared = None
+
+    version = _db_version(cursor, cache_key)
+
+    if shared is not None:
+        try:
+            shared.set(_version_key(cache_key), version, ex=VERSION_TTL_SECONDS)
+        except Exception as e:
+            _failed(e)
+
+    return version
+
+
+def _drop_shared_version(cache_key: str):
+    shared = get_shared_cache()
+    if shared is not None:
+        try:
+            shared.delete(_version_key(cache_key))
+        except Exception as e:
+            _failed(e)
+
+
+def bump_cache_version(cursor, cache_key: str):
+    """
+    Invalidate cache_key everywhere: bump MySQL version and publish a
+    'cache_invalidated' outbox event in the caller's transaction; after
+    commit, drop the shared version key and this container's cached version.
+    """
+    cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = %s", (cache_key,))
+    record_event(cursor, 'cache_invalidated', {'cacheKey': cache_key})
+
+    def apply():
+        _drop_shared_version(cache_key)
+        invalidate_local(cache_key)
+
+    after_commit(cursor, apply)
+
+
+@outbox_consumer('cache')
+def apply_invalidations(events: List[Dict]):
+    """Outbox consumer: re-drop shared versions (closes reader/commit race), notify subscribers"""
+    for cache_key in dict.fromkeys(event['data']['cacheKey'] for event in events
+                                   if event['event_type'] == 'cache_invalidated'):
+        _drop_shared_version(cache_key)
+        publish_invalidation(cache_key)
+
+
+def get_world_snapshot(cursor, cache_key: str, local: Dict, loader: Callable):
+    """
+    Versioned read-through cache.
+
+    Args:
+        cache_key: cache_versions key ('artifacts', 'radiation_zones', ...)
+        local: in-process cache dict {'data', 'version'} owned by caller
+        loader: fn(cursor) -> rows, called on shared cache miss
+    Returns: cached or freshly loaded rows
+    """
+    version = cached_version(cursor, cache_key)
+
+    if local['data'] is not None and local['version'] == version:
+        record_lookup(cache_key, hit=True)
+        return local['data']
+
+    shared = get_shared_cache()
+    if shared is not None:
+        try:
+            raw = shared.get(_snapshot_key(cache_key, version))
+            if raw is not None:
+                _stats['hits'] += 1
+                record_lookup(cache_key, hit=True)
+                local['data'] = decode_snapshot(raw)
+                local['version'] = version
+                return local['data']
+        except Exception as e:
+            _failed(e)
+            shared = None
+
+    _stats['misses'] += 1
+    record_lookup(cache_key, hit=False)
+    data = loader(cursor)
+    if replica_lags(cursor, cache_key, version):
+        return data
+
+    if shared is not None:
+        try:
+            shared.set(_snapshot_key(cache_key, version), encode_snapshot(data), ex=SNAPSHOT_TTL_SECONDS)
+        except Exception as e:
+            _failed(e)
+
+    local['data'] = data
+    local['version'] = version
+    return data
@@ -0,0 +1,237 @@
+"""
+SQL statement profiler and N+1 detector
+
+With SQL_PROFILE enabled, every cursor of a get_db() connection records its
+statements into the profile of the current request (handlers wrapped by
+require_auth / require_gm, or explicitly by @profile_sql). At the end of the
+request one structured 'sql_profile' log line is emitted: statement count,
+total duration, rows, and per-fingerprint counts. A fingerprint (statement
+with literals and %s placeholders normalized) executed at least
+SQL_PROFILE_REPEAT_THRESHOLD times in one request is flagged as a likely
+N+1 loop.
+
+Tests and benchmarks can assert a statement budget regardless of config:
+
+    with statement_budget(8) as profile:
+        handler(event, None)
+    print(profile.summary())
+
+Fake connections (which don't come from get_db) are instrumented with
+profile_connection(conn).
+"""
+import re
+import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+import pymysql
+from src.config import config
+
+PROFILE_TOP_FINGERPRINTS = 10  # Fingerprints listed in the log line, by count
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|%\(\w+\)s')
+_VALUE_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_VALUE_ROWS = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+# Active profiles, innermost last (a budget around a profiled handler sees the handler's statements)
+_stack = []
+
+
+def fingerprint(query: str) -> str:
+    """Normalized statement: literals and placeholders -> ?, (?, ?, ...) and multi-row VALUES -> (...)"""
+    query = _STRING_LITERAL.sub('?', query)
+    query = _PLACEHOLDER.sub('?', query)
+    query = _NUMBER_LITERAL.sub('?', query)
+    query = _VALUE_LIST.sub('(...)', query)
+    query = _VALUE_ROWS.sub('(...)', query)
+    return _WHITESPACE.sub(' ', query).strip()
+
+
+class SQLProfile:
+    """Statements recorded during one request"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.statements = 0
+        self.duration = 0.0
+        self.rows = 0
+        self.fingerprints = OrderedDict()  # fingerprint -> {'count', 'duration', 'rows'}
+
+    def record(self, query: str, duration: float, rows: int):
+        self.statements += 1
+        self.duration += duration
+        self.rows += rows
+
+        entry = self.fingerprints.setdefault(fingerprint(query), {'count': 0, 'duration': 0.0, 'rows': 0})
+        entry['count'] += 1
+        entry['duration'] += duration
+        entry['rows'] += rows
+
+    def add_rows(self, query: str, rows: int):
+        """Rows fetched later from an unbuffered cursor"""
+        self.rows += rows
+        entry = self.fingerprints.get(fingerprint(query))
+        if entry is not None:
+            entry['rows'] += rows
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Dict]:
+        """Fingerprints executed at least threshold times (likely N+1 loops)"""
+        threshold = threshold or config.SQL_PROFILE_REPEAT_THRESHOLD
+        return [self._entry(sql, entry) for sql, entry in self.fingerprints.items()
+                if entry['count'] >= threshold]
+
+    @staticmethod
+    def _entry(sql: str, entry: Dict) -> Dict:
+        return {
+            'fingerprint': sql,
+            'count': entry['count'],
+            'duration_ms': round(entry['duration'] * 1000, 2),
+            'rows': entry['rows']
+        }
+
+    def summary(self) -> Dict:
+        top = sorted(self.fingerprints.items(), key=lambda item: -item[1]['count'])[:PROFILE_TOP_FINGERPRINTS]
+        return {
+            'event': 'sql_profile',
+            'request': self.name,
+            'statements': self.statements,
+            'distinct': len(self.fingerprints),
+            'duration_ms': round(self.duration * 1000, 2),
+            'rows': self.rows,
+            'n_plus_one': self.repeated(),
+            'fingerprints': [self._entry(sql, entry) for sql, entry in top]
+        }
+
+
+class ProfilingCursor:
+    """
+    Cursor proxy recording execute/executemany into the active profiles.
+    Rows come from rowcount, except on unbuffered cursors (SSDictCursor,
+    rowcount unknown) where rows are counted as they are fetched.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._unbuffered = isinstance(cursor, pymysql.cursors.SSCursor)
+        self._query = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *args):
+        return self._cursor.__exit__(*args)
+
+    def _timed(self, method, query, args):
+        started = time.perf_counter()
+        try:
+            return method(query, args)
+        finally:
+            duration = time.perf_counter() - started
+            rows = 0 if self._unbuffered else max(getattr(self._cursor, 'rowcount', 0) or 0, 0)
+            self._query = query
+            for profile in _stack:
+                profile.record(query, duration, rows)
+
+    def _fetched(self, rows):
+        if self._unbuffered and self._query is not None:
+            for profile in _stack:
+                profile.add_rows(self._query, rows)
+
+    def execute(self, query, args=None):
+        return self._timed(self._cursor.execute, query, args)
+
+    def executemany(self, query, args):
+        return self._timed(self._cursor.executemany, query, args)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._fetched(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(size)
+        self._fetched(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._fetched(len(rows))
+        return rows
+
+
+def profile_connection(conn):
+    """Make conn.cursor() return profiling cursors (no-op when nothing is being profiled)"""
+    if getattr(conn, 'profiled', False) or not (config.SQL_PROFILE or _stack):
+        return conn
+
+    cursor = conn.cursor
+
+    def profiled_cursor(*args, **kwargs):
+        return ProfilingCursor(cursor(*args, **kwargs))
+
+    conn.cursor = profiled_cursor
+    conn.profiled = True
+    return conn
+
+
+@contextmanager
+def _profiling(profile: SQLProfile):
+    _stack.append(profile)
+    try:
+        yield profile
+    finally:
+        _stack.remove(profile)
+
+
+def profile_sql(handler):
+    """Decorator: profile handler's statements when SQL_PROFILE is on, log summary"""
+    name = f"{handler.__module__}.{handler.__qualname__}"
+
+    @wraps(handler)
+    def wrapper(event, context):
+        if not config.SQL_PROFILE:
+            return handler(event, context)
+
+        with _profiling(SQLProfile(name)) as profile:
+            try:
+                return handler(event, context)
+            finally:
+                if profile.statements:
+                    print(json.dumps(profile.summary()))
+
+    return wrapper
+
+
+@contextmanager
+def statement_budget(max_statements: int, max_repeats: Optional[int] = None, name: str = 'budget'):
+    """
+    Test helper: profile the block (regardless of SQL_PROFILE) and raise
+    AssertionError if it issued more than max_statements statements, or
+    (if given) repeated one fingerprint more than max_repeats times.
+    """
+    with _profiling(SQLProfile(name)) as profile:
+        yield profile
+
+    problems = []
+    if profile.statements > max_statements:
+        problems.append(f"{profile.statements} statements > budget {max_statements}")
+    if max_repeats is not None:
+        problems.extend(f"{entry['count']}x {entry['fingerprint']}"
+                        for entry in profile.repeated(max_repeats + 1))
+    if problems:
+        top = '\n  '.join(f"{entry['count']}x {entry['fingerprint']}"
+                          for entry in profile.summary()['fingerprints'])
+        raise AssertionError(f"{name}: {'; '.join(problems)}\n  {top}")
@@ -0,0 +1,105 @@
+"""
+Verified JWT cache with token-version revocation
+"""
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Optional
+from src.database import get_db
+from src.utils.auth_simple import decode_jwt_token
+
+TOKEN_CACHE_SIZE = 1024
+TOKEN_VERSION_CHECK_SECONDS = 30  # Max time other containers accept revoked tokens
+TOKEN_STATS_LOG_EVERY = 1000  # Log hit rate every N lookups
+
+# Global verified token cache (Lambda container reuse)
+# sha256(token) -> decoded claims, least recently used first
+_verified_tokens = OrderedDict()
+
+# Revoked token versions: {'version': int, 'checked_at': float, 'players': {player_id: token_version}}
+_revocations = {'version': None, 'checked_at': 0.0, 'players': {}}
+
+_stats = {'hits': 0, 'misses': 0, 'invalid': 0, 'revoked': 0}
+
+
+def revoke_player_tokens(cursor, player_id: str):
+    """Invalidate all previously issued tokens of player (password reset)"""
+    cursor.execute("UPDATE players SET token_version = token_version + 1 WHERE id = %s", (player_id,))
+    cursor.execute("UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'auth_tokens'")
+    _revocations['version'] = None
+    _verified_tokens.clear()
+
+
+def _load_revocations():
+    """Reload per-player token versions when auth_tokens version changed"""
+    now = time.monotonic()
+    if _revocations['version'] is not None and now - _revocations['checked_at'] < TOKEN_VERSION_CHECK_SECONDS:
+        return
+
+    with get_db() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT version FROM cache_versions WHERE cache_key = 'auth_tokens'")
+            result = cursor.fetchone()
+            version = result['version'] if result else 0
+
+            if version != _revocations['version']:
+                cursor.execute("SELECT id, token_version FROM players WHERE token_version > 0")
+                _revocations['players'] = {row['id']: row['token_version'] for row in cursor.fetchall()}
+                _revocations['version'] = version
+
+    _revocations['checked_at'] = now
+
+
+def _log_stats():
+    lookups = _stats['hits'] + _stats['misses']
+    if lookups % TOKEN_STATS_LOG_EVERY == 0:
+        print(json.dumps({
+            'event': 'token_cache_stats',
+            'lookups': lookups,
+            'hit_rate': round(_stats['hits'] / lookups, 3),
+            'size': len(_verified_tokens),
+            **_stats
+        }))
+
+
+def get_token_cache_stats() -> Dict:
+    """Token cache counters (hits, misses, invalid, revoked, size)"""
+    return dict(_stats, size=len(_verified_tokens))
+
+
+def verify_token(token: str) -> Optional[Dict]:
+    """
+    Verify JWT, reusing claims of already verified tokens until their exp.
+    Tokens issued before player's current token_version are rejected.
+    Returns decoded claims or None.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _verified_tokens.get(key)
+
+    if payload is not None and payload['exp'] > time.time():
+        _verified_tokens.move_to_end(key)
+        _stats['hits'] += 1
+    else:
+        _stats['misses'] += 1
+        if payload is not None:
+            del _verified_tokens[key]
+
+        payload = decode_jwt_token(token)
+        if not payload or 'exp' not in payload:
+            _stats['invalid'] += 1
+            _log_stats()
+            return None
+
+        _verified_tokens[key] = payload
+        if len(_verified_tokens) > TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+
+    _log_stats()
+
+    _load_revocations()
+    if payload.get('tv', 0) < _revocations['players'].get(payload.get('player_id'), 0):
+        _stats['revoked'] += 1
+        return None
+
+    return payload
@@ -0,0 +1,293 @@
+"""
+Trade utilities: signed session tokens and shared sell engine
+"""
+import json
+import uuid
+import jwt
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from src.config import config
+from src.utils.catalog import calculate_sell_price
+from src.utils.outbox import record_event
+from src.utils.reputation import discounted_commission
+
+SESSION_TOKEN_TYPE = 'trade_session'  # typ and aud claim: login token decoders reject it
+SESSION_TIMEOUT_MINUTES = 5
+SESSION_RETENTION_HOURS = 24  # Keep committed sessions for idempotent retries
+
+
+def create_trade_session(player_id: str, trader: Dict, discount_pct: int = 0) -> Tuple[str, Dict]:
+    """
+    Issue signed, self-describing trade session token.
+    Carries trader, player, commissions (after the player's reputation
+    discount_pct) and expiry, so catalog/backpack/buy/sell validate it without
+    a DB lookup. The trade_sessions row is only created on commit
+    (idempotency). Its audience keeps it from passing as a login token.
+    Returns: (token, session)
+    """
+    now = datetime.utcnow()
+    session = {
+        'id': str(uuid.uuid4()),
+        'player_id': player_id,
+        'trader_id': trader['id'],
+        'commission_buy_pct': discounted_commission(trader['commission_buy_pct'], discount_pct),
+        'commission_sell_pct': discounted_commission(trader['commission_sell_pct'], discount_pct),
+        'expires_at': now + timedelta(minutes=SESSION_TIMEOUT_MINUTES)
+    }
+
+    payload = {
+        'typ': SESSION_TOKEN_TYPE,
+        'aud': SESSION_TOKEN_TYPE,
+        'sid': session['id'],
+        'player_id': player_id,
+        'trader_id': session['trader_id'],
+        'commission_buy_pct': session['commission_buy_pct'],
+        'commission_sell_pct': session['commission_sell_pct'],
+        'exp': session['expires_at'],
+        'iat': now
+    }
+    token = jwt.encode(payload, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
+
+    return token, session
+
+
+def get_trade_session(token: str, player_id: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Verify trade session token (no DB lookup).
+    Returns: (session, None) or (None, 'SESSION_NOT_FOUND' / 'SESSION_EXPIRED')
+    """
+    try:
+        payload = jwt.decode(token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM],
+                             audience=SESSION_TOKEN_TYPE)
+    except jwt.ExpiredSignatureError:
+        return None, 'SESSION_EXPIRED'
+    except jwt.InvalidTokenError:
+        return None, 'SESSION_NOT_FOUND'
+
+    if payload.get('typ') != SESSION_TOKEN_TYPE or payload.get('player_id') != player_id:
+        return None, 'SESSION_NOT_FOUND'
+
+    return {
+        'id': payload['sid'],
+        'player_id': payload['player_id'],
+        'trader_id': payload['trader_id'],
+        'commission_buy_pct': payload['commission_buy_pct'],
+        'commission_sell_pct': payload['commission_sell_pct'],
+        'expires_at': datetime.utcfromtimestamp(payload['exp'])
+    }, None
+
+
+def lock_trade_session(cursor, session: Dict) -> str:
+    """
+    Create (first commit) and lock session row for idempotent buy/sell.
+    Returns session status: 'pending' if not committed yet.
+    """
+    cursor.execute("""
+        INSERT INTO trade_sessions
+        (id, player_id, trader_id, status, expires_at)
+        VALUES (%s, %s, %s, 'pending', %s)
+        ON DUPLICATE KEY UPDATE id = id
+    """, (session['id'], session['player_id'], session['trader_id'], session['expires_at']))
+
+    cursor.execute("""
+        SELECT status FROM trade_sessions WHERE id = %s FOR UPDATE
+    """, (session['id'],))
+
+    return cursor.fetchone()['status']
+
+
+def get_committed_result(cursor, session_id: str) -> Optional[Dict]:
+    """Get previous transaction result (type 'buy'/'sell') of already committed session"""
+    cursor.execute("""
+        SELECT type, result, error_code, total_amount
+        FROM trade_transactions
+        WHERE trade_session_id = %s
+    """, (session_id,))
+
+    return cursor.fetchone()
+
+
+def purge_expired_trade_sessions(cursor, retention_hours: int = SESSION_RETENTION_HOURS,
+                                 batch_size: int = 1000) -> int:
+    """
+    Delete trade sessions expired more than retention_hours ago (one batch).
+    Transactions keep their history (trade_session_id set to NULL).
+    Returns number of deleted rows.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+
+    cursor.execute("""
+        DELETE FROM trade_sessions
+        WHERE expires_at < %s
+        ORDER BY expires_at
+        LIMIT %s
+    """, (cutoff, batch_size))
+
+    return cursor.rowcount
+
+
+def _merge_sell_lines(items: List[Dict]) -> Dict[str, int]:
+    """Merge requested (item_id, quantity) lines by inventory row id"""
+    merged = {}
+    for item in items:
+        item_id = item.get('item_id')
+        quantity = item.get('quantity', 1)
+
+        if item_id is None or quantity <= 0:
+            continue
+
+        item_id = str(item_id)
+        merged[item_id] = merged.get(item_id, 0) + quantity
+
+    return merged
+
+
+def sell_items(cursor, player_id: str, session: Dict, items: List[Dict]) -> Dict:
+    """
+    Sell backpack items (consumables and artifacts) to trader in one pass.
+
+    All lines are priced with one lookup (player_inventory x item_definitions /
+    artifact_types) and the session's sell commission, inventory and balance
+    are updated set-based, and a single trade_transactions row is recorded.
+    Caller must lock the session first (lock_trade_session).
+
+    Args:
+        items: [{'item_id': player_inventory.id, 'quantity': int}, ...]
+
+    Returns: {'success': bool, 'transaction_id', 'total_amount', 'new_balance',
+              'lines': list, 'error': str or None}
+    """
+    requested = _merge_sell_lines(items)
+
+    if not requested:
+        return {'success': False, 'error': 'MISSING_REQUIRED_FIELDS'}
+
+    # Lock player row (balance updated below)
+    cursor.execute("""
+        SELECT status, balance FROM players WHERE id = %s FOR UPDATE
+    """, (player_id,))
+    player = cursor.fetchone()
+
+    if not player:
+        return {'success': False, 'error': 'PLAYER_NOT_FOUND'}
+
+    if player['status'] == 'dead':
+        return {'success': False, 'error': 'PLAYER_DEAD_SELL_FORBIDDEN'}
+
+    item_ids = list(requested.keys())
+    placeholders = ', '.join(['%s'] * len(item_ids))
+
+    # Price all lines in one lookup
+    cursor.execute(f"""
+        SELECT
+            pi.id,
+            pi.item_id as item_def_id,
+            pi.item_type,
+            CASE WHEN pi.item_type = 'artifact' THEN 1 ELSE pi.quantity END as available_qty,
+            COALESCE(i.name, at.name) as name,
+            COALESCE(i.base_price, at.base_value) as base_price,
+            CASE WHEN pi.item_type = 'artifact' THEN TRUE ELSE i.is_sellable END as is_sellable,
+            COALESCE(i.is_stackable, FALSE) as is_stackable
+        FROM player_inventory pi
+        LEFT JOIN item_definitions i
+            ON pi.item_type = 'consumable' AND i.id = pi.item_id
+        LEFT JOIN artifact_types at
+            ON pi.item_type = 'artifact' AND at.id = pi.item_id
+        WHERE pi.player_id = %s
+          AND pi.id IN ({placeholders})
+          AND ((pi.item_type = 'consumable' AND i.id IS NOT NULL)
+               OR (pi.item_type = 'artifact' AND pi.slot_type = 'backpack' AND at.id IS NOT NULL))
+    """, [player_id] + item_ids)
+
+    rows = {str(row['id']): row for row in cursor.fetchall()}
+    commission = session['commission_sell_pct']
+
+    total_amount = 0
+    lines = []
+    delete_ids = []
+    decrements = []
+
+    for item_id, quantity in requested.items():
+        row = rows.get(item_id)
+
+        if not row:
+            return {'success': False, 'error': 'ITEM_NOT_IN_BACKPACK'}
+
+        if not row['is_sellable']:
+            return {'success': False, 'error': 'ITEM_NOT_SELLABLE'}
+
+        if quantity > row['available_qty']:
+            return {'success': False, 'error': 'INVALID_QUANTITY'}
+
+        unit_price = calculate_sell_price(row['base_price'], commission)
+        total_amount += unit_price * quantity
+
+        lines.append({
+            'item_id': item_id,
+            'item_def_id': row['item_def_id'],
+            'name': row['name'],
+            'quantity': quantity,
+            'unit_price': unit_price,
+            'is_stackable': bool(row['is_stackable']),
+            'item_type': row['item_type']
+        })
+
+        if quantity >= row['available_qty']:
+            delete_ids.append(row['id'])
+        else:
+            decrements.append((row['id'], quantity))
+
+    # 1. Remove sold rows / decrease partial stacks
+    if delete_ids:
+        cursor.execute(f"""
+            DELETE FROM player_inventory
+            WHERE id IN ({', '.join(['%s'] * len(delete_ids))})
+        """, delete_ids)
+
+    if decrements:
+        cases = ' '.join(['WHEN %s THEN %s'] * len(decrements))
+        params = []
+        for row_id, quantity in decrements:
+            params.extend([row_id, quantity])
+        params.extend(row_id for row_id, _ in decrements)
+
+        cursor.execute(f"""
+            UPDATE player_inventory
+            SET quantity = quantity - CASE id {cases} END
+            WHERE id IN ({', '.join(['%s'] * len(decrements))})
+        """, params)
+
+    # 2. Add money
+    cursor.execute("""
+        UPDATE players
+        SET balance = balance + %s
+        WHERE id = %s
+    """, (total_amount, player_id))
+
+    # 3. Record transaction
+    transaction_id = str(uuid.uuid4())
+    cursor.execute("""
+        INSERT INTO trade_transactions
+        (id, trade_session_id, type, player_id, trader_id,
+         total_amount, lines_json, result)
+        VALUES (%s, %s, 'sell', %s, %s, %s, %s, 'success')
+    """, (transaction_id, session['id'], player_id,
+          session['trader_id'], total_amount, json.dumps(lines)))
+    record_event(cursor, 'trade', {
+        'type': 'sell', 'transactionId': transaction_id,
+        'traderId': session['trader_id'], 'totalAmount': total_amount, 'lines': lines
+    }, player_id=player_id)
+
+    # 4. Update session
+    cursor.execute("""
+        UPDATE trade_sessions SET status = 'success' WHERE id = %s
+    """, (session['id'],))
+
+    return {
+        'success': True,
+        'transaction_id': transaction_id,
+        'total_amount': total_amount,
+        'new_balance': float(player['balance']) + total_amount,
+        'lines': lines,
+        'error': None
+    }
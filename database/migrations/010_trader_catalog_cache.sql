@@ -0,0 +1,8 @@
+-- Trader Catalog Cache
+-- Version key for per-container trader catalog cache (GET /api/trade/catalog)
+-- Bumped by GM trader/item edits
+-- Date: 2026-10-19
+
+INSERT INTO cache_versions (cache_key, version) 
+VALUES ('trader_catalog', 1)
+ON DUPLICATE KEY UPDATE version = version;
@@ -0,0 +1,35 @@
+-- Consumable Stacks Unique Key
+-- One player_inventory row per (player, consumable item) so trade buys can
+-- apply a whole cart with a single multi-row INSERT ... ON DUPLICATE KEY UPDATE.
+-- Artifacts keep one row per instance (consumable_item_id is NULL for them).
+-- Date: 2026-10-19
+
+-- 1. Merge duplicate consumable stacks into the oldest row
+UPDATE player_inventory pi
+JOIN (
+    SELECT MIN(id) as keep_id, SUM(quantity) as total_quantity
+    FROM player_inventory
+    WHERE item_type = 'consumable'
+    GROUP BY player_id, item_id
+    HAVING COUNT(*) > 1
+) d ON pi.id = d.keep_id
+SET pi.quantity = d.total_quantity;
+
+DELETE pi FROM player_inventory pi
+JOIN (
+    SELECT player_id, item_id, MIN(id) as keep_id
+    FROM player_inventory
+    WHERE item_type = 'consumable'
+    GROUP BY player_id, item_id
+    HAVING COUNT(*) > 1
+) d ON pi.player_id = d.player_id
+   AND pi.item_id = d.item_id
+   AND pi.item_type = 'consumable'
+   AND pi.id <> d.keep_id;
+
+-- 2. Unique stack key (NULL for non-consumables, so they never collide)
+ALTER TABLE player_inventory
+ADD COLUMN consumable_item_id VARCHAR(36) 
+    GENERATED ALWAYS AS (IF(item_type = 'consumable', item_id, NULL)) STORED
+    COMMENT 'Stack key for consumables (NULL otherwise)',
+ADD UNIQUE KEY unique_player_consumable (player_id, consumable_item_id);
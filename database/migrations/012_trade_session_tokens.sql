@@ -0,0 +1,14 @@
+-- Trade Session Tokens
+-- Trade sessions are now signed tokens validated without a DB lookup.
+-- The trade_sessions row is only written on buy/sell commit (idempotency key)
+-- and expired rows are purged on a schedule (uses idx_expires).
+-- Transactions keep their history when the session row is purged.
+-- Date: 2026-10-19
+
+ALTER TABLE trade_transactions
+DROP FOREIGN KEY trade_transactions_ibfk_1;
+
+ALTER TABLE trade_transactions
+MODIFY trade_session_id VARCHAR(36) COLLATE utf8mb4_unicode_ci NULL,
+ADD CONSTRAINT fk_trade_transactions_session
+    FOREIGN KEY (trade_session_id) REFERENCES trade_sessions(id) ON DELETE SET NULL;
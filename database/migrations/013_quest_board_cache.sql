@@ -0,0 +1,8 @@
+-- Quest Board Cache
+-- Version key for per-container quest board cache (GET /api/quests)
+-- Bumped by quest create/update/delete and cancel (quest back on board)
+-- Date: 2026-10-19
+
+INSERT INTO cache_versions (cache_key, version) 
+VALUES ('quest_board', 1)
+ON DUPLICATE KEY UPDATE version = version;
@@ -0,0 +1,128 @@
+-- Quest Templates / Instances
+-- Quest definitions move from contracts to quest_templates. Accepting a quest
+-- inserts one slim quest_instances row (template_id, player, status, progress)
+-- instead of copying the whole template. Player contracts stay in contracts.
+-- Date: 2026-10-19
+
+-- 1. Quest templates (GM / bartender quest definitions)
+CREATE TABLE quest_templates (
+    id VARCHAR(36) PRIMARY KEY,
+    issuer_id VARCHAR(36) NOT NULL COMMENT 'Player (GM/bartender) or trader',
+    quest_type ENUM(
+      'artifact_collection',
+      'delivery',
+      'patrol',
+      'visit',
+      'protection',
+      'manual',
+      'item_delivery'
+    ) NOT NULL,
+
+    title VARCHAR(200) NOT NULL,
+    description TEXT,
+    reward DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    reward_item_id VARCHAR(36) NULL COMMENT 'Item reward (FK to item_definitions)',
+    reward_reputation INT DEFAULT 0 COMMENT 'Reputation points reward',
+
+    target_player_id VARCHAR(36) NULL COMMENT 'Protection / elimination target',
+    quest_data JSON NULL COMMENT 'Quest objectives (initial progress)',
+    auto_complete BOOLEAN DEFAULT FALSE,
+
+    faction_restriction ENUM('stalker', 'bandit', 'mercenary', 'duty', 'freedom', 'loner') NULL,
+    faction_restrictions JSON NULL,
+
+    status ENUM('available', 'expired', 'archived') DEFAULT 'available',
+
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    available_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NULL,
+
+    FOREIGN KEY (target_player_id) REFERENCES players(id) ON DELETE SET NULL,
+
+    INDEX idx_status (status),
+    INDEX idx_issuer (issuer_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 2. Quest instances (one per accepted quest)
+CREATE TABLE quest_instances (
+    id VARCHAR(36) PRIMARY KEY,
+    template_id VARCHAR(36) NOT NULL,
+    player_id VARCHAR(36) NOT NULL,
+
+    status ENUM('accepted', 'in_progress', 'completed', 'failed', 'cancelled') DEFAULT 'accepted',
+    failed_reason VARCHAR(255) NULL,
+    progress JSON NULL COMMENT 'Quest progress (NULL = initial template quest_data)',
+
+    accepted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (template_id) REFERENCES quest_templates(id),
+    FOREIGN KEY (player_id) REFERENCES players(id) ON DELETE CASCADE,
+
+    INDEX idx_player_status (player_id, status),
+    INDEX idx_template (template_id),
+    INDEX idx_status (status)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 3. Progress events reference instances now (and keep legacy contract ids)
+ALTER TABLE quest_progress_events
+DROP FOREIGN KEY quest_progress_events_ibfk_1;
+
+-- 4. Migrate templates (quest rows never accepted)
+INSERT INTO quest_templates
+    (id, issuer_id, quest_type, title, description, reward, reward_item_id, reward_reputation,
+     target_player_id, quest_data, auto_complete, faction_restriction, faction_restrictions,
+     status, created_at, available_at, expires_at)
+SELECT id, issuer_id, quest_type, title, description, reward, reward_item_id, reward_reputation,
+       target_player_id, quest_data, auto_complete, faction_restriction, faction_restrictions,
+       IF(status = 'available', 'available', 'archived'), created_at, available_at, expires_at
+FROM contracts
+WHERE quest_type IS NOT NULL AND accepted_by IS NULL;
+
+-- Accepted copies without a surviving template become archived templates themselves
+INSERT INTO quest_templates
+    (id, issuer_id, quest_type, title, description, reward, reward_item_id, reward_reputation,
+     target_player_id, quest_data, auto_complete, faction_restriction, faction_restrictions,
+     status, created_at, available_at, expires_at)
+SELECT c.id, c.issuer_id, c.quest_type, c.title, c.description, c.reward, c.reward_item_id,
+       c.reward_reputation, c.target_player_id, c.quest_data, c.auto_complete,
+       c.faction_restriction, c.faction_restrictions, 'archived', c.created_at, c.available_at, c.expires_at
+FROM contracts c
+WHERE c.quest_type IS NOT NULL AND c.accepted_by IS NOT NULL
+  AND NOT EXISTS (
+      SELECT 1 FROM quest_templates t
+      WHERE t.title = c.title AND t.quest_type = c.quest_type AND t.issuer_id = c.issuer_id
+  );
+
+-- 5. Migrate accepted copies to instances (same ids keep event history linked)
+INSERT INTO quest_instances
+    (id, template_id, player_id, status, failed_reason, progress, accepted_at, completed_at)
+SELECT c.id,
+       COALESCE(
+           (SELECT t.id FROM quest_templates t
+            WHERE t.title = c.title AND t.quest_type = c.quest_type AND t.issuer_id = c.issuer_id
+              AND t.id <> c.id
+            ORDER BY t.created_at
+            LIMIT 1),
+           c.id),
+       c.accepted_by,
+       IF(c.failed, 'failed', IF(c.status = 'available', 'cancelled', c.status)),
+       c.failed_reason, c.quest_data, c.accepted_at, c.completed_at
+FROM contracts c
+WHERE c.quest_type IS NOT NULL AND c.accepted_by IS NOT NULL;
+
+-- 6. Trader quests reference templates
+ALTER TABLE trader_quests
+DROP FOREIGN KEY trader_quests_ibfk_2;
+
+ALTER TABLE trader_quests
+ADD CONSTRAINT fk_trader_quests_template
+    FOREIGN KEY (quest_id) REFERENCES quest_templates(id) ON DELETE CASCADE;
+
+-- 7. Remove migrated quest rows from contracts
+DELETE FROM contracts WHERE quest_type IS NOT NULL;
+
+-- 8. Quest board cache must reload from the new table
+UPDATE cache_versions SET version = version + 1 WHERE cache_key = 'quest_board';
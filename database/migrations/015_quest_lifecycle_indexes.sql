@@ -0,0 +1,15 @@
+-- Quest Lifecycle Indexes
+-- Expiry is applied by the scheduled quest sweeper (quests.sweep_handler),
+-- so hot reads filter on status only.
+-- Date: 2026-10-19
+
+-- Board / trader quests: status + type (replaces single-column status index)
+ALTER TABLE quest_templates
+ADD INDEX idx_status_type (status, quest_type),
+ADD INDEX idx_status_expires (status, expires_at),
+DROP INDEX idx_status;
+
+-- Sweeper: accepted instances by template
+ALTER TABLE quest_instances
+ADD INDEX idx_status_template (status, template_id),
+DROP INDEX idx_status;
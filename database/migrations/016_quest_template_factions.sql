@@ -0,0 +1,35 @@
+-- Quest Template Factions
+-- Faction eligibility of quest templates as an indexed join table, so trader
+-- quest lists filter (and paginate) in SQL instead of parsing
+-- faction_restrictions JSON per row. 'any' = no faction restriction.
+-- Kept in sync on quest create/update (sync_quest_factions).
+-- Date: 2026-10-19
+
+CREATE TABLE quest_template_factions (
+    quest_id VARCHAR(36) NOT NULL,
+    faction ENUM('any', 'stalker', 'bandit', 'mercenary', 'duty', 'freedom', 'loner') NOT NULL,
+
+    PRIMARY KEY (faction, quest_id),
+    FOREIGN KEY (quest_id) REFERENCES quest_templates(id) ON DELETE CASCADE,
+
+    INDEX idx_quest (quest_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Backfill: JSON list first (known factions only), then legacy single
+-- faction, otherwise 'any' -- same fallback as get_eligible_factions, so a
+-- list with no known faction doesn't drop the quest from every trader list
+INSERT INTO quest_template_factions (quest_id, faction)
+SELECT DISTINCT t.id, jt.faction
+FROM quest_templates t
+JOIN JSON_TABLE(t.faction_restrictions, '$[*]' COLUMNS (faction VARCHAR(20) PATH '$')) jt
+WHERE JSON_LENGTH(t.faction_restrictions) > 0
+  AND jt.faction IN ('stalker', 'bandit', 'mercenary', 'duty', 'freedom', 'loner');
+
+INSERT INTO quest_template_factions (quest_id, faction)
+SELECT t.id, COALESCE(t.faction_restriction, 'any')
+FROM quest_templates t
+WHERE NOT EXISTS (SELECT 1 FROM quest_template_factions f WHERE f.quest_id = t.id);
+
+-- Trader quest list: active quests of trader
+ALTER TABLE trader_quests
+ADD INDEX idx_trader_active (trader_id, is_active);
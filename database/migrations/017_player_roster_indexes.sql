@@ -0,0 +1,12 @@
+-- GM Player Roster Indexes
+-- GET /api/admin/players filters by last location update (onlineWithin)
+-- and pages by (updated_at, player_id).
+-- Date: 2026-10-19
+
+ALTER TABLE player_locations
+ADD INDEX idx_updated_player (updated_at, player_id);
+
+-- Faction + status filter (replaces single-column faction index)
+ALTER TABLE players
+ADD INDEX idx_faction_status (faction, status),
+DROP INDEX idx_faction;
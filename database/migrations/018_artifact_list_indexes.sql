@@ -0,0 +1,8 @@
+-- Spawned Artifact List Indexes
+-- GET /api/admin/artifacts/spawned pages by (spawned_at, id), newest first.
+-- Date: 2026-10-19
+
+-- Keyset pagination (replaces single-column spawned_at index)
+ALTER TABLE artifacts
+ADD INDEX idx_spawned_id (spawned_at, id),
+DROP INDEX idx_spawned_at;
@@ -0,0 +1,8 @@
+-- Player Roles Version
+-- Version key for per-container role cache and role claims in JWTs
+-- Bumped whenever player_roles change (admin update player)
+-- Date: 2026-10-19
+
+INSERT INTO cache_versions (cache_key, version) 
+VALUES ('player_roles', 1)
+ON DUPLICATE KEY UPDATE version = version;
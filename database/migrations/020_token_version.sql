@@ -0,0 +1,12 @@
+-- Token Version
+-- Tokens carry the player's token_version (tv claim); bumping it revokes
+-- all earlier tokens (password reset). auth_tokens version tells
+-- containers to reload revoked versions.
+-- Date: 2026-10-19
+
+ALTER TABLE players
+ADD COLUMN token_version INT NOT NULL DEFAULT 0;
+
+INSERT INTO cache_versions (cache_key, version) 
+VALUES ('auth_tokens', 1)
+ON DUPLICATE KEY UPDATE version = version;
@@ -0,0 +1,23 @@
+-- Player Status Version
+-- Per-player version of volatile fields (status, lives, radiation, balance,
+-- resurrection progress) for GET /api/player/status ETag / 304.
+-- Maintained by trigger, so every writer bumps it without code changes.
+-- Date: 2026-10-19
+
+ALTER TABLE players
+ADD COLUMN status_version INT UNSIGNED NOT NULL DEFAULT 0;
+
+DELIMITER //
+CREATE TRIGGER bump_player_status_version
+BEFORE UPDATE ON players
+FOR EACH ROW
+BEGIN
+  IF NOT (NEW.status <=> OLD.status)
+     OR NOT (NEW.current_lives <=> OLD.current_lives)
+     OR NOT (NEW.current_radiation <=> OLD.current_radiation)
+     OR NOT (NEW.balance <=> OLD.balance)
+     OR NOT (NEW.resurrection_progress_seconds <=> OLD.resurrection_progress_seconds) THEN
+    SET NEW.status_version = OLD.status_version + 1;
+  END IF;
+END//
+DELIMITER ;
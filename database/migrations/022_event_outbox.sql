@@ -0,0 +1,27 @@
+-- Event Outbox
+-- Game events written in the same transaction as the state change they
+-- describe (src.utils.outbox.record_event). Ids increase monotonically;
+-- consumers (WebSocket push, analytics export) drain in id order and keep
+-- their position in outbox_checkpoints.
+-- Date: 2026-10-19
+
+CREATE TABLE event_outbox (
+    id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(50) NOT NULL,
+    player_id VARCHAR(36) NULL,           -- Subject of the event, if any
+    recipients JSON NULL,                 -- {"player": [...], "faction": [...], "session": [...]}, NULL = everyone
+    data JSON NOT NULL,
+    created_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+
+    INDEX idx_created (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE outbox_checkpoints (
+    consumer VARCHAR(50) PRIMARY KEY,
+    last_id BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT INTO outbox_checkpoints (consumer, last_id) VALUES
+('push', 0),
+('analytics', 0);
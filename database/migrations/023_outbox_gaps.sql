@@ -0,0 +1,12 @@
+-- Outbox Gap Tracking
+-- Ids a consumer's checkpoint skipped because their insert had not committed
+-- yet ([[first_id, last_id, skipped_at], ...]); re-checked on every drain so
+-- events from long transactions are still delivered.
+-- Also seeds the 'cache' consumer so purging waits for it from the start.
+-- Date: 2026-10-19
+
+ALTER TABLE outbox_checkpoints
+    ADD COLUMN gaps JSON NULL AFTER last_id;
+
+INSERT IGNORE INTO outbox_checkpoints (consumer, last_id) VALUES
+('cache', 0);
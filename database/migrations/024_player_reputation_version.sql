@@ -0,0 +1,33 @@
+-- Player Reputation Version
+-- Per-player version of npc_reputation rows, for the per-container
+-- reputation vector cache (trade session discount).
+-- Maintained by triggers, so every writer bumps it without code changes.
+-- Date: 2026-10-19
+
+ALTER TABLE players
+ADD COLUMN reputation_version INT UNSIGNED NOT NULL DEFAULT 0;
+
+DELIMITER //
+CREATE TRIGGER bump_reputation_version_insert
+AFTER INSERT ON npc_reputation
+FOR EACH ROW
+BEGIN
+  UPDATE players SET reputation_version = reputation_version + 1 WHERE id = NEW.player_id;
+END//
+
+CREATE TRIGGER bump_reputation_version_update
+AFTER UPDATE ON npc_reputation
+FOR EACH ROW
+BEGIN
+  IF NOT (NEW.reputation <=> OLD.reputation) THEN
+    UPDATE players SET reputation_version = reputation_version + 1 WHERE id = NEW.player_id;
+  END IF;
+END//
+
+CREATE TRIGGER bump_reputation_version_delete
+AFTER DELETE ON npc_reputation
+FOR EACH ROW
+BEGIN
+  UPDATE players SET reputation_version = reputation_version + 1 WHERE id = OLD.player_id;
+END//
+DELIMITER ;
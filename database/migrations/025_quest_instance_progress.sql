@@ -0,0 +1,14 @@
+-- Quest Instance Progress Snapshot
+-- Accepting a quest now stores the template's initial progress in
+-- quest_instances.progress, so later GM edits of quest_data don't change
+-- accepted quests. Instances accepted before have NULL progress and take
+-- the template's current quest_data once.
+-- Date: 2026-10-19
+
+UPDATE quest_instances qi
+JOIN quest_templates t ON qi.template_id = t.id
+SET qi.progress = COALESCE(t.quest_data, JSON_OBJECT())
+WHERE qi.progress IS NULL;
+
+ALTER TABLE quest_instances
+MODIFY COLUMN progress JSON NULL COMMENT 'Quest progress (snapshot of template quest_data on accept)';
@@ -1,7 +1,8 @@
-import { useEffect, useState, useCallback } from 'react'
+import { useEffect, useState, useCallback, useRef } from 'react'
 import { Link } from 'react-router-dom'
 import { useAuthStore } from '../../stores/authStore'
 import { api } from '../../services/api'
+import { usePush } from '../../hooks/usePush'
 
 interface PlayerData {
   currentLives: number
@@ -17,11 +18,19 @@ export const refreshPlayerData = () => {
 export default function PDAHeader() {
   const { nickname } = useAuthStore()
   const [player, setPlayer] = useState<PlayerData | null>(null)
+  const statusEtag = useRef<string | null>(null)
+  const { connected } = usePush()
 
+  // Volatile fields only; 304 when nothing changed since last poll
   const fetchPlayer = useCallback(async () => {
     try {
-      const { data } = await api.get('/api/auth/me')
-      setPlayer(data)
+      const response = await api.get('/api/player/status', {
+        headers: statusEtag.current ? { 'If-None-Match': statusEtag.current } : {},
+        validateStatus: (status) => status === 200 || status === 304
+      })
+      if (response.status === 304) return
+      statusEtag.current = response.headers['etag'] || null
+      setPlayer(response.data)
     } catch (error) {
       console.error('Failed to fetch player data:', error)
     }
@@ -29,7 +38,8 @@ export default function PDAHeader() {
 
   useEffect(() => {
     fetchPlayer()
-    const interval = setInterval(fetchPlayer, 15000) // Match location tick
+    // Pushed events trigger refreshPlayerData; poll only as a fallback while connected
+    const interval = setInterval(fetchPlayer, connected ? 60000 : 15000)
     
     // Listen for refresh events
     const handleRefresh = () => fetchPlayer()
@@ -39,7 +49,7 @@ export default function PDAHeader() {
       clearInterval(interval)
       window.removeEventListener('refreshPlayerData', handleRefresh)
     }
-  }, [fetchPlayer])
+  }, [fetchPlayer, connected])
 
   const getRadiationColor = (rad: number) => {
     if (rad <= 20) return 'text-green-400'
@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react'
 import { api } from '../services/api'
+import { onPush } from './usePush'
 
 export interface QuestMarker {
   questId: string
@@ -83,7 +84,13 @@ export function useActiveQuests() {
 
     fetchQuests()
     const interval = setInterval(fetchQuests, 30000) // Refresh every 30s
-    return () => clearInterval(interval)
+    const unsubscribe = onPush((event) => {
+      if (event.type === 'quest_completed') fetchQuests()
+    })
+    return () => {
+      clearInterval(interval)
+      unsubscribe()
+    }
   }, [])
 
   return { markers, loading }
@@ -0,0 +1,79 @@
+import { useEffect, useState } from 'react'
+import { useAuthStore } from '../stores/authStore'
+
+// WebSocketURL stack output; push is disabled (polling only) when unset
+export const WS_URL = import.meta.env.VITE_WS_URL || ''
+
+export type PushEventType = 'tick' | 'death' | 'quest_completed' | 'artifact_taken' | 'zone_changed'
+
+export interface PushEvent {
+  type: PushEventType
+  data: any
+  ts: number
+}
+
+// Events that change header data (lives, radiation, balance)
+const PLAYER_EVENTS: PushEventType[] = ['tick', 'death', 'quest_completed']
+
+// Subscribe to server push events (dispatched as 'pdaPush' window events)
+export const onPush = (handler: (event: PushEvent) => void) => {
+  const listener = (e: Event) => handler((e as CustomEvent<PushEvent>).detail)
+  window.addEventListener('pdaPush', listener)
+  return () => window.removeEventListener('pdaPush', listener)
+}
+
+export function usePush() {
+  const token = useAuthStore((state) => state.token)
+  const [connected, setConnected] = useState(false)
+
+  useEffect(() => {
+    if (!token || !WS_URL) return
+
+    let socket: WebSocket | null = null
+    let retryTimer: number | undefined
+    let pingTimer: number | undefined
+    let closed = false
+
+    const connect = () => {
+      socket = new WebSocket(`${WS_URL}?token=${encodeURIComponent(token)}`)
+
+      socket.onopen = () => {
+        setConnected(true)
+        // API Gateway drops idle connections after 10 minutes
+        pingTimer = window.setInterval(() => socket?.send(JSON.stringify({ action: 'ping' })), 300000)
+      }
+
+      socket.onmessage = (message) => {
+        try {
+          const frame = JSON.parse(message.data)
+          const events: PushEvent[] = frame.events || []
+          for (const event of events) {
+            window.dispatchEvent(new CustomEvent('pdaPush', { detail: event }))
+          }
+          if (events.some((event) => PLAYER_EVENTS.includes(event.type))) {
+            window.dispatchEvent(new CustomEvent('refreshPlayerData'))
+          }
+        } catch (error) {
+          console.error('Bad push frame:', error)
+        }
+      }
+
+      socket.onclose = () => {
+        setConnected(false)
+        window.clearInterval(pingTimer)
+        if (!closed) retryTimer = window.setTimeout(connect, 5000)
+      }
+    }
+
+    connect()
+
+    return () => {
+      closed = true
+      window.clearTimeout(retryTimer)
+      window.clearInterval(pingTimer)
+      socket?.close()
+    }
+  }, [token])
+
+  return { connected }
+}
@@ -69,17 +69,27 @@ export default function MapPage() {
   useEffect(() => {
     if (!gmMode) return
 
+    // Shared live map snapshot; after the first load only changes are fetched
+    let snapshotId: number | null = null
+    const live: Record<string, Map<string, any>> = {}
+
     const fetchGmData = async () => {
       try {
-        const [playersRes, radZonesRes, respawnZonesRes] = await Promise.all([
-          api.get('/api/admin/locations'),
-          api.get('/api/admin/zones/radiation'),
-          api.get('/api/admin/zones/respawn')
-        ])
-        setPlayers(playersRes.data.players || [])
-        setGmRadiationZones(radZonesRes.data.zones || [])
-        setGmRespawnZones(respawnZonesRes.data.zones || [])
-        console.log('[GM ZONES]', { rad: radZonesRes.data.zones, respawn: respawnZonesRes.data.zones })
+        const { data } = await api.get('/api/admin/live', {
+          params: snapshotId ? { since: snapshotId } : {}
+        })
+        for (const section of ['players', 'radiationZones', 'respawnZones']) {
+          if (data.full || !live[section]) {
+            live[section] = new Map((data[section] || []).map((e: any) => [e.id, e]))
+          } else {
+            for (const entity of data.changed[section]) live[section].set(entity.id, entity)
+            for (const id of data.removed[section]) live[section].delete(id)
+          }
+        }
+        snapshotId = data.snapshotId
+        setPlayers(Array.from(live.players.values()))
+        setGmRadiationZones(Array.from(live.radiationZones.values()))
+        setGmRespawnZones(Array.from(live.respawnZones.values()))
         setLoadingPlayers(false)
       } catch (err) {
         console.error('Failed to fetch GM data:', err)
@@ -1,7 +1,7 @@
 import { useEffect, useState } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { useAuthStore } from '../stores/authStore'
-import { api } from '../services/api'
+import { api, API_URL } from '../services/api'
 
 interface PlayerData {
   nickname: string
@@ -12,7 +12,7 @@ interface PlayerData {
   reputation: number
   currentLives: number
   currentRadiation: number
-  qrCode: string
+  qrCodeUrl: string
   stats: {
     kills: number
     deaths: number
@@ -103,10 +103,10 @@ export default function ProfilePage() {
         <div className="text-xs text-pda-text/70 mb-3">
           Show this code to other players when you die
         </div>
-        {player.qrCode ? (
+        {player.qrCodeUrl ? (
           <div className="flex justify-center bg-white p-4 rounded">
             <img 
-              src={player.qrCode} 
+              src={`${API_URL}${player.qrCodeUrl}`} 
               alt="QR Code" 
               className="w-48 h-48"
             />
@@ -1,7 +1,7 @@
 import axios from 'axios'
 import { useAuthStore } from '../stores/authStore'
 
-const API_URL = import.meta.env.VITE_API_URL || 'https://czqg4fcsqi.execute-api.eu-north-1.amazonaws.com/dev'
+export const API_URL = import.meta.env.VITE_API_URL || 'https://czqg4fcsqi.execute-api.eu-north-1.amazonaws.com/dev'
 
 export const api = axios.create({
   baseURL: API_URL,
@@ -40,6 +40,6 @@ export const inventoryApi = {
     api.post('/api/inventory/use', { itemId }),
   dropItem: (itemId: string, itemType: 'equipment' | 'artifact' | 'consumable') => 
     api.post('/api/inventory/drop', { itemId, itemType }),
-  sellItem: (itemId: string, itemType: 'equipment' | 'artifact' | 'consumable') => 
-    api.post('/api/inventory/sell', { itemId, itemType }),
+  sellItems: (tradeSessionId: string, items: { itemId: string; quantity: number }[]) => 
+    api.post('/api/inventory/sell', { trade_session_id: tradeSessionId, items }),
 }
@@ -27,6 +27,9 @@ if [ -z "$JWT_SECRET" ]; then
 fi
 
 # Deploy SAM stack
+# Existing stacks from before the connection GSIs: DynamoDB adds one GSI per
+# update, so deploy once with ConnectionSessionIndex=false added to the
+# overrides below, then again without it.
 echo "☁️ Deploying SAM stack..."
 sam deploy \
   --template-file infrastructure/template.yaml \
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark loot QR code: SVG render vs. per-container cache hit.
+
+Renders QR codes for fresh player ids (cold, what me_handler did on every
+call) and then serves the same ids from src.utils.qr cache (warm).
+
+Usage:
+    python scripts/bench_qr.py [--players 50] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from src.utils import qr  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--players', type=int, default=50, help='Distinct player ids')
+    parser.add_argument('--repeat', type=int, default=20, help='Cache hits per player id')
+    args = parser.parse_args()
+
+    player_ids = [str(uuid.uuid4()) for _ in range(args.players)]
+
+    start = time.perf_counter()
+    for player_id in player_ids:
+        qr.get_player_qr(player_id)
+    cold_us = (time.perf_counter() - start) / len(player_ids) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for player_id in player_ids:
+            qr.get_player_qr(player_id)
+    warm_us = (time.perf_counter() - start) / (len(player_ids) * args.repeat) * 1e6
+
+    print(f"{'':>10} {'us/call':>12}")
+    print(f"{'render':>10} {cold_us:>12.1f}")
+    print(f"{'cache hit':>10} {warm_us:>12.2f}")
+    print(f"speedup: {cold_us / warm_us:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark trade buy_handler: SQL statement count and latency vs cart size.
+
+Runs the real handler against an in-memory fake connection that counts
+statements and sleeps a simulated DB round trip per statement.
+
+With --budget, each run must stay within that many statements, and no
+statement may repeat per cart line (N+1), or the benchmark fails.
+
+The "est. before" column is not measured: it is the statement count of the
+replaced per-line implementation (8 fixed + 4 per cart line), counted from
+its code, for comparison.
+
+Usage:
+    python scripts/bench_trade_buy.py [--rtt-ms 1.0] [--sizes 1,5,10,25,50] [--budget 12]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from src.handlers import trade  # noqa: E402
+from src.utils.trade import create_trade_session  # noqa: E402
+from src.utils.sql_profiler import profile_connection, statement_budget  # noqa: E402
+
+
+class FakeCursor:
+    """Cursor stand-in: answers buy_handler queries, counts round trips"""
+
+    def __init__(self, stats, rtt):
+        self.stats = stats
+        self.rtt = rtt
+        self.rowcount = 0
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=()):
+        self.stats['statements'] += 1
+        time.sleep(self.rtt)
+        params = list(params or ())
+        self.rowcount = 1
+
+        if 'FROM trade_sessions' in query:
+            self._rows = [{'status': 'pending'}]
+        elif 'FROM item_definitions i' in query:
+            self._rows = [{
+                'id': item_id, 'base_price': 100, 'is_stackable': True,
+                'name': f'Item {item_id}'
+            } for item_id in params[1:]]
+        elif 'FROM player_inventory' in query and 'IN (' in query:
+            # Half of the cart is already stacked in the backpack
+            self._rows = [{'item_id': item_id} for item_id in params[1::2]]
+        elif 'FROM players p' in query:
+            self._rows = [{'balance': 10 ** 9, 'backpack_capacity': 1000, 'used_slots': 0}]
+        else:
+            self._rows = []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    def __init__(self, stats, rtt):
+        self.stats = stats
+        self.rtt = rtt
+
+    def cursor(self):
+        return FakeCursor(self.stats, self.rtt)
+
+    def commit(self):
+        pass
+
+
+def run(cart_size, rtt):
+    stats = {'statements': 0}
+
+    @contextmanager
+    def fake_get_db():
+        yield profile_connection(FakeConnection(stats, rtt))
+
+    trade.get_db = fake_get_db
+
+    token, _ = create_trade_session('player-1', {
+        'id': 'trader-1', 'commission_buy_pct': 10, 'commission_sell_pct': 20
+    })
+
+    event = {
+        'player': {'player_id': 'player-1'},
+        'body': json.dumps({
+            'trade_session_id': token,
+            'items': [{'item_def_id': f'item-{i}', 'quantity': 2} for i in range(cart_size)]
+        })
+    }
+
+    started = time.perf_counter()
+    response = trade.buy_handler.__wrapped__(event, None)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if response['statusCode'] != 200:
+        raise RuntimeError(f"buy_handler failed: {response['body']}")
+
+    return stats['statements'], elapsed_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rtt-ms', type=float, default=1.0, help='Simulated DB round trip (ms)')
+    parser.add_argument('--sizes', default='1,5,10,25,50', help='Comma-separated cart sizes')
+    parser.add_argument('--budget', type=int, default=None, help='Max statements per buy (fail if exceeded)')
+    args = parser.parse_args()
+
+    rtt = args.rtt_ms / 1000
+    sizes = [int(s) for s in args.sizes.split(',')]
+
+    print(f"Simulated RTT: {args.rtt_ms} ms/statement")
+    print(f"{'cart':>6} {'statements':>11} {'latency ms':>11} {'est. before':>12}")
+    for size in sizes:
+        if args.budget is None:
+            statements, elapsed_ms = run(size, rtt)
+        else:
+            with statement_budget(args.budget, max_repeats=max(size - 1, 1), name=f'buy cart={size}'):
+                statements, elapsed_ms = run(size, rtt)
+        # Estimate, not measured: previous per-line implementation ran 8 fixed + 4 per line
+        estimated_before = 8 + 4 * size
+        print(f"{size:>6} {statements:>11} {elapsed_ms:>11.1f} {estimated_before:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Replay the event outbox through consumers locally.
+
+Push runs against the in-memory connection store and gateway: every player
+that appears in the replayed events gets one fake connection, and the frames
+each connection would have received are printed. Checkpoints are not touched
+unless --drain is given.
+
+Usage:
+    DB_HOST=... DB_PASSWORD=... python scripts/replay_outbox.py [--from-id 0] [--to-id N]
+        [--consumers push,analytics] [--drain]
+"""
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault('PUSH_BACKEND', 'memory')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from src.utils.outbox import drain, get_consumers, replay  # noqa: E402
+from src.utils.push import get_push_backend  # noqa: E402
+
+
+def connect_players(events):
+    """Register one fake connection per player seen in events"""
+    store, _ = get_push_backend()
+    for event in events:
+        players = (event['recipients'] or {}).get('player', []) + [event['player_id']]
+        for player_id in players:
+            if player_id and f'conn-{player_id}' not in store.connections:
+                store.add(f'conn-{player_id}', player_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--from-id', type=int, default=0)
+    parser.add_argument('--to-id', type=int, default=None)
+    parser.add_argument('--consumers', default=','.join(get_consumers()))
+    parser.add_argument('--drain', action='store_true', help='advance consumer checkpoints')
+    args = parser.parse_args()
+
+    consumers = get_consumers()
+    selected = [name.strip() for name in args.consumers.split(',') if name.strip()]
+
+    for name in selected:
+        consumer = consumers[name]
+
+        def handler(events, consumer=consumer):
+            connect_players(events)
+            consumer(events)
+
+        if args.drain:
+            print(json.dumps(drain(name, handler)))
+        else:
+            count = replay(handler, from_id=args.from_id, to_id=args.to_id)
+            print(json.dumps({'consumer': name, 'replayed': count}))
+
+    _, gateway = get_push_backend()
+    for connection_id, frames in gateway.sent.items():
+        for frame in frames:
+            print(f"{connection_id}: {json.dumps(frame)}")
+
+
+if __name__ == '__main__':
+    main()
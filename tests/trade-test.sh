@@ -81,6 +81,19 @@ fi
 echo "✅ Session started: $SESSION_ID"
 echo ""
 
+# 4b. Session token must not work as a login token
+echo "4b. Using session token as bearer token..."
+ME_STATUS=$(curl -s -o /dev/null -w "%{http_code}" -X GET "$API_URL/api/auth/me" \
+  -H "Authorization: Bearer $SESSION_ID")
+
+if [ "$ME_STATUS" == "401" ]; then
+  echo "✅ Session token rejected (401)"
+else
+  echo "❌ Session token accepted as login token (HTTP $ME_STATUS)"
+  exit 1
+fi
+echo ""
+
 # 5. Get catalog
 echo "5. Getting trader catalog..."
 CATALOG_RESPONSE=$(curl -s -X GET "$API_URL/api/trade/catalog?trade_session_id=$SESSION_ID" \